@@ -0,0 +1,44 @@
+"""Anomaly detection throughput, per sample and vectorised across targets."""
+from datetime import datetime
+
+from benchmarks.common import rate
+from ping_monitor.models.detection import DetectionStage
+from ping_monitor.models.metrics import PingMetrics
+
+
+def _round(targets: int, index: int) -> list:
+    now = datetime.now()
+    return [
+        PingMetrics(
+            timestamp=now,
+            target=f"10.0.{t // 256}.{t % 256}",
+            average_latency=10.0 + (t + index) % 7,
+            jitter=1.0 + index % 3,
+            packet_count=10,
+            success_count=10 if (t + index) % 13 else 5
+        )
+        for t in range(targets)
+    ]
+
+
+def run(targets=(100, 10_000), rounds: int = 20) -> dict:
+    results = {}
+    specs = ("ewma", "cusum", "page_hinkley")
+    for count in targets:
+        batches = [_round(count, index) for index in range(rounds)]
+        samples = count * rounds
+
+        def sequential() -> None:
+            stage = DetectionStage(specs)
+            for batch in batches:
+                for metrics in batch:
+                    stage.evaluate(metrics)
+
+        def bulk() -> None:
+            stage = DetectionStage(specs)
+            for batch in batches:
+                stage.evaluate_many(batch)
+
+        results[f"detection.evaluate_per_sec.{count}"] = rate(samples, sequential, repeat=1)
+        results[f"detection.evaluate_many_per_sec.{count}"] = rate(samples, bulk, repeat=1)
+    return results
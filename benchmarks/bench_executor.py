@@ -0,0 +1,45 @@
+"""Probes per second through PingExecutor against the fake ping_adv stub."""
+import asyncio
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import make_stub, rate
+from ping_monitor.core.executor import PingExecutor
+from ping_monitor.core.pool import WorkerPool
+
+
+def run(probes: int = 200, concurrency: int = 50) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        stub = make_stub(Path(directory))
+        executor = PingExecutor(stub)
+
+        def sync() -> None:
+            for _ in range(probes // 4):
+                executor.execute("127.0.0.1", 10, 0.1)
+
+        async def fan_out(target: PingExecutor) -> None:
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def probe() -> None:
+                async with semaphore:
+                    await target.execute_async("127.0.0.1", 10, 0.1)
+
+            await asyncio.gather(*(probe() for _ in range(probes)))
+
+        async def pooled() -> float:
+            target = PingExecutor(stub, pool=WorkerPool.for_ping_adv(stub, size=8))
+            try:
+                await fan_out(target)
+                started = asyncio.get_running_loop().time()
+                await fan_out(target)
+                return probes / (asyncio.get_running_loop().time() - started)
+            finally:
+                await target.close()
+
+        return {
+            "executor.sync.probes_per_sec": rate(probes // 4, sync, repeat=1),
+            "executor.async.probes_per_sec": rate(
+                probes, lambda: asyncio.run(fan_out(executor)), repeat=1
+            ),
+            "executor.pool.probes_per_sec": asyncio.run(pooled()),
+        }
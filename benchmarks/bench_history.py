@@ -0,0 +1,66 @@
+"""History append/trim and get_stats cost at 10^3 to 10^6 samples."""
+import asyncio
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from benchmarks.common import make_stub, rate
+from ping_monitor.core.monitor import ConnectionMonitor
+from ping_monitor.models.columnar import ColumnarHistory
+from ping_monitor.models.history import MetricHistory
+from ping_monitor.models.metrics import PingMetrics
+from ping_monitor.utils.config import MonitorConfig
+from ping_monitor.utils.logging import LogConfig
+
+
+def _samples(count: int) -> list:
+    start = datetime.now() - timedelta(seconds=count)
+    return [
+        PingMetrics(
+            timestamp=start + timedelta(seconds=i),
+            target="8.8.8.8",
+            average_latency=10.0 + i % 17,
+            jitter=1.0 + i % 3,
+            packet_count=10,
+            success_count=10 if i % 11 else 0
+        )
+        for i in range(count)
+    ]
+
+
+def run(sizes=(1_000, 10_000, 100_000, 1_000_000)) -> dict:
+    results = {}
+    for size in sizes:
+        samples = _samples(size)
+        window = timedelta(seconds=size // 2)
+
+        for name, history_class in (("objects", MetricHistory), ("columnar", ColumnarHistory)):
+            def append() -> None:
+                history = history_class(capacity=size, window=window)
+                for sample in samples:
+                    history.append(sample)
+
+            results[f"history.{name}.append_per_sec.{size}"] = rate(size, append, repeat=1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            config = MonitorConfig(
+                ping_adv_path=make_stub(Path(directory)),
+                history_capacity=size,
+                raw_retention=float(size)
+            )
+            monitor = ConnectionMonitor(config, log_config=LogConfig(level="WARNING"))
+
+            def ingest() -> None:
+                for sample in samples:
+                    monitor._record(sample)
+
+            results[f"monitor.record_per_sec.{size}"] = rate(size, ingest, repeat=1)
+            calls = 1_000
+            results[f"monitor.get_stats_per_sec.{size}"] = rate(
+                calls, lambda: [monitor.get_stats() for _ in range(calls)]
+            )
+            results[f"monitor.get_stats_hour_per_sec.{size}"] = rate(
+                100, lambda: [monitor.get_stats(duration=timedelta(hours=1)) for _ in range(100)]
+            )
+            asyncio.run(monitor.executor.close())
+    return results
@@ -0,0 +1,65 @@
+"""Micro-benchmark for the ping_adv output parser.
+
+Run with ``python -m benchmarks.bench_parser``.
+"""
+import json
+import re
+import sys
+import timeit
+
+from ping_monitor.core.parser import parse_packets, parse_result
+
+LEGACY_PATTERN = (
+    r'\[(.*?)\] Test Result: '
+    r'Average Latency (\d+)ms, '
+    r'Jitter (\d+)(ms|ns) '
+    r'\((\d+) results\)'
+)
+
+
+def make_output(packets: int) -> bytes:
+    lines = [
+        f"64 bytes from 8.8.8.8: icmp_seq={seq} ttl=117 time={20 + seq % 7}.{seq % 10} ms"
+        for seq in range(1, packets + 1)
+    ]
+    lines.append(
+        f"[8.8.8.8] Test Result: Average Latency 23ms, Jitter 935529ns ({packets} results)"
+    )
+    return "\n".join(lines).encode()
+
+
+def legacy_parse(output: bytes):
+    """The pre-parser PingExecutor._parse_output path, minus PingMetrics construction."""
+    match = re.search(LEGACY_PATTERN, output.decode().strip())
+    latency = float(match.group(2))
+    jitter = float(match.group(3))
+    jitter = jitter / 1_000_000.0 if match.group(4) == 'ns' else jitter
+    return match.group(1), latency, jitter, int(match.group(5))
+
+
+def run(sizes=(10, 1_000, 100_000), repeat: int = 5) -> dict:
+    results = {}
+    for size in sizes:
+        output = make_output(size)
+        number = max(1, 200_000 // (size + 10))
+        for name, func in (
+                ("legacy_result", legacy_parse),
+                ("result", parse_result),
+                ("packets", parse_packets),
+        ):
+            best = min(timeit.repeat(lambda: func(output), number=number, repeat=repeat))
+            results[f"parser.{name}.{size}"] = {
+                "ops_per_sec": number / best,
+                "mb_per_sec": number * len(output) / best / 1e6,
+            }
+    return results
+
+
+def main() -> int:
+    json.dump(run(), sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
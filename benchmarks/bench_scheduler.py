@@ -0,0 +1,65 @@
+"""End-to-end multi-target scheduling throughput of ConnectionMonitor."""
+import asyncio
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.common import make_stub
+from ping_monitor.core.monitor import ConnectionMonitor
+from ping_monitor.models.metrics import PingMetrics
+from ping_monitor.utils.config import MonitorConfig, ProbeTarget
+from ping_monitor.utils.logging import LogConfig
+
+
+class _SleepingEngine:
+    """Engine with a fixed probe latency, isolating scheduler overhead."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    async def execute_async(self, target: str, packet_count: int, interval: float) -> PingMetrics:
+        await asyncio.sleep(self.latency)
+        return PingMetrics(
+            timestamp=datetime.now(),
+            target=target,
+            average_latency=1.0,
+            jitter=0.1,
+            packet_count=packet_count,
+            success_count=packet_count
+        )
+
+    async def close(self) -> None:
+        pass
+
+
+def _monitor(stub: Path, targets: int, concurrency: int) -> ConnectionMonitor:
+    config = MonitorConfig(
+        ping_adv_path=stub,
+        targets=tuple(ProbeTarget(f"10.{i // 65536}.{i // 256 % 256}.{i % 256}") for i in range(targets)),
+        max_concurrency=concurrency
+    )
+    monitor = ConnectionMonitor(config, log_config=LogConfig(level="WARNING"))
+    monitor._test_mode = True
+    return monitor
+
+
+def _measure(monitor: ConnectionMonitor, targets: int) -> float:
+    started = time.perf_counter()
+    asyncio.run(monitor.start())
+    return targets / (time.perf_counter() - started)
+
+
+def run(targets=(100, 1_000, 10_000), concurrency: int = 1_000) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        stub = make_stub(Path(directory))
+        for count in targets:
+            monitor = _monitor(stub, count, concurrency)
+            monitor.executor = _SleepingEngine(0.01)
+            results[f"scheduler.sleeping_engine.probes_per_sec.{count}"] = _measure(monitor, count)
+
+        count = min(targets)
+        monitor = _monitor(stub, count, min(concurrency, 100))
+        results[f"scheduler.stub_ping_adv.probes_per_sec.{count}"] = _measure(monitor, count)
+    return results
@@ -0,0 +1,33 @@
+"""Interpreter start plus import time of the CLI and core modules, in fresh processes."""
+import subprocess
+import sys
+import time
+
+MODULES = ("ping_monitor.cli", "ping_monitor.core.monitor", "ping_monitor.core.executor")
+HEAVY = ("numpy", "rich")
+
+
+def _best(code: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _loaded(module: str) -> list:
+    code = f"import sys, {module}; print(' '.join(m for m in {HEAVY!r} if m in sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return output.split()
+
+
+def run(repeat: int = 10) -> dict:
+    baseline = _best("pass", repeat)
+    results = {"startup.interpreter_ms": baseline * 1000}
+    for module in MODULES:
+        results[f"startup.import_ms.{module}"] = (_best(f"import {module}", repeat) - baseline) * 1000
+        results[f"startup.heavy_modules.{module}"] = _loaded(module)
+    return results
@@ -0,0 +1,30 @@
+import time
+from pathlib import Path
+from typing import Callable
+
+STUB_SCRIPT = """#!/bin/sh
+# Fake ping_adv: prints per-packet lines and a result line without touching the network.
+i=1
+while [ "$i" -le "$2" ]; do
+    echo "64 bytes from $1: icmp_seq=$i ttl=64 time=0.$i ms"
+    i=$((i + 1))
+done
+echo "[$1] Test Result: Average Latency 1ms, Jitter 935529ns ($2 results)"
+"""
+
+
+def make_stub(directory: Path) -> Path:
+    stub = Path(directory) / "ping_adv"
+    stub.write_text(STUB_SCRIPT)
+    stub.chmod(0o755)
+    return stub
+
+
+def rate(operations: int, func: Callable[[], None], repeat: int = 3) -> float:
+    """Best observed operations per second over ``repeat`` runs of ``func``."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return operations / best
@@ -0,0 +1,98 @@
+"""Run the benchmark suite and write machine-readable JSON results.
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --quick
+    python -m benchmarks.run --compare before.json after.json
+
+No network access is needed: probes run against a fake ping_adv stub.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks import (
+    bench_detection,
+    bench_executor,
+    bench_history,
+    bench_parser,
+    bench_scheduler,
+    bench_startup,
+)
+
+SUITES = {
+    "parser": (bench_parser.run, {"sizes": (10, 1_000)}),
+    "executor": (bench_executor.run, {"probes": 40}),
+    "history": (bench_history.run, {"sizes": (1_000, 10_000)}),
+    "scheduler": (bench_scheduler.run, {"targets": (100, 1_000)}),
+    "detection": (bench_detection.run, {"targets": (100, 1_000), "rounds": 5}),
+    "startup": (bench_startup.run, {"repeat": 3}),
+}
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def run(suites, quick: bool = False) -> dict:
+    results = {}
+    for name in suites:
+        func, quick_kwargs = SUITES[name]
+        results.update(func(**quick_kwargs) if quick else func())
+    return {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "quick": quick,
+        "results": results,
+    }
+
+
+def compare(before: dict, after: dict) -> str:
+    lines = [f"{'benchmark':60} {'before':>14} {'after':>14} {'change':>8}"]
+    for key in sorted(set(before["results"]) & set(after["results"])):
+        old, new = before["results"][key], after["results"][key]
+        if isinstance(old, list):
+            lines.append(f"{key:60} {' '.join(old) or '-':>14} {' '.join(new) or '-':>14}")
+            continue
+        if isinstance(old, dict):
+            old, new = old["ops_per_sec"], new["ops_per_sec"]
+        lines.append(f"{key:60} {old:14.1f} {new:14.1f} {(new / old - 1) * 100:+7.1f}%")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES), help="suite to run (repeatable)")
+    parser.add_argument("--quick", action="store_true", help="use small sizes")
+    parser.add_argument("--output", type=Path, help="write JSON here instead of stdout")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        before, after = (json.loads(path.read_text()) for path in args.compare)
+        print(compare(before, after))
+        return 0
+
+    report = json.dumps(run(args.suite or list(SUITES), args.quick), indent=2)
+    if args.output:
+        args.output.write_text(report + "\n")
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,30 @@
 import asyncio
 import logging
 import signal
+import sys
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
 
 import typer
-from rich.console import Console
 
-from ping_monitor.core.monitor import ConnectionMonitor
-from ping_monitor.utils.config import MonitorConfig
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from ping_monitor.core.aggregator import Aggregator
+    from ping_monitor.core.monitor import ConnectionMonitor
+    from ping_monitor.core.supervisor import ShardSupervisor
 
 app = typer.Typer(help="Monitor network connection quality")
-console = Console()
+
+
+@cache
+def console() -> "Console":
+    # rich is only needed to report errors; importing it eagerly slows every start.
+    # Errors go to stderr so they never mix with results streamed on stdout.
+    from rich.console import Console
+
+    return Console(stderr=True)
 
 
 def setup_logging(verbose: bool) -> None:
@@ -22,7 +37,14 @@ def setup_logging(verbose: bool) -> None:
     )
 
 
-def handle_signals(monitor: ConnectionMonitor) -> None:
+def split_address(address: str) -> Tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        raise typer.BadParameter(f"Expected HOST:PORT, got {address!r}")
+    return host, int(port)
+
+
+def handle_signals(monitor: "Union[ConnectionMonitor, ShardSupervisor, Aggregator]") -> None:
     """Setup signal handlers."""
 
     def shutdown():
@@ -33,37 +55,292 @@ def handle_signals(monitor: ConnectionMonitor) -> None:
         loop.add_signal_handler(sig, shutdown)
 
 
-@app.command()
+@app.callback(invoke_without_command=True)
 def main(
+        ctx: typer.Context,
         verbose: bool = typer.Option(
             False,
             "--verbose", "-v",
             help="Enable verbose output"
+        ),
+        config_path: Optional[Path] = typer.Option(
+            None,
+            "--config", "-C",
+            help="TOML config file, reloaded when it changes"
+        ),
+        targets: Optional[List[str]] = typer.Option(
+            None,
+            "--target", "-t",
+            help="Target to monitor (repeatable)"
+        ),
+        concurrency: Optional[int] = typer.Option(
+            None,
+            "--concurrency", "-c",
+            help="Maximum number of concurrent probes [default: 64]"
+        ),
+        engine: Optional[str] = typer.Option(
+            None,
+            "--engine", "-e",
+            help="Probe engine: ping_adv, icmp or udp [default: ping_adv]"
+        ),
+        workers: Optional[int] = typer.Option(
+            None,
+            "--workers", "-w",
+            help="Worker processes that launch ping_adv off the event loop (0 spawns per probe)"
+        ),
+        metrics_port: Optional[int] = typer.Option(
+            None,
+            "--metrics-port", "-m",
+            help="Serve Prometheus metrics on this port"
+        ),
+        adaptive: bool = typer.Option(
+            False,
+            "--adaptive", "-a",
+            help="Adapt probe frequency to link stability"
+        ),
+        processes: int = typer.Option(
+            1,
+            "--processes", "-p",
+            help="Shard targets across this many worker processes"
+        ),
+        aggregator: Optional[str] = typer.Option(
+            None,
+            "--aggregator", "-A",
+            help="Push samples to the aggregator at HOST:PORT"
+        ),
+        vantage: Optional[str] = typer.Option(
+            None,
+            "--vantage",
+            help="Name of this vantage point [default: hostname]"
         )
 ) -> None:
     """Monitor network connection quality."""
+    if ctx.invoked_subcommand is not None:
+        return
+
+    from ping_monitor.core.monitor import ConnectionMonitor
+    from ping_monitor.models.exceptions import ConfigurationError
+    from ping_monitor.utils.config import MonitorConfig, ProbeTarget, load_log_config
+    from ping_monitor.utils.logging import LogConfig
+
+    # Options given on the command line win over the config file.
+    overrides = {
+        "targets": tuple(ProbeTarget(t) for t in targets) if targets else None,
+        "max_concurrency": concurrency,
+        "engine": engine,
+        "worker_pool_size": workers,
+        "metrics_port": metrics_port,
+        "adaptive": adaptive or None,
+        "log_level": "DEBUG" if verbose else None,
+    }
+    overrides = {name: value for name, value in overrides.items() if value is not None}
+    log_overrides = {"level": "DEBUG"} if verbose else {}
+
     try:
         setup_logging(verbose)
-        config = MonitorConfig.load()
-        monitor = ConnectionMonitor(config)
+        config = MonitorConfig.load(config_path, **overrides)
+        if config_path is not None:
+            log_config = load_log_config(config_path, **log_overrides)
+        else:
+            log_config = LogConfig(**log_overrides)
+        if processes > 1:
+            if aggregator is not None:
+                raise ConfigurationError("--aggregator needs a single process")
+            if config.metrics_port is not None:
+                raise ConfigurationError("--metrics-port needs a single process")
+            from ping_monitor.core.supervisor import ShardSupervisor
+
+            monitor = ShardSupervisor(
+                config,
+                processes,
+                log_config=log_config,
+                config_path=config_path,
+                config_overrides=overrides,
+                log_overrides=log_overrides
+            )
+        else:
+            monitor = ConnectionMonitor(
+                config,
+                log_config=log_config,
+                config_path=config_path,
+                config_overrides=overrides,
+                log_overrides=log_overrides
+            )
 
         async def run():
-            async with monitor:
-                handle_signals(monitor)
-                while monitor.is_running:
-                    await asyncio.sleep(1)
+            agent = None
+            if aggregator is not None:
+                from ping_monitor.core.agent import MetricsAgent
+
+                host, port = split_address(aggregator)
+                options = {"vantage": vantage} if vantage else {}
+                agent = MetricsAgent(monitor, host, port, **options)
+                agent.start()
+            try:
+                async with monitor:
+                    handle_signals(monitor)
+                    while monitor.is_running:
+                        await asyncio.sleep(1)
+            finally:
+                if agent is not None:
+                    await agent.stop()
 
         asyncio.run(run())
 
-    except FileNotFoundError as e:
-        console.print(f"[red]Error:[/red] {e}")
+    except (FileNotFoundError, ConfigurationError) as e:
+        console().print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+    except KeyboardInterrupt:
+        pass
+    except Exception:
+        console().print_exception()
+        raise typer.Exit(1)
+
+
+@app.command()
+def probe(
+        source: Path = typer.Argument(
+            Path("-"),
+            help="File with one target per line, '-' for stdin"
+        ),
+        output_format: str = typer.Option(
+            "ndjson",
+            "--format", "-f",
+            help="Output format: ndjson or csv"
+        ),
+        output: Optional[Path] = typer.Option(
+            None,
+            "--output", "-o",
+            help="Write results here instead of stdout"
+        ),
+        concurrency: int = typer.Option(
+            64,
+            "--concurrency", "-c",
+            help="Maximum number of concurrent probes"
+        ),
+        packet_count: int = typer.Option(
+            10,
+            "--count", "-n",
+            help="Packets per target"
+        ),
+        interval: float = typer.Option(
+            1.0,
+            "--interval", "-i",
+            help="Seconds between packets"
+        ),
+        engine: str = typer.Option(
+            "ping_adv",
+            "--engine", "-e",
+            help="Probe engine: ping_adv, icmp or udp"
+        ),
+        workers: int = typer.Option(
+            0,
+            "--workers", "-w",
+            help="Worker processes that launch ping_adv off the event loop (0 spawns per probe)"
+        )
+) -> None:
+    """Probe every target once and stream results as they finish."""
+    from ping_monitor.core.batch import FORMATS, ResultWriter, probe_all, read_targets
+    from ping_monitor.core.engine import create_engine
+    from ping_monitor.models.exceptions import ConfigurationError
+    from ping_monitor.utils.config import MonitorConfig
+
+    try:
+        logging.basicConfig(level=logging.WARNING, format="%(message)s")
+        config = MonitorConfig.load(
+            packet_count=packet_count,
+            interval=interval,
+            max_concurrency=concurrency,
+            engine=engine,
+            worker_pool_size=workers
+        )
+        # Checked before opening --output, which would truncate it.
+        if output_format not in FORMATS:
+            raise ConfigurationError(f"Unknown output format: {output_format}")
+        source_stream = sys.stdin if str(source) == "-" else source.open()
+        output_stream = sys.stdout if output is None else output.open("w", newline="")
+        writer = ResultWriter(output_stream, output_format)
+
+        async def run():
+            executor = create_engine(config)
+            try:
+                async for metrics in probe_all(
+                        executor,
+                        read_targets(source_stream),
+                        packet_count,
+                        interval,
+                        concurrency
+                ):
+                    writer.write(metrics)
+            finally:
+                await executor.close()
+
+        try:
+            asyncio.run(run())
+        finally:
+            for stream in (source_stream, output_stream):
+                if stream not in (sys.stdin, sys.stdout):
+                    stream.close()
+
+    except (FileNotFoundError, ValueError, ConfigurationError) as e:
+        console().print(f"[red]Error:[/red] {e}")
         raise typer.Exit(1)
     except KeyboardInterrupt:
         pass
     except Exception:
-        console.print_exception()
+        console().print_exception()
         raise typer.Exit(1)
 
 
+@app.command()
+def aggregate(
+        listen: str = typer.Option(
+            "127.0.0.1:9465",
+            "--listen", "-l",
+            help="Accept agent connections on HOST:PORT"
+        ),
+        report_interval: float = typer.Option(
+            60.0,
+            "--report", "-r",
+            help="Seconds between cross-vantage summaries"
+        ),
+        verbose: bool = typer.Option(
+            False,
+            "--verbose", "-v",
+            help="Enable verbose output"
+        )
+) -> None:
+    """Collect samples from agents and compare targets across vantage points."""
+    from ping_monitor.core.aggregator import Aggregator
+
+    try:
+        setup_logging(verbose)
+        host, port = split_address(listen)
+        aggregator = Aggregator(host, port)
+
+        async def run():
+            async with aggregator:
+                handle_signals(aggregator)
+                while not await aggregator.wait_stopped(report_interval):
+                    for target in aggregator.targets:
+                        comparison = aggregator.compare(target)
+                        logging.info(
+                            "[%s] reachable from %s, unreachable from %s, latency spread %s",
+                            target,
+                            ", ".join(comparison["reachable_from"]) or "none",
+                            ", ".join(comparison["unreachable_from"]) or "none",
+                            f"{comparison['latency_spread']:.2f}ms"
+                            if "latency_spread" in comparison else "n/a"
+                        )
+
+        asyncio.run(run())
+
+    except OSError as e:
+        console().print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+    except KeyboardInterrupt:
+        pass
+
+
 if __name__ == "__main__":
     app()
\ No newline at end of file
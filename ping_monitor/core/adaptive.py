@@ -0,0 +1,71 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+@dataclass
+class AdaptiveController:
+    """Per-target probe periods driven by observed stability.
+
+    Unstable samples (failures or significant latency/jitter changes)
+    divide a target's period by ``speedup`` down to ``min_interval``;
+    ``stable_after`` stable samples in a row multiply it by ``backoff`` up
+    to ``max_interval``. Speed-ups are only granted from the probe budget
+    left over, so the summed probe rate of all targets never grows beyond
+    ``budget`` probes per second. Every call is O(1).
+    """
+
+    min_interval: float
+    max_interval: float
+    budget: float
+    backoff: float = 1.5
+    speedup: float = 2.0
+    stable_after: int = 3
+
+    _periods: Dict[str, float] = field(default_factory=dict, init=False)
+    _streaks: Dict[str, int] = field(default_factory=dict, init=False)
+    _rate: float = field(default=0.0, init=False)
+
+    def add(self, host: str, period: float) -> None:
+        self.remove(host)
+        self._periods[host] = period
+        self._streaks[host] = 0
+        self._rate += 1 / period
+
+    def remove(self, host: str) -> None:
+        period = self._periods.pop(host, None)
+        if period is not None:
+            self._streaks.pop(host)
+            self._rate -= 1 / period
+
+    def period(self, host: str) -> Optional[float]:
+        return self._periods.get(host)
+
+    @property
+    def rate(self) -> float:
+        """Probes per second of all targets at their current periods."""
+        return self._rate
+
+    def observe(self, host: str, unstable: bool) -> Optional[float]:
+        """Update ``host`` with one sample; returns its new period if it changed."""
+        current = self._periods.get(host)
+        if current is None:
+            return None
+
+        if unstable:
+            self._streaks[host] = 0
+            if current <= self.min_interval:
+                return None
+            available = self.budget - (self._rate - 1 / current)
+            if available <= 1 / current:
+                return None
+            period = max(current / self.speedup, self.min_interval, 1 / available)
+        else:
+            self._streaks[host] += 1
+            if self._streaks[host] < self.stable_after or current >= self.max_interval:
+                return None
+            self._streaks[host] = 0
+            period = min(current * self.backoff, self.max_interval)
+
+        self._periods[host] = period
+        self._rate += 1 / period - 1 / current
+        return period
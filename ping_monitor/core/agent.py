@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import socket
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Deque, List, Optional, Tuple
+
+from ping_monitor.core.events import SAMPLE, Subscription
+from ping_monitor.core.instrumentation import Instrumentation, instrumentation
+from ping_monitor.core.wire import encode_frame, read_frame, sample_row
+from ping_monitor.models.exceptions import ProtocolError
+from ping_monitor.models.metrics import PingMetrics
+
+if TYPE_CHECKING:
+    from ping_monitor.core.monitor import ConnectionMonitor
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MetricsAgent:
+    """Pushes a monitor's samples to an Aggregator as batched, compressed frames.
+
+    Samples are batched up to ``batch_size`` or ``flush_interval`` seconds
+    after the first one, whichever comes first, and sent over a single
+    persistent connection (see ``ping_monitor.core.wire``). Batches stay
+    queued until acknowledged and are resent after a reconnect, so an
+    aggregator restart loses nothing as long as no more than
+    ``max_pending`` batches pile up; beyond that the oldest are dropped
+    and counted in ``agent.dropped``.
+    """
+
+    monitor: "ConnectionMonitor"
+    host: str
+    port: int = 9465
+    vantage: str = field(default_factory=socket.gethostname)
+    batch_size: int = 500
+    flush_interval: float = 1.0
+    reconnect_delay: float = 1.0
+    max_pending: int = 64
+    registry: Instrumentation = field(default_factory=lambda: instrumentation)
+
+    _session: str = field(default_factory=lambda: uuid.uuid4().hex, init=False)
+    _seq: int = field(default=0, init=False)
+    _pending: Deque[Tuple[int, bytes]] = field(default_factory=deque, init=False)
+    _subscription: Optional[Subscription] = field(default=None, init=False)
+    _batcher: Optional[asyncio.Task] = field(default=None, init=False)
+    _sender: Optional[asyncio.Task] = field(default=None, init=False)
+    _queued: Optional[asyncio.Event] = field(default=None, init=False)
+    _acked: Optional[asyncio.Event] = field(default=None, init=False)
+    _connected: bool = field(default=False, init=False)
+
+    def start(self) -> None:
+        if self._batcher is not None:
+            return
+        self._queued = asyncio.Event()
+        self._acked = asyncio.Event()
+        self._subscription = self.monitor.subscribe(
+            SAMPLE, maxsize=self.batch_size * self.max_pending
+        )
+        self._batcher = asyncio.create_task(self._batch())
+        self._sender = asyncio.create_task(self._send())
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Send what is queued, waiting up to ``timeout`` for acknowledgements."""
+        if self._batcher is None:
+            return
+        self._subscription.close()
+        await self._batcher
+        try:
+            await asyncio.wait_for(self._drain(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Dropping %d unacknowledged batches", len(self._pending))
+        self._sender.cancel()
+        await asyncio.gather(self._sender, return_exceptions=True)
+        self._batcher = self._sender = None
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    @property
+    def pending(self) -> int:
+        """Batches sent or waiting to be sent but not yet acknowledged."""
+        return len(self._pending)
+
+    async def _batch(self) -> None:
+        loop = asyncio.get_running_loop()
+        subscription = self._subscription
+        while True:
+            try:
+                event = await subscription.__anext__()
+            except StopAsyncIteration:
+                return
+
+            batch: List[PingMetrics] = [event.data]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.__anext__(), max(deadline - loop.time(), 0)
+                    )
+                except (asyncio.TimeoutError, StopAsyncIteration):
+                    break
+                batch.append(event.data)
+            self._enqueue(batch)
+
+    def _enqueue(self, batch: List[PingMetrics]) -> None:
+        self._seq += 1
+        frame = encode_frame({"seq": self._seq, "samples": [sample_row(m) for m in batch]})
+        self._pending.append((self._seq, frame))
+        if len(self._pending) > self.max_pending:
+            self._pending.popleft()
+            self.registry.increment("agent.dropped")
+        self._queued.set()
+
+    async def _drain(self) -> None:
+        while self._pending:
+            self._acked.clear()
+            await self._acked.wait()
+
+    async def _send(self) -> None:
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+            except OSError as e:
+                logger.warning("Cannot reach aggregator %s:%d: %s", self.host, self.port, e)
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+
+            logger.info("Connected to aggregator %s:%d as %s", self.host, self.port, self.vantage)
+            self._connected = True
+            try:
+                await self._session_loop(reader, writer)
+            except (ConnectionError, asyncio.IncompleteReadError, ProtocolError) as e:
+                logger.warning("Aggregator connection lost: %s", e)
+            finally:
+                self._connected = False
+                writer.close()
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _session_loop(
+            self,
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter
+    ) -> None:
+        writer.write(encode_frame({"vantage": self.vantage, "session": self._session}))
+        acks = asyncio.create_task(self._read_acks(reader))
+        try:
+            sent = 0
+            while not acks.done():
+                self._queued.clear()
+                for seq, frame in tuple(self._pending):
+                    if seq > sent:
+                        writer.write(frame)
+                        sent = seq
+                await writer.drain()
+
+                queued = asyncio.create_task(self._queued.wait())
+                await asyncio.wait((acks, queued), return_when=asyncio.FIRST_COMPLETED)
+                queued.cancel()
+            await acks
+        finally:
+            acks.cancel()
+
+    async def _read_acks(self, reader: asyncio.StreamReader) -> None:
+        while (message := await read_frame(reader)) is not None:
+            ack = message.get("ack")
+            if not isinstance(ack, int):
+                raise ProtocolError(f"Expected an acknowledgement, got {message!r}")
+            while self._pending and self._pending[0][0] <= ack:
+                self._pending.popleft()
+            self._acked.set()
+        raise ConnectionResetError("Aggregator closed the connection")
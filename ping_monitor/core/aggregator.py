@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from ping_monitor.core.wire import encode_frame, read_frame, sample_from_row
+from ping_monitor.models.exceptions import ProtocolError
+from ping_monitor.models.history import MetricHistory
+from ping_monitor.models.metrics import PingMetrics
+from ping_monitor.models.stats import RunningStats, summarize
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class VantageView:
+    """One target as seen from one vantage point."""
+
+    history: MetricHistory
+    stats: RunningStats
+    latest: Optional[PingMetrics] = None
+
+
+@dataclass
+class Aggregator:
+    """Collects samples pushed by MetricsAgents into per-target, per-vantage views.
+
+    Every agent connection names its vantage point. Each (target, vantage)
+    pair keeps its own history window and running stats, so a target can
+    be summarised per vantage, across vantages, or compared between them
+    with ``compare``.
+
+    Every ``expire_interval`` seconds samples older than ``window`` are
+    trimmed, so a vantage that stops reporting drops out once its last
+    sample ages out, as does the batch sequence state of its sessions.
+    """
+
+    host: str = "127.0.0.1"
+    port: int = 9465
+    history_capacity: int = 4096
+    window: float = 3600.0
+    expire_interval: float = 60.0
+
+    _server: Optional[asyncio.AbstractServer] = field(default=None, init=False)
+    _stopped: Optional[asyncio.Event] = field(default=None, init=False)
+    _expiry: Optional[asyncio.Task] = field(default=None, init=False)
+    _views: Dict[str, Dict[str, VantageView]] = field(default_factory=dict, init=False)
+    # (vantage, session) -> (last accepted seq, monotonic time last seen)
+    _sessions: Dict[Tuple[str, Optional[str]], Tuple[int, float]] = field(
+        default_factory=dict, init=False
+    )
+    _connections: Dict[asyncio.StreamWriter, asyncio.Task] = field(
+        default_factory=dict, init=False
+    )
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._stopped = asyncio.Event()
+        self._expiry = asyncio.create_task(self._expire_every(self.expire_interval))
+        logger.info("Aggregating agent metrics on %s:%d", self.host, self.port)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            self._expiry.cancel()
+            # Closing the sockets ends each handler the same way an agent hanging up does.
+            for writer in self._connections:
+                writer.close()
+            await asyncio.gather(
+                self._expiry, *self._connections.values(), return_exceptions=True
+            )
+            await self._server.wait_closed()
+            self._server = None
+            self._stopped.set()
+
+    async def wait_stopped(self, timeout: Optional[float] = None) -> bool:
+        """Wait up to ``timeout`` seconds for ``stop``; True once stopped."""
+        if self._stopped is None:
+            return True
+        try:
+            await asyncio.wait_for(self._stopped.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._stopped.is_set()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.stop()
+
+    def add(self, vantage: str, metrics: PingMetrics) -> None:
+        views = self._views.setdefault(metrics.target, {})
+        view = views.get(vantage)
+        if view is None:
+            stats = RunningStats()
+            view = views[vantage] = VantageView(
+                MetricHistory(
+                    capacity=self.history_capacity,
+                    window=timedelta(seconds=self.window),
+                    on_evict=stats.remove
+                ),
+                stats
+            )
+        view.stats.add(metrics)
+        view.history.append(metrics)
+        view.latest = metrics
+
+    def expire(self, now: Optional[datetime] = None) -> None:
+        """Trim samples older than ``window`` and drop views and sessions left empty."""
+        for target, views in list(self._views.items()):
+            for vantage, view in list(views.items()):
+                view.history.trim(now)
+                if not len(view.history):
+                    del views[vantage]
+            if not views:
+                del self._views[target]
+        idle = time.monotonic() - self.window
+        self._sessions = {key: state for key, state in self._sessions.items() if state[1] > idle}
+
+    @property
+    def is_running(self) -> bool:
+        return self._server is not None
+
+    @property
+    def targets(self) -> Tuple[str, ...]:
+        return tuple(self._views)
+
+    @property
+    def vantages(self) -> Tuple[str, ...]:
+        return tuple(sorted({v for views in self._views.values() for v in views}))
+
+    def views(self, target: str) -> Dict[str, VantageView]:
+        return dict(self._views.get(target, {}))
+
+    def get_stats(self, target: Optional[str] = None, vantage: Optional[str] = None) -> dict:
+        return summarize(view.stats for view in self._select(target, vantage))
+
+    def compare(self, target: str) -> dict:
+        """Per-vantage stats of ``target`` and how the vantage points disagree.
+
+        ``latency_spread`` is the gap between the best and worst vantage's
+        average latency; ``unreachable_from`` lists vantages whose latest
+        probe failed, so a partial outage shows up as a non-empty list
+        alongside a non-empty ``reachable_from``.
+        """
+        views = self._views.get(target, {})
+        per_vantage = {vantage: view.stats.as_dict() for vantage, view in sorted(views.items())}
+        latencies = {
+            vantage: stats["avg_latency"]
+            for vantage, stats in per_vantage.items()
+            if "avg_latency" in stats
+        }
+        up = {v: view.latest.success for v, view in views.items() if view.latest is not None}
+        comparison = {
+            "vantages": per_vantage,
+            "overall": self.get_stats(target),
+            "reachable_from": sorted(v for v, success in up.items() if success),
+            "unreachable_from": sorted(v for v, success in up.items() if not success),
+        }
+        if latencies:
+            comparison.update(
+                best=min(latencies, key=latencies.get),
+                worst=max(latencies, key=latencies.get),
+                latency_spread=max(latencies.values()) - min(latencies.values())
+            )
+        return comparison
+
+    def _select(self, target: Optional[str], vantage: Optional[str]) -> Iterable[VantageView]:
+        targets = self._views.values() if target is None else [self._views.get(target, {})]
+        for views in targets:
+            for name, view in views.items():
+                if vantage is None or name == vantage:
+                    yield view
+
+    async def _expire_every(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            self.expire()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections[writer] = asyncio.current_task()
+        vantage = None
+        try:
+            hello = await read_frame(reader)
+            if not isinstance(hello, dict) or not isinstance(hello.get("vantage"), str):
+                raise ProtocolError(f"Expected a hello frame, got {hello!r}")
+            vantage, session = hello["vantage"], hello.get("session")
+            logger.info("Agent %s connected", vantage)
+
+            # Every agent run numbers its batches from 1 under a fresh session,
+            # and several agents may share a vantage name.
+            key = (vantage, session)
+            while (message := await read_frame(reader)) is not None:
+                seq = message["seq"]
+                last = self._sessions.get(key, (0, 0.0))[0]
+                if seq > last:
+                    for row in message["samples"]:
+                        self.add(vantage, sample_from_row(row))
+                    last = seq
+                self._sessions[key] = (last, time.monotonic())
+                writer.write(encode_frame({"ack": seq}))
+                await writer.drain()
+        except (ProtocolError, KeyError, TypeError, ValueError) as e:
+            logger.warning("Dropping agent %s: %s", vantage or "connection", e)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if vantage is not None:
+                logger.info("Agent %s disconnected", vantage)
+            del self._connections[writer]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
@@ -0,0 +1,124 @@
+import asyncio
+import csv
+import json
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, TextIO, Tuple
+
+from ping_monitor.core.engine import ProbeEngine
+from ping_monitor.models.metrics import PingMetrics
+
+FORMATS: Tuple[str, ...] = ("ndjson", "csv")
+FIELDS: Tuple[str, ...] = (
+    "target",
+    "timestamp",
+    "success",
+    "average_latency",
+    "jitter",
+    "packet_count",
+    "success_count",
+    "packet_loss",
+    "error",
+)
+
+
+def read_targets(lines: Iterable[str]) -> Iterator[str]:
+    """Targets one per line; blank lines and ``#`` comments are skipped."""
+    for line in lines:
+        target = line.split("#", 1)[0].strip()
+        if target:
+            yield target
+
+
+async def probe_all(
+        engine: ProbeEngine,
+        targets: Iterable[str],
+        packet_count: int,
+        interval: float,
+        concurrency: int = 64
+) -> AsyncIterator[PingMetrics]:
+    """Probe ``targets`` with ``concurrency`` workers, yielding results as they finish.
+
+    Targets are pulled from the iterable only as workers free up, in a
+    worker thread so a slow stdin never blocks the event loop, and results
+    queue up to ``concurrency`` deep before workers wait for the consumer.
+    Memory is flat regardless of how many targets there are.
+    """
+    loop = asyncio.get_running_loop()
+    source = iter(targets)
+    queued: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+    results: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+
+    failure: List[BaseException] = []
+
+    # Failures are handed over rather than raised so every queue keeps its
+    # consumer; cancellation skips the hand-over entirely.
+    async def feed() -> None:
+        try:
+            while (target := await loop.run_in_executor(None, next, source, None)) is not None:
+                await queued.put(target)
+        except Exception as e:
+            failure.append(e)
+        for _ in range(concurrency):
+            await queued.put(None)
+
+    async def work() -> None:
+        try:
+            while (target := await queued.get()) is not None:
+                await results.put(await engine.execute_async(target, packet_count, interval))
+        except Exception as e:
+            await results.put(e)
+        await results.put(None)
+
+    tasks = [asyncio.create_task(feed())]
+    tasks.extend(asyncio.create_task(work()) for _ in range(concurrency))
+    try:
+        running = concurrency
+        while running:
+            result = await results.get()
+            if result is None:
+                running -= 1
+            elif isinstance(result, Exception):
+                raise result
+            else:
+                yield result
+        if failure:
+            raise failure[0]
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def as_record(metrics: PingMetrics) -> Dict[str, object]:
+    return {
+        "target": metrics.target,
+        "timestamp": metrics.timestamp.isoformat(),
+        "success": metrics.success,
+        "average_latency": metrics.average_latency if metrics.success else None,
+        "jitter": metrics.jitter if metrics.success else None,
+        "packet_count": metrics.packet_count,
+        "success_count": metrics.success_count,
+        "packet_loss": metrics.packet_loss,
+        "error": metrics.error_message,
+    }
+
+
+class ResultWriter:
+    """Writes one NDJSON or CSV row per result and flushes it immediately."""
+
+    def __init__(self, stream: TextIO, format: str = "ndjson") -> None:
+        if format not in FORMATS:
+            raise ValueError(f"Unknown output format: {format}")
+        self.stream = stream
+        self.format = format
+        self._csv = None
+        if format == "csv":
+            self._csv = csv.DictWriter(stream, fieldnames=FIELDS, lineterminator="\n")
+            self._csv.writeheader()
+
+    def write(self, metrics: PingMetrics) -> None:
+        record = as_record(metrics)
+        if self._csv is not None:
+            self._csv.writerow(record)
+        else:
+            self.stream.write(json.dumps(record) + "\n")
+        self.stream.flush()
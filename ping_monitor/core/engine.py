@@ -0,0 +1,29 @@
+from typing import Protocol, runtime_checkable
+
+from ping_monitor.models.metrics import PingMetrics
+from ping_monitor.utils.config import MonitorConfig
+
+
+@runtime_checkable
+class ProbeEngine(Protocol):
+    """Backend that measures latency and jitter for a single target."""
+
+    async def execute_async(self, target: str, packet_count: int, interval: float) -> PingMetrics:
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+def create_engine(config: MonitorConfig) -> ProbeEngine:
+    if config.engine == "ping_adv":
+        from ping_monitor.core.executor import PingExecutor
+        from ping_monitor.core.pool import WorkerPool
+
+        pool = None
+        if config.worker_pool_size:
+            pool = WorkerPool.for_ping_adv(config.ping_adv_path, config.worker_pool_size)
+        return PingExecutor(config.ping_adv_path, pool=pool)
+
+    from ping_monitor.core.socket_engine import SocketProbeEngine
+    return SocketProbeEngine(mode=config.engine, port=config.echo_port)
@@ -0,0 +1,189 @@
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import (
+    Any, Callable, ClassVar, Deque, Dict, FrozenSet, Iterable, List, NamedTuple, Optional
+)
+
+logger = logging.getLogger(__name__)
+
+SAMPLE = "sample"
+STATE = "state"
+ANOMALY = "anomaly"
+TOPICS: FrozenSet[str] = frozenset((SAMPLE, STATE, ANOMALY))
+
+
+class Event(NamedTuple):
+    topic: str
+    data: Any
+
+
+@dataclass(frozen=True)
+class StateChange:
+    target: str
+    timestamp: datetime
+    up: bool
+    previous: Optional[bool] = None
+
+    def __str__(self) -> str:
+        state = "up" if self.up else "down"
+        return f"[{self.target}] Connection {state}"
+
+
+@dataclass(eq=False)
+class Subscription:
+    """Bounded event queue read as an async iterator.
+
+    When the queue is full ``policy`` decides: ``drop_oldest`` discards
+    the oldest queued event, ``drop_newest`` discards the incoming one and
+    ``disconnect`` closes the subscription, ending iteration once the
+    queued events are consumed. Discarded events are counted in
+    ``dropped``.
+    """
+
+    POLICIES: ClassVar[tuple] = ("drop_oldest", "drop_newest", "disconnect")
+
+    topics: FrozenSet[str]
+    maxsize: int = 1000
+    policy: str = "drop_oldest"
+    dropped: int = field(default=0, init=False)
+
+    _queue: Deque[Event] = field(default_factory=deque, init=False)
+    _ready: asyncio.Event = field(default_factory=asyncio.Event, init=False)
+    _closed: bool = field(default=False, init=False)
+    _bus: Optional["EventBus"] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.policy not in self.POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {self.policy}")
+        if self.maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def put(self, event: Event) -> None:
+        if self._closed:
+            return
+        if len(self._queue) >= self.maxsize:
+            self.dropped += 1
+            if self.policy == "drop_newest":
+                return
+            if self.policy == "disconnect":
+                logger.warning("Disconnecting slow subscriber after %d events", self.maxsize)
+                self.close()
+                return
+            self._queue.popleft()
+        self._queue.append(event)
+        self._ready.set()
+
+    def get_nowait(self) -> Optional[Event]:
+        return self._queue.popleft() if self._queue else None
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._ready.set()
+            if self._bus is not None:
+                self._bus.unsubscribe(self)
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> Event:
+        while not self._queue:
+            if self._closed:
+                raise StopAsyncIteration
+            self._ready.clear()
+            await self._ready.wait()
+        return self._queue.popleft()
+
+    async def __aenter__(self) -> "Subscription":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        self.close()
+
+
+@dataclass
+class EventBus:
+    """Fan-out of monitor events to queued subscribers and inline listeners.
+
+    Publishing never blocks or awaits: each subscriber gets a reference to
+    the same event object in its own bounded queue, and listeners are
+    plain callbacks that must return quickly.
+    """
+
+    _subscriptions: Dict[str, List[Subscription]] = field(
+        default_factory=lambda: {topic: [] for topic in TOPICS}, init=False
+    )
+    _listeners: Dict[str, List[Callable[[Any], None]]] = field(
+        default_factory=lambda: {topic: [] for topic in TOPICS}, init=False
+    )
+
+    def subscribe(
+            self,
+            topics: Iterable[str] = TOPICS,
+            maxsize: int = 1000,
+            policy: str = "drop_oldest"
+    ) -> Subscription:
+        topics = self._check(topics)
+        subscription = Subscription(topics, maxsize, policy)
+        subscription._bus = self
+        for topic in topics:
+            self._subscriptions[topic].append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for topic in subscription.topics:
+            if subscription in self._subscriptions[topic]:
+                self._subscriptions[topic].remove(subscription)
+        subscription.close()
+
+    def add_listener(
+            self,
+            callback: Callable[[Any], None],
+            topics: Iterable[str] = TOPICS
+    ) -> Callable[[], None]:
+        """Call ``callback`` with each event's data; returns a function that removes it."""
+        topics = self._check(topics)
+        for topic in topics:
+            self._listeners[topic].append(callback)
+
+        def remove() -> None:
+            for topic in topics:
+                if callback in self._listeners[topic]:
+                    self._listeners[topic].remove(callback)
+        return remove
+
+    def publish(self, topic: str, data: Any) -> None:
+        subscriptions, listeners = self._subscriptions[topic], self._listeners[topic]
+        if not subscriptions and not listeners:
+            return
+        event = Event(topic, data)
+        for subscription in tuple(subscriptions):
+            subscription.put(event)
+        for callback in tuple(listeners):
+            try:
+                callback(data)
+            except Exception:
+                logger.exception("Event listener failed")
+
+    def close(self) -> None:
+        for subscriptions in self._subscriptions.values():
+            for subscription in tuple(subscriptions):
+                subscription.close()
+
+    @staticmethod
+    def _check(topics: Iterable[str]) -> FrozenSet[str]:
+        topics = frozenset((topics,) if isinstance(topics, str) else topics)
+        unknown = topics - TOPICS
+        if unknown:
+            raise ValueError(f"Unknown topics: {', '.join(sorted(unknown))}")
+        return topics
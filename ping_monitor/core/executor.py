@@ -1,15 +1,18 @@
+import asyncio
 import logging
-import re
 import subprocess
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Match, Final, ClassVar
+from typing import List, Final, Optional
 
+from ping_monitor.core.instrumentation import instrumentation
+from ping_monitor.core.parser import Output, parse_packet_samples, parse_result
+from ping_monitor.core.pool import WorkerPool
+from ping_monitor.models.analysis import analyze
 from ping_monitor.models.metrics import PingMetrics
-from ping_monitor.utils.logging import LogConfig, setup_logging
 
-setup_logging(LogConfig())
 logger = logging.getLogger(__name__)
 
 
@@ -17,14 +20,8 @@ logger = logging.getLogger(__name__)
 class PingExecutor:
     ping_adv_path: Path
 
-    PATTERN: ClassVar[str] = (
-        r'\[(.*?)\] Test Result: '
-        r'Average Latency (\d+)ms, '
-        r'Jitter (\d+)(ms|ns) '
-        r'\((\d+) results\)'
-    )
-    NS_TO_MS: Final[float] = 1_000_000.0
     TIMEOUT_BUFFER: Final[int] = 5
+    pool: Optional[WorkerPool] = None
 
     def __post_init__(self) -> None:
         if not self.ping_adv_path.is_file():
@@ -34,57 +31,135 @@ class PingExecutor:
         logger.debug("Using ping_adv at: %s", self.ping_adv_path)
 
     def execute(self, target: str, packet_count: int, interval: float) -> PingMetrics:
+        started = time.perf_counter()
         try:
-            cmd = [str(self.ping_adv_path), target, str(packet_count), str(interval)]
+            cmd = self._command(target, packet_count, interval)
             logger.debug("Running command: %s", ' '.join(cmd))
 
             result = subprocess.run(
                 cmd,
                 capture_output=True,
-                text=True,
-                timeout=packet_count * interval + self.TIMEOUT_BUFFER,
+                timeout=self._timeout(packet_count, interval),
                 check=False
             )
-
-            if result.returncode != 0:
-                return self._as_error(target, packet_count, result.stderr.strip())
-
-            metrics = self._parse_output(result.stdout.strip(), target, packet_count)
-            logger.debug("Parsed metrics: %s", metrics)
-            return metrics
+            return self._handle_result(
+                target, packet_count, result.returncode, result.stdout, result.stderr
+            )
 
         except subprocess.TimeoutExpired:
             return self._as_error(target, packet_count, "Command timed out")
         except Exception as e:
             logger.exception("Unexpected error")
             return self._as_error(target, packet_count, str(e))
+        finally:
+            instrumentation.observe("executor.wall", time.perf_counter() - started)
+
+    async def execute_async(self, target: str, packet_count: int, interval: float) -> PingMetrics:
+        started = time.perf_counter()
+        if self.pool is not None:
+            try:
+                return await self._execute_pooled(target, packet_count, interval)
+            finally:
+                instrumentation.observe("executor.wall", time.perf_counter() - started)
+
+        process = None
+        try:
+            cmd = self._command(target, packet_count, interval)
+            logger.debug("Running command: %s", ' '.join(cmd))
 
-    def _parse_output(self, output: str, target: str, packet_count: int) -> PingMetrics:
-        match = re.search(self.PATTERN, output)
-        if not match:
-            logger.error("Invalid output format: %s", output)
-            return self._as_error(target, packet_count, "Invalid output format")
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            instrumentation.observe("executor.spawn", time.perf_counter() - started)
+            stdout, stderr = await asyncio.wait_for(
+                process.communicate(),
+                timeout=self._timeout(packet_count, interval)
+            )
+            return self._handle_result(
+                target,
+                packet_count,
+                process.returncode,
+                stdout,
+                stderr
+            )
 
+        except asyncio.TimeoutError:
+            return self._as_error(target, packet_count, "Command timed out")
+        except Exception as e:
+            logger.exception("Unexpected error")
+            return self._as_error(target, packet_count, str(e))
+        finally:
+            if process is not None and process.returncode is None:
+                await self._reap(process)
+            instrumentation.observe("executor.wall", time.perf_counter() - started)
+
+    async def _execute_pooled(self, target: str, packet_count: int, interval: float) -> PingMetrics:
         try:
-            latency = float(match.group(2))
-            jitter = self._parse_jitter(match)
-            success_count = int(match.group(5))
-
-            return PingMetrics(
-                timestamp=datetime.now(),
-                target=target,
-                average_latency=latency,
-                jitter=jitter,
-                packet_count=packet_count,
-                success_count=success_count
+            returncode, stdout, stderr = await self.pool.submit(
+                target, packet_count, interval, self._timeout(packet_count, interval)
             )
-        except ValueError as e:
-            logger.error("Failed to parse values: %s", e)
+            return self._handle_result(target, packet_count, returncode, stdout, stderr)
+        except Exception as e:
+            logger.exception("Unexpected error")
+            return self._as_error(target, packet_count, str(e))
+
+    async def close(self) -> None:
+        if self.pool is not None:
+            await self.pool.close()
+
+    @staticmethod
+    async def _reap(process: asyncio.subprocess.Process) -> None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+        await process.wait()
+
+    def _command(self, target: str, packet_count: int, interval: float) -> List[str]:
+        return [str(self.ping_adv_path), target, str(packet_count), str(interval)]
+
+    def _timeout(self, packet_count: int, interval: float) -> float:
+        return packet_count * interval + self.TIMEOUT_BUFFER
+
+    def _handle_result(
+            self,
+            target: str,
+            packet_count: int,
+            returncode: int,
+            stdout: Output,
+            stderr: Output
+    ) -> PingMetrics:
+        if returncode != 0:
+            if isinstance(stderr, bytes):
+                stderr = stderr.decode(errors="replace")
+            return self._as_error(target, packet_count, (stderr or "").strip())
+
+        started = time.perf_counter()
+        metrics = self._parse_output(stdout or b"", target, packet_count)
+        instrumentation.observe("executor.parse", time.perf_counter() - started)
+        logger.debug("Parsed metrics: %s", metrics)
+        return metrics
+
+    def _parse_output(self, output: Output, target: str, packet_count: int) -> PingMetrics:
+        result = parse_result(output)
+        if result is None:
+            logger.error("Invalid output format: %r", output)
             return self._as_error(target, packet_count, "Invalid output format")
 
-    def _parse_jitter(self, match: Match[str]) -> float:
-        jitter = float(match.group(3))
-        return jitter / self.NS_TO_MS if match.group(4) == 'ns' else jitter
+        sequence, rtts = parse_packet_samples(output)
+        return PingMetrics(
+            timestamp=datetime.now(),
+            target=target,
+            average_latency=result.average_latency,
+            jitter=result.jitter,
+            packet_count=packet_count,
+            success_count=result.success_count,
+            rtts=rtts or None,
+            analysis=analyze(rtts, sequence, packet_count)
+        )
 
     def _as_error(self, target: str, packet_count: int, error: str) -> PingMetrics:
         return PingMetrics(
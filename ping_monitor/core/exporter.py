@@ -0,0 +1,229 @@
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from ping_monitor.core.instrumentation import instrumentation
+from ping_monitor.models.metrics import PingMetrics
+from ping_monitor.models.stats import RunningStats, TargetCounters
+
+if TYPE_CHECKING:
+    from ping_monitor.core.monitor import ConnectionMonitor
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "ping_monitor"
+PROMETHEUS_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+Getter = Callable[[Optional[PingMetrics], Optional[RunningStats], TargetCounters], Optional[float]]
+
+
+@dataclass(frozen=True)
+class Family:
+    name: str
+    kind: str
+    help: str
+    value: Getter
+
+    @property
+    def sample_name(self) -> str:
+        return f"{PREFIX}_{self.name}_total" if self.kind == "counter" else f"{PREFIX}_{self.name}"
+
+    def header(self, openmetrics: bool) -> str:
+        name = f"{PREFIX}_{self.name}" if openmetrics else self.sample_name
+        return f"# HELP {name} {self.help}\n# TYPE {name} {self.kind}\n"
+
+
+def _window(attribute: str) -> Getter:
+    def value(latest, stats, counters):
+        if stats is None or not stats.successful:
+            return None
+        return getattr(stats, attribute)
+    return value
+
+
+def _window_loss(latest, stats, counters) -> Optional[float]:
+    if stats is None or not stats.packets_sent:
+        return None
+    return (stats.packets_sent - stats.packets_received) / stats.packets_sent
+
+
+FAMILIES: Tuple[Family, ...] = (
+    Family("up", "gauge", "Whether the last probe of the target succeeded.",
+           lambda m, s, c: None if m is None else float(m.success)),
+    Family("latency_ms", "gauge", "Average latency of the last probe in milliseconds.",
+           lambda m, s, c: m.average_latency if m is not None and m.success else None),
+    Family("jitter_ms", "gauge", "Jitter of the last probe in milliseconds.",
+           lambda m, s, c: m.jitter if m is not None and m.success else None),
+    Family("packet_loss_ratio", "gauge", "Packet loss of the last probe (0-1).",
+           lambda m, s, c: None if m is None else m.packet_loss / 100),
+    Family("window_min_latency_ms", "gauge", "Minimum latency over the raw history window.",
+           _window("min_latency")),
+    Family("window_max_latency_ms", "gauge", "Maximum latency over the raw history window.",
+           _window("max_latency")),
+    Family("window_packet_loss_ratio", "gauge", "Packet loss over the raw history window (0-1).",
+           _window_loss),
+    Family("probes", "counter", "Probes run against the target.",
+           lambda m, s, c: c.probes),
+    Family("probe_successes", "counter", "Successful probes of the target.",
+           lambda m, s, c: c.successes),
+    Family("packets_sent", "counter", "Echo requests sent to the target.",
+           lambda m, s, c: c.packets_sent),
+    Family("packets_received", "counter", "Echo replies received from the target.",
+           lambda m, s, c: c.packets_received),
+)
+EVENTS = Family("internal_events", "counter", "Internal events counted by the monitor itself.",
+                lambda m, s, c: None)
+
+
+def _format(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r'\"')
+
+
+@dataclass
+class MetricsExporter:
+    """Serves ``/metrics`` in Prometheus text or OpenMetrics format.
+
+    Sample lines are cached per target and re-rendered only when the
+    target's counters version moves, so a scrape costs O(targets) string
+    joins regardless of history size. Whole responses are additionally
+    reused for ``cache_ttl`` seconds.
+    """
+
+    monitor: "ConnectionMonitor"
+    host: str = "127.0.0.1"
+    port: int = 9464
+    cache_ttl: float = 1.0
+
+    _server: Optional[asyncio.AbstractServer] = field(default=None, init=False)
+    _lines: Dict[str, Tuple[int, List[str]]] = field(default_factory=dict, init=False)
+    _responses: Dict[bool, Tuple[float, bytes]] = field(default_factory=dict, init=False)
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("Serving metrics on http://%s:%d/metrics", self.host, self.port)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def render(self, openmetrics: bool = False) -> bytes:
+        now = time.monotonic()
+        cached = self._responses.get(openmetrics)
+        if cached is not None and now - cached[0] < self.cache_ttl:
+            return cached[1]
+
+        per_family: List[List[str]] = [[] for _ in FAMILIES]
+        counters = self.monitor.counters
+        for target, target_counters in counters.items():
+            for index, line in enumerate(self._target_lines(target, target_counters)):
+                if line:
+                    per_family[index].append(line)
+        for target in set(self._lines) - set(counters):
+            del self._lines[target]
+
+        parts = []
+        for family, lines in zip(FAMILIES, per_family):
+            parts.append(family.header(openmetrics))
+            parts.extend(lines)
+        parts.append(self._render_instrumentation(openmetrics))
+        if openmetrics:
+            parts.append("# EOF\n")
+
+        body = "".join(parts).encode()
+        self._responses[openmetrics] = (now, body)
+        return body
+
+    def _target_lines(self, target: str, counters: TargetCounters) -> List[str]:
+        cached = self._lines.get(target)
+        if cached is not None and cached[0] == counters.version:
+            return cached[1]
+
+        latest = self.monitor.latest(target)
+        stats = self.monitor.running_stats(target)
+        label = f'{{target="{_label(target)}"}}'
+        lines = []
+        for family in FAMILIES:
+            value = family.value(latest, stats, counters)
+            lines.append(
+                f"{family.sample_name}{label} {_format(value)}\n" if value is not None else ""
+            )
+        self._lines[target] = (counters.version, lines)
+        return lines
+
+    def _render_instrumentation(self, openmetrics: bool) -> str:
+        name = f"{PREFIX}_internal_seconds"
+        parts = [
+            f"# HELP {name} Internal timings of the monitor itself.\n",
+            f"# TYPE {name} histogram\n",
+        ]
+        for metric, histogram in sorted(instrumentation.histograms().items()):
+            label = _label(metric)
+            for bound, count in histogram.buckets():
+                parts.append(f'{name}_bucket{{name="{label}",le="{_format(bound)}"}} {count}\n')
+            parts.append(f'{name}_sum{{name="{label}"}} {_format(histogram.total)}\n')
+            parts.append(f'{name}_count{{name="{label}"}} {histogram.count}\n')
+
+        parts.append(EVENTS.header(openmetrics))
+        for metric, value in sorted(instrumentation.counters().items()):
+            parts.append(f'{EVENTS.sample_name}{{name="{_label(metric)}"}} {value}\n')
+        return "".join(parts)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5)
+            request_line, _, headers = request.partition(b"\r\n")
+            method, path, *_ = request_line.split(b" ") + [b"", b""]
+            path = path.split(b"?", 1)[0]
+
+            if method not in (b"GET", b"HEAD"):
+                self._respond(writer, 405, b"Method Not Allowed\n")
+            elif path != b"/metrics":
+                self._respond(writer, 404, b"Not Found\n")
+            else:
+                openmetrics = b"application/openmetrics-text" in headers.lower()
+                body = self.render(openmetrics)
+                content_type = OPENMETRICS_TYPE if openmetrics else PROMETHEUS_TYPE
+                self._respond(writer, 200, body, content_type, include_body=method == b"GET")
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    def _respond(
+            writer: asyncio.StreamWriter,
+            status: int,
+            body: bytes,
+            content_type: str = "text/plain; charset=utf-8",
+            include_body: bool = True
+    ) -> None:
+        reason = {200: "OK", 404: "Not Found", 405: "Method Not Allowed"}[status]
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n".encode()
+        )
+        if include_body:
+            writer.write(body)
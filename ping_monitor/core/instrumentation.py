@@ -0,0 +1,154 @@
+import asyncio
+import math
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import ClassVar, Dict, List, Optional, Tuple
+
+
+def _bounds() -> Tuple[float, ...]:
+    # 10us to ~168s in sqrt(2) steps: 49 buckets, <=41% relative bucket width.
+    return tuple(1e-5 * 2 ** (i / 2) for i in range(49))
+
+
+@dataclass
+class Histogram:
+    """Fixed-bucket latency histogram; observe() is a bisect and two adds."""
+
+    BOUNDS: ClassVar[Tuple[float, ...]] = _bounds()
+
+    count: int = 0
+    total: float = 0.0
+    maximum: float = 0.0
+    _buckets: List[int] = field(
+        default_factory=lambda: [0] * (len(Histogram.BOUNDS) + 1),
+        init=False
+    )
+
+    def observe(self, seconds: float) -> None:
+        self._buckets[bisect_left(self.BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket in enumerate(self._buckets):
+            seen += bucket
+            if seen >= rank and bucket:
+                if index == len(self.BOUNDS):
+                    return self.maximum
+                return min(self.BOUNDS[index], self.maximum)
+        return self.maximum
+
+    def buckets(self) -> List[Tuple[float, int]]:
+        """Cumulative (upper bound, count) pairs, ending with +inf."""
+        result = []
+        seen = 0
+        for bound, bucket in zip(self.BOUNDS + (math.inf,), self._buckets):
+            seen += bucket
+            result.append((bound, seen))
+        return result
+
+    def snapshot(self) -> dict:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": self.total / self.count,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "max": self.maximum,
+        }
+
+
+@dataclass
+class Instrumentation:
+    """Named histograms of the monitor's own timings, in seconds.
+
+    Recorded timings:
+
+    * ``executor.spawn``: creating the ping_adv child process
+    * ``executor.wall``: a whole PingExecutor probe
+    * ``executor.parse``: parsing ping_adv output
+    * ``monitor.probe``: a probe as awaited by the monitor, including pool queueing
+    * ``monitor.schedule_delay``: how late a probe started against its due time
+    * ``loop.lag``: event loop stalls seen by LoopLagMonitor
+
+    and event counters:
+
+    * ``scheduler.skipped``: ticks dropped because a target's previous probe
+      was still running or the scheduler fell a whole period behind
+    * ``scheduler.late``: probes started more than the late tolerance after
+      their tick
+    * ``supervisor.restarts``: shard worker processes that exited unexpectedly
+    * ``agent.dropped``: sample batches discarded while the aggregator was
+      unreachable
+    """
+
+    _histograms: Dict[str, Histogram] = field(default_factory=dict, init=False)
+    _counters: Dict[str, int] = field(default_factory=dict, init=False)
+
+    def histogram(self, name: str) -> Histogram:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = Histogram()
+        return histogram
+
+    def observe(self, name: str, seconds: float) -> None:
+        self.histogram(name).observe(seconds)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        self._counters[name] = self._counters.get(name, 0) + amount
+
+    def histograms(self) -> Dict[str, Histogram]:
+        return dict(self._histograms)
+
+    def counters(self) -> Dict[str, int]:
+        return dict(self._counters)
+
+    def snapshot(self) -> Dict[str, dict]:
+        snapshot = {name: h.snapshot() for name, h in self._histograms.items()}
+        snapshot.update((name, {"total": value}) for name, value in self._counters.items())
+        return dict(sorted(snapshot.items()))
+
+    def reset(self) -> None:
+        self._histograms.clear()
+        self._counters.clear()
+
+
+instrumentation = Instrumentation()
+
+
+@dataclass
+class LoopLagMonitor:
+    """Samples event loop lag: how late a periodic sleep wakes up."""
+
+    interval: float = 0.5
+    registry: Instrumentation = field(default_factory=lambda: instrumentation)
+    _task: Optional[asyncio.Task] = field(default=None, init=False)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        histogram = self.registry.histogram("loop.lag")
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            histogram.observe(max(0.0, time.perf_counter() - expected))
@@ -1,12 +1,32 @@
 import asyncio
+import heapq
 import logging
-from dataclasses import dataclass, field
+import time
+from dataclasses import dataclass, field, fields, replace
 from datetime import datetime, timedelta
-from typing import List, Optional, Final
+from operator import attrgetter
+from types import MappingProxyType
+from pathlib import Path
+from typing import Any, Callable, ClassVar, Dict, Iterable, List, Mapping, Optional, Final, Tuple
 
-from ping_monitor.core.executor import PingExecutor
+from ping_monitor.core.adaptive import AdaptiveController
+from ping_monitor.core.engine import ProbeEngine, create_engine
+from ping_monitor.core.events import (
+    ANOMALY, SAMPLE, STATE, TOPICS, EventBus, StateChange, Subscription
+)
+from ping_monitor.core.exporter import MetricsExporter
+from ping_monitor.core.instrumentation import Instrumentation, LoopLagMonitor, instrumentation
+from ping_monitor.core.reload import ConfigWatcher
+from ping_monitor.core.scheduler import ProbeScheduler
+from ping_monitor.core.store import MetricStore
+from ping_monitor.models.columnar import ColumnarHistory, StringTable
+from ping_monitor.models.detection import DetectionStage
+from ping_monitor.models.history import HistoryView, MetricHistory
 from ping_monitor.models.metrics import PingMetrics
-from ping_monitor.utils.config import MonitorConfig
+from ping_monitor.models.rollup import MultiResolutionRollup, Rollup, combine
+from ping_monitor.models.sketch import LatencySketch, SketchWindow
+from ping_monitor.models.stats import RunningStats, TargetCounters, summarize
+from ping_monitor.utils.config import MonitorConfig, ProbeTarget
 from ping_monitor.utils.logging import LogConfig, setup_logging
 
 logger = logging.getLogger(__name__)
@@ -15,22 +35,53 @@ logger = logging.getLogger(__name__)
 @dataclass
 class ConnectionMonitor:
     _running: bool = field(default=False, init=False)
-    _history: List[PingMetrics] = field(default_factory=list, init=False)
+    _history: Dict[str, MetricHistory] = field(default_factory=dict, init=False)
     _last_metrics: Optional[PingMetrics] = field(default=None, init=False)
+    _latest: Dict[str, PingMetrics] = field(default_factory=dict, init=False)
+    _scheduler: Optional[ProbeScheduler] = field(default=None, init=False)
+    _adaptive: Optional[AdaptiveController] = field(default=None, init=False)
+    _detection: Optional[DetectionStage] = field(default=None, init=False)
+    _events: EventBus = field(default_factory=EventBus, init=False)
+    _strings: StringTable = field(default_factory=StringTable, init=False)
+    _stats: Dict[str, RunningStats] = field(default_factory=dict, init=False)
+    _counters: Dict[str, TargetCounters] = field(default_factory=dict, init=False)
+    _rollups: Dict[str, MultiResolutionRollup] = field(default_factory=dict, init=False)
+    _sketches: Dict[str, SketchWindow] = field(default_factory=dict, init=False)
+    _store: Optional[MetricStore] = field(default=None, init=False)
+    _loop_lag: Optional[LoopLagMonitor] = field(default=None, init=False)
+    _exporter: Optional[MetricsExporter] = field(default=None, init=False)
+    _watcher: Optional[ConfigWatcher] = field(default=None, init=False)
     _test_mode: bool = field(default=False, init=False)
     config: MonitorConfig
-    executor: PingExecutor = field(init=False)
+    executor: ProbeEngine = field(init=False)
     log_config: LogConfig = field(default=LogConfig())
+    config_path: Optional[Path] = None
+    config_overrides: Dict[str, Any] = field(default_factory=dict)
+    log_overrides: Dict[str, Any] = field(default_factory=dict)
+    restore: bool = True
 
     CHECK_INTERVAL: Final[int] = 60
-    HISTORY_HOURS: Final[int] = 1
+    LATENCY_CHANGE: Final[float] = 5.0
+    JITTER_CHANGE: Final[float] = 2.0
+    RESTORE_BATCH: Final[int] = 4096
+    # Everything else is wired into components built at startup.
+    RELOADABLE: ClassVar[Tuple[str, ...]] = (
+        "target", "targets", "packet_count", "interval", "log_level"
+    )
 
     def __post_init__(self) -> None:
         setup_logging(self.log_config)
-        self.executor = PingExecutor(self.config.ping_adv_path)
+        self.executor = create_engine(self.config)
+        if self.config.detectors:
+            self._detection = DetectionStage(self.config.detectors)
+            self._detection.subscribe(lambda anomaly: self._events.publish(ANOMALY, anomaly))
+        if self.config.store_path is not None:
+            self._store = MetricStore(self.config.store_path)
+            if self.restore:
+                self._restore()
         logger.info(
-            "Initialised monitor with target: %s, interval: %d, packet_count: %d",
-            self.config.target,
+            "Initialised monitor with targets: %s, interval: %d, packet_count: %d",
+            ", ".join(self.targets),
             self.config.interval,
             self.config.packet_count
         )
@@ -44,6 +95,20 @@ class ConnectionMonitor:
         logger.info("Starting connection monitoring")
 
         try:
+            if self.config.metrics_port is not None and self._exporter is None:
+                self._exporter = MetricsExporter(
+                    self, self.config.metrics_host, self.config.metrics_port
+                )
+                await self._exporter.start()
+            if self.config_path is not None and self.config.reload_interval:
+                self._watcher = ConfigWatcher(
+                    self.config_path,
+                    self._apply_config,
+                    self.config.reload_interval,
+                    self.config_overrides,
+                    self.log_overrides
+                )
+                self._watcher.start()
             await self._monitor_loop()
         except Exception as e:
             logger.exception("Monitoring failed: %s", str(e))
@@ -54,65 +119,256 @@ class ConnectionMonitor:
         if self._running:
             self._running = False
             logger.info("Stopping connection monitoring")
+            if self._scheduler is not None:
+                self._scheduler.stop()
+            if self._watcher is not None:
+                await self._watcher.stop()
+                self._watcher = None
+            await self.executor.close()
+            if self._exporter is not None:
+                await self._exporter.stop()
+                self._exporter = None
+            if self._store is not None:
+                await asyncio.get_running_loop().run_in_executor(None, self._store.flush)
+            self._events.close()
 
     async def _monitor_loop(self) -> None:
-        while self._running:
-            try:
-                metrics = await self._execute_ping()
-                await self._process_metrics(metrics)
-
-                if self._test_mode:
-                    break
-
-                await asyncio.sleep(self.CHECK_INTERVAL)
-            except Exception as e:
-                logger.error("Error in monitoring loop: %s", str(e))
-                if not self._test_mode:
-                    raise
-
-    async def _execute_ping(self) -> PingMetrics:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            self.executor.execute,
-            self.config.target,
+        self._scheduler = ProbeScheduler(
+            self._probe,
+            max_concurrency=self.config.max_concurrency,
+            start_jitter=self.config.start_jitter
+        )
+        # Test mode probes every target once, immediately.
+        now = time.monotonic() if self._test_mode else None
+        periods = {target: self._period(target) for target in self.config.probe_targets}
+        for target, period in periods.items():
+            self._scheduler.add(target, period, now)
+
+        if self.config.adaptive:
+            self._adaptive = AdaptiveController(
+                min_interval=self.config.min_check_interval,
+                max_interval=self.config.max_check_interval,
+                budget=self._budget()
+            )
+            for target, period in periods.items():
+                self._adaptive.add(target.host, period)
+
+        if self.config.loop_lag_interval:
+            self._loop_lag = LoopLagMonitor(self.config.loop_lag_interval)
+            self._loop_lag.start()
+        try:
+            await self._scheduler.run(once=self._test_mode)
+        finally:
+            if self._loop_lag is not None:
+                await self._loop_lag.stop()
+
+    def _period(self, target: ProbeTarget) -> float:
+        return target.check_interval or self.CHECK_INTERVAL
+
+    def _budget(self) -> float:
+        # Without an explicit budget, adapting never exceeds the fixed schedule's load.
+        if self.config.probe_budget is not None:
+            return self.config.probe_budget
+        return sum(1 / self._period(target) for target in self.config.probe_targets)
+
+    def reload(
+            self,
+            config: MonitorConfig,
+            log_config: Optional[LogConfig] = None
+    ) -> Dict[str, Tuple[str, ...]]:
+        """Apply a new config to the running monitor without restarting it.
+
+        Only the difference in targets is acted on: new hosts are scheduled,
+        dropped hosts are unscheduled and their in-memory state released, and
+        hosts whose check interval changed move to the new period. Untouched
+        targets keep their schedule, history and detector state. Fields
+        outside RELOADABLE keep their current value until restart.
+        """
+        frozen = {
+            f.name: getattr(self.config, f.name)
+            for f in fields(MonitorConfig)
+            if f.name not in self.RELOADABLE
+            and getattr(config, f.name) != getattr(self.config, f.name)
+        }
+        if frozen:
+            logger.warning("Changes to %s take effect after a restart", ", ".join(frozen))
+            config = replace(config, **frozen)
+
+        old = {t.host: t for t in self.config.probe_targets}
+        new = {t.host: t for t in config.probe_targets}
+        added = tuple(host for host in new if host not in old)
+        removed = tuple(host for host in old if host not in new)
+        changed = tuple(host for host in new if host in old and new[host] != old[host])
+        self.config = config
+
+        for host in removed:
+            self._forget(host)
+        for host in added + changed:
+            target = new[host]
+            if self._scheduler is not None:
+                self._scheduler.add(target, self._period(target))
+            if self._adaptive is not None:
+                self._adaptive.add(host, self._period(target))
+        if self._adaptive is not None:
+            self._adaptive.budget = self._budget()
+
+        if log_config is not None and log_config.level != self.log_config.level:
+            # Handlers stay as set up; only the level is applied live.
+            logging.getLogger().setLevel(log_config.level.upper())
+            self.log_config = replace(self.log_config, level=log_config.level)
+
+        diff = {"added": added, "removed": removed, "changed": changed}
+        if added or removed or changed:
+            logger.info(
+                "Targets reloaded: %s",
+                ", ".join(f"{len(hosts)} {name}" for name, hosts in diff.items())
+            )
+        return diff
+
+    async def _apply_config(self, config: MonitorConfig, log_config: LogConfig) -> None:
+        self.reload(config, log_config)
+
+    def _forget(self, host: str) -> None:
+        if self._scheduler is not None:
+            self._scheduler.remove(host)
+        if self._adaptive is not None:
+            self._adaptive.remove(host)
+        if self._detection is not None:
+            self._detection.forget(host)
+        for state in (
+                self._history, self._stats, self._counters, self._rollups, self._sketches,
+                self._latest
+        ):
+            state.pop(host, None)
+
+    async def _probe(self, target: ProbeTarget) -> None:
+        started = time.perf_counter()
+        metrics = await self._execute_ping(target.host)
+        instrumentation.observe("monitor.probe", time.perf_counter() - started)
+        await self._process_metrics(metrics)
+
+    async def _execute_ping(self, target: str) -> PingMetrics:
+        return await self.executor.execute_async(
+            target,
             self.config.packet_count,
             self.config.interval
         )
 
     async def _process_metrics(self, metrics: PingMetrics) -> None:
-        self._history.append(metrics)
-        self._trim_history()
-        self._last_metrics = metrics
+        previous = self._latest.get(metrics.target)
+        self._record(metrics)
+
+        self._events.publish(SAMPLE, metrics)
+        if previous is None or previous.success != metrics.success:
+            self._events.publish(STATE, StateChange(
+                metrics.target,
+                metrics.timestamp,
+                metrics.success,
+                previous.success if previous is not None else None
+            ))
+
+        anomalies = None
+        if self._detection is not None:
+            anomalies = self._detection.evaluate(metrics)
+            changed = bool(anomalies)
+        else:
+            changed = self._significant_change(previous, metrics)
+        self._adapt(metrics.target, changed or not metrics.success)
+        for anomaly in anomalies or ():
+            logger.warning("%s", anomaly)
+
+        if self._store is not None and self._store.append(metrics):
+            await asyncio.get_running_loop().run_in_executor(None, self._store.flush)
 
         if not metrics.success:
-            logger.warning("[Connection unavailable]")
+            logger.warning("[%s] Connection unavailable", metrics.target)
             return
 
         logger.info(
-            "[Connection average latency %.2f, Jitter %.2f]",
+            "[%s] Connection average latency %.2f, Jitter %.2f",
+            metrics.target,
             metrics.average_latency,
             metrics.jitter
         )
 
-        if (self._history and len(self._history) > 1 and
-                (abs(metrics.average_latency - self._history[-2].average_latency) > 5 or
-                 abs(metrics.jitter - self._history[-2].jitter) > 2)):
+        if changed and anomalies is None:
             logger.info(
-                "Significant change detected - Previous: %.2f/%.2f, Current: %.2f/%.2f",
-                self._history[-2].average_latency,
-                self._history[-2].jitter,
+                "[%s] Significant change detected - Previous: %.2f/%.2f, Current: %.2f/%.2f",
+                metrics.target,
+                previous.average_latency,
+                previous.jitter,
                 metrics.average_latency,
                 metrics.jitter
             )
 
-    def _trim_history(self) -> None:
-        if not self._history:
+    def _significant_change(self, previous: Optional[PingMetrics], metrics: PingMetrics) -> bool:
+        return (previous is not None and
+                (abs(metrics.average_latency - previous.average_latency) > self.LATENCY_CHANGE or
+                 abs(metrics.jitter - previous.jitter) > self.JITTER_CHANGE))
+
+    def _adapt(self, target: str, unstable: bool) -> None:
+        if self._adaptive is None or self._scheduler is None:
             return
+        period = self._adaptive.observe(target, unstable)
+        if period is not None:
+            self._scheduler.reschedule(target, period)
+            logger.debug("[%s] Probe interval now %.1fs", target, period)
+
+    def _record(self, metrics: PingMetrics) -> None:
+        buffer = self._buffer(metrics.target)
+        self._stats[metrics.target].add(metrics)
+        self._counters[metrics.target].add(metrics)
+        buffer.append(metrics)
+        self._rollups[metrics.target].add(metrics)
+        if metrics.success:
+            self._sketches[metrics.target].add(metrics.timestamp, metrics.average_latency)
+        self._last_metrics = metrics
+        self._latest[metrics.target] = metrics
+
+    def _restore(self) -> None:
+        since = datetime.now() - timedelta(seconds=self.config.raw_retention)
+        # Targets dropped from the config would never be trimmed again.
+        targets = set(self.targets)
+        restored = 0
+        batch = []
+        for metrics in self._store.scan(since=since):
+            if metrics.target not in targets:
+                continue
+            self._record(metrics)
+            restored += 1
+            if self._detection is not None:
+                batch.append(metrics)
+                if len(batch) == self.RESTORE_BATCH:
+                    self._detection.evaluate_many(batch, emit=False)
+                    batch.clear()
+        if batch:
+            self._detection.evaluate_many(batch, emit=False)
+        if restored:
+            logger.info("Restored %d samples from %s", restored, self.config.store_path)
 
-        cutoff = datetime.now() - timedelta(hours=self.HISTORY_HOURS)
-        self._history = [m for m in self._history if m.timestamp > cutoff]
-        logger.debug("History trimmed to %d entries", len(self._history))
+    def _buffer(self, target: str) -> MetricHistory:
+        buffer = self._history.get(target)
+        if buffer is None:
+            stats = self._stats[target] = RunningStats()
+            self._counters[target] = TargetCounters()
+            window = timedelta(seconds=self.config.raw_retention)
+            self._rollups[target] = MultiResolutionRollup()
+            self._sketches[target] = SketchWindow(window=window)
+            if self.config.history_backend == "columnar":
+                buffer = ColumnarHistory(
+                    capacity=self.config.history_capacity,
+                    window=window,
+                    on_evict=stats.remove,
+                    strings=self._strings
+                )
+            else:
+                buffer = MetricHistory(
+                    capacity=self.config.history_capacity,
+                    window=window,
+                    on_evict=stats.remove
+                )
+            self._history[target] = buffer
+        return buffer
 
     async def __aenter__(self):
         await self.start()
@@ -127,26 +383,118 @@ class ConnectionMonitor:
 
     @property
     def history(self) -> List[PingMetrics]:
-        return self._history.copy()
+        """Samples of every target, oldest first."""
+        return list(heapq.merge(*self._history.values(), key=attrgetter("timestamp")))
+
+    @property
+    def history_by_target(self) -> HistoryView:
+        """Live view of every target's samples, grouped by target."""
+        return HistoryView(tuple(self._history.values()))
+
+    def history_for(self, target: str) -> HistoryView:
+        buffer = self._history.get(target)
+        return buffer.view() if buffer is not None else HistoryView(())
 
     @property
     def last_metrics(self) -> Optional[PingMetrics]:
         return self._last_metrics
 
-    def get_stats(self) -> dict:
-        if not self._history:
+    @property
+    def targets(self) -> Tuple[str, ...]:
+        return tuple(t.host for t in self.config.probe_targets)
+
+    @property
+    def instrumentation(self) -> Instrumentation:
+        return instrumentation
+
+    @property
+    def counters(self) -> Mapping[str, TargetCounters]:
+        return MappingProxyType(self._counters)
+
+    def subscribe(
+            self,
+            topics: Iterable[str] = TOPICS,
+            maxsize: int = 1000,
+            policy: str = "drop_oldest"
+    ) -> Subscription:
+        """Queue ``sample``, ``state`` and/or ``anomaly`` events for an async consumer."""
+        return self._events.subscribe(topics, maxsize, policy)
+
+    def add_listener(
+            self,
+            callback: Callable[[Any], None],
+            topics: Iterable[str] = TOPICS
+    ) -> Callable[[], None]:
+        return self._events.add_listener(callback, topics)
+
+    @property
+    def detection(self) -> Optional[DetectionStage]:
+        return self._detection
+
+    @property
+    def exporter(self) -> Optional[MetricsExporter]:
+        return self._exporter
+
+    def latest(self, target: str) -> Optional[PingMetrics]:
+        return self._latest.get(target)
+
+    def running_stats(self, target: str) -> Optional[RunningStats]:
+        return self._stats.get(target)
+
+    def get_stats(self, target: Optional[str] = None, duration: Optional[timedelta] = None) -> dict:
+        if duration is None:
+            if target is None:
+                return summarize(self._stats.values())
+            stats = self._stats.get(target)
+            return stats.as_dict() if stats is not None else {}
+
+        index = MultiResolutionRollup.resolution_for(duration)
+        if index is None:
+            return self._raw_stats(target, datetime.now() - duration)
+        return self._window(target, duration, index).as_dict()
+
+    def latency_sketch(
+            self,
+            target: Optional[str] = None,
+            duration: Optional[timedelta] = None
+    ) -> LatencySketch:
+        duration = duration or timedelta(seconds=self.config.raw_retention)
+        if duration.total_seconds() > self.config.raw_retention:
+            return self._window(target, duration, MultiResolutionRollup.SKETCH_SERIES).sketch
+
+        since = datetime.now() - duration
+        if target is None:
+            windows = list(self._sketches.values())
+        else:
+            windows = [self._sketches[target]] if target in self._sketches else []
+        return LatencySketch.merged(window.sketch(since) for window in windows)
+
+    def get_percentiles(
+            self,
+            target: Optional[str] = None,
+            quantiles: Iterable[float] = (0.5, 0.95, 0.99),
+            duration: Optional[timedelta] = None
+    ) -> dict:
+        sketch = self.latency_sketch(target, duration)
+        if not sketch.count:
             return {}
+        return {f"p{q * 100:g}": value for q, value in sketch.quantiles(quantiles).items()}
 
-        successful = [m for m in self._history if m.success]
-        if not successful:
-            return {"error": "No successful measurements"}
-
-        latencies = [m.average_latency for m in successful]
-        return {
-            "min_latency": min(latencies),
-            "max_latency": max(latencies),
-            "avg_latency": sum(latencies) / len(latencies),
-            "measurements": len(self._history),
-            "successful": len(successful),
-            "success_rate": len(successful) / len(self._history) * 100
-        }
+    def _window(self, target: Optional[str], duration: timedelta, index: int) -> Rollup:
+        since = datetime.now() - duration
+        if target is None:
+            rollups = list(self._rollups.values())
+        else:
+            rollups = [self._rollups[target]] if target in self._rollups else []
+        return combine(
+            (bucket for r in rollups for bucket in r.series[index].buckets(since)),
+            since
+        )
+
+    def _raw_stats(self, target: Optional[str], since: datetime) -> dict:
+        stats = RunningStats()
+        history = self.history_by_target if target is None else self.history_for(target)
+        for metrics in history:
+            if metrics.timestamp > since:
+                stats.add(metrics)
+        return stats.as_dict()
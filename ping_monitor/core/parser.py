@@ -0,0 +1,72 @@
+import re
+from array import array
+from typing import Final, NamedTuple, Optional, Tuple, Union
+
+RESULT_PATTERN: Final = re.compile(
+    rb'\[(.*?)\] Test Result: '
+    rb'Average Latency (\d+(?:\.\d+)?)ms, '
+    rb'Jitter (\d+(?:\.\d+)?)(ms|ns) '
+    rb'\((\d+) results\)'
+)
+PACKET_PATTERN: Final = re.compile(
+    rb'seq=(\d+)[^\n]*?time[=<](\d+(?:\.\d+)?) ?(ms|us|ns)'
+)
+RESULT_MARKER: Final = b"Test Result:"
+NS_TO_MS: Final = 1_000_000.0
+SCALE_TO_MS: Final = {b"ms": 1.0, b"us": 1_000.0, b"ns": NS_TO_MS}
+
+Output = Union[bytes, str]
+
+
+class ParsedResult(NamedTuple):
+    target: str
+    average_latency: float
+    jitter: float
+    success_count: int
+
+
+def parse_result(output: Output) -> Optional[ParsedResult]:
+    """Parse the ``Test Result:`` summary line of ping_adv output.
+
+    Only the last line carrying the result marker is matched, so the cost
+    does not grow with the number of per-packet lines before it.
+    """
+    if isinstance(output, str):
+        output = output.encode(errors="replace")
+
+    marker = output.rfind(RESULT_MARKER)
+    if marker < 0:
+        return None
+    start = output.rfind(b"\n", 0, marker) + 1
+    end = output.find(b"\n", marker)
+    match = RESULT_PATTERN.search(output, start, end if end >= 0 else len(output))
+    if match is None:
+        return None
+
+    target, latency, jitter, unit, count = match.groups()
+    return ParsedResult(
+        target.decode(errors="replace"),
+        float(latency),
+        float(jitter) / SCALE_TO_MS[unit],
+        int(count)
+    )
+
+
+def parse_packets(output: Output) -> array:
+    """Per-packet RTTs in milliseconds, ordered by sequence number.
+
+    Lost packets (sequence numbers with no reply line) are not present.
+    """
+    return parse_packet_samples(output)[1]
+
+
+def parse_packet_samples(output: Output) -> Tuple[array, array]:
+    """Sequence numbers and RTTs (ms) of the per-packet reply lines, by sequence."""
+    if isinstance(output, str):
+        output = output.encode(errors="replace")
+
+    samples = sorted(
+        (int(seq), float(rtt) / SCALE_TO_MS[unit])
+        for seq, rtt, unit in PACKET_PATTERN.findall(output)
+    )
+    return array("l", (seq for seq, _ in samples)), array("d", (rtt for _, rtt in samples))
@@ -0,0 +1,147 @@
+import asyncio
+import itertools
+import json
+import logging
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Worker:
+    number: int
+    process: asyncio.subprocess.Process
+    pending: Dict[int, asyncio.Future] = field(default_factory=dict)
+    reader: Optional[asyncio.Task] = None
+
+
+@dataclass
+class WorkerPool:
+    """Fixed pool of long-lived workers multiplexed over stdin/stdout.
+
+    Each worker runs any number of requests at once and answers them by
+    id, so the pool adds no concurrency limit of its own; callers bound
+    in-flight probes (the monitor's ``max_concurrency``). Requests go to
+    the worker with the fewest in flight. A worker that exits or sends an
+    invalid response is replaced, and the requests it was handling fail
+    instead of being retried.
+    """
+
+    command: List[str]
+    size: int = 4
+
+    _workers: List[Optional[_Worker]] = field(default_factory=list, init=False)
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False)
+    _ids: itertools.count = field(default_factory=itertools.count, init=False)
+    _restarts: int = field(default=0, init=False)
+
+    @classmethod
+    def for_ping_adv(cls, ping_adv_path: Path, size: int = 4) -> "WorkerPool":
+        return cls([sys.executable, "-m", "ping_monitor.core.worker", str(ping_adv_path)], size)
+
+    @property
+    def busy(self) -> int:
+        """Requests in flight across all workers."""
+        return sum(len(w.pending) for w in self._workers if w is not None)
+
+    @property
+    def restarts(self) -> int:
+        return self._restarts
+
+    async def submit(
+            self,
+            target: str,
+            packet_count: int,
+            interval: float,
+            timeout: float
+    ) -> Tuple[int, str, str]:
+        worker = await self._pick()
+        request = {
+            "id": next(self._ids),
+            "target": target,
+            "packet_count": packet_count,
+            "interval": interval,
+            "timeout": timeout
+        }
+        future = asyncio.get_running_loop().create_future()
+        worker.pending[request["id"]] = future
+        try:
+            worker.process.stdin.write(json.dumps(request).encode() + b"\n")
+            await worker.process.stdin.drain()
+            # The worker enforces the timeout itself; this only covers a hung worker.
+            response = await asyncio.wait_for(future, timeout + 1)
+        except asyncio.TimeoutError:
+            return -1, "", "Command timed out"
+        except (BrokenPipeError, ConnectionResetError):
+            return -1, "", "Worker exited unexpectedly"
+        finally:
+            worker.pending.pop(request["id"], None)
+        return response["returncode"], response["stdout"], response["stderr"]
+
+    async def close(self) -> None:
+        workers = [w for w in self._workers if w is not None]
+        self._workers = []
+        for worker in workers:
+            worker.reader.cancel()
+            self._fail(worker, "Worker pool closed")
+            await self._kill(worker.process)
+        await asyncio.gather(*(w.reader for w in workers), return_exceptions=True)
+
+    async def _pick(self) -> _Worker:
+        async with self._lock:
+            if not self._workers:
+                self._workers = [None] * self.size
+            for number, worker in enumerate(self._workers):
+                if worker is None:
+                    self._workers[number] = await self._spawn(number)
+            return min(self._workers, key=lambda w: len(w.pending))
+
+    async def _spawn(self, number: int) -> _Worker:
+        process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        logger.debug("Worker %d started with pid %d", number, process.pid)
+        worker = _Worker(number, process)
+        worker.reader = asyncio.create_task(self._read(worker))
+        return worker
+
+    async def _read(self, worker: _Worker) -> None:
+        error = "Worker exited unexpectedly"
+        try:
+            while line := await worker.process.stdout.readline():
+                response = json.loads(line)
+                future = worker.pending.get(response["id"])
+                # A request that already timed out no longer has a future.
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except (ValueError, KeyError, TypeError) as e:
+            error = f"Worker sent an invalid response: {e}"
+
+        self._restarts += 1
+        logger.warning("Worker %d failed, restarting: %s", worker.number, error)
+        if worker.number < len(self._workers) and self._workers[worker.number] is worker:
+            self._workers[worker.number] = None
+        self._fail(worker, error)
+        await self._kill(worker.process)
+
+    @staticmethod
+    def _fail(worker: _Worker, error: str) -> None:
+        for future in worker.pending.values():
+            if not future.done():
+                future.set_result({"returncode": -1, "stdout": "", "stderr": error})
+
+    @staticmethod
+    async def _kill(process: asyncio.subprocess.Process) -> None:
+        process.stdin.close()
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from ping_monitor.models.exceptions import ConfigurationError
+from ping_monitor.utils.config import MonitorConfig, load_log_config
+from ping_monitor.utils.logging import LogConfig
+
+logger = logging.getLogger(__name__)
+
+Signature = Optional[Tuple[int, int, int]]
+
+
+@dataclass
+class ConfigWatcher:
+    """Polls a TOML config file and hands every valid new version to ``on_change``.
+
+    Polling the file's inode, size and mtime needs no platform-specific
+    notification API and also catches configs replaced by an atomic rename.
+    A version that fails to parse or validate is logged and skipped; the
+    running config stays in place until the file changes again.
+    ``overrides`` and ``log_overrides`` (typically command-line options)
+    are reapplied over every version, as they were at startup.
+    """
+
+    path: Path
+    on_change: Callable[[MonitorConfig, LogConfig], Awaitable[None]]
+    interval: float = 2.0
+    overrides: Dict[str, Any] = field(default_factory=dict)
+    log_overrides: Dict[str, Any] = field(default_factory=dict)
+
+    _signature: Signature = field(default=None, init=False)
+    _task: Optional[asyncio.Task] = field(default=None, init=False)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._signature = self._stat()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def check(self) -> bool:
+        """Reload if the file changed; True when a new config was applied."""
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+        self._signature = signature
+
+        try:
+            config = MonitorConfig.load(self.path, **self.overrides)
+            log_config = load_log_config(self.path, **self.log_overrides)
+        except (ConfigurationError, FileNotFoundError, TypeError, ValueError) as e:
+            logger.error("Ignoring invalid config %s: %s", self.path, e)
+            return False
+
+        logger.info("Reloading config from %s", self.path)
+        await self.on_change(config, log_config)
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception:
+                logger.exception("Config reload failed")
+
+    def _stat(self) -> Signature:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
@@ -0,0 +1,209 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from ping_monitor.core.instrumentation import Instrumentation, instrumentation
+from ping_monitor.utils.config import ProbeTarget
+
+logger = logging.getLogger(__name__)
+
+Probe = Callable[[ProbeTarget], Awaitable[None]]
+
+
+@dataclass
+class _Entry:
+    target: ProbeTarget
+    period: float
+    phase: float
+    deadline: float = 0.0
+    running: bool = False
+    removed: bool = False
+
+
+@dataclass
+class ProbeScheduler:
+    """Starts probes at fixed deadlines aligned to the wall clock.
+
+    Each target ticks at ``k * period + phase`` seconds since the epoch.
+    Deadlines advance by whole periods rather than sleeping after each
+    probe, so probe duration and processing never shift the schedule.
+    The phase is derived from the host name, spreading targets over the
+    period while keeping a target's ticks identical on every host running
+    the monitor; ``start_jitter`` scales it, 0 aligns everything on period
+    boundaries.
+
+    Deadlines are kept on the event loop's monotonic clock in one heap
+    served by a single dispatcher task. A tick is skipped while the
+    target's previous probe is still running, and ticks the dispatcher
+    slept through are dropped rather than fired in a burst; both count
+    towards ``scheduler.skipped``.
+
+    ``clock``, ``wall_clock`` and ``sleep`` default to the real monotonic
+    clock, ``time.time`` and ``asyncio.sleep``; tests substitute a virtual
+    clock to check deadlines exactly.
+    """
+
+    probe: Probe
+    max_concurrency: int = 64
+    start_jitter: float = 1.0
+    late_tolerance: float = 1.0
+    registry: Instrumentation = field(default_factory=lambda: instrumentation)
+    clock: Callable[[], float] = time.monotonic
+    wall_clock: Callable[[], float] = time.time
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+
+    _heap: List[Tuple[float, int, _Entry]] = field(default_factory=list, init=False)
+    _entries: Dict[str, _Entry] = field(default_factory=dict, init=False)
+    _order: itertools.count = field(default_factory=itertools.count, init=False)
+    _tasks: Set[asyncio.Task] = field(default_factory=set, init=False)
+    _wake: Optional[asyncio.Event] = field(default=None, init=False)
+    _semaphore: Optional[asyncio.Semaphore] = field(default=None, init=False)
+    _running: bool = field(default=False, init=False)
+
+    def add(self, target: ProbeTarget, period: float, now: Optional[float] = None) -> None:
+        """Schedule ``target`` from its next aligned tick, or at ``now`` if given."""
+        self.remove(target.host)
+        entry = _Entry(target, period, self._phase(target.host, period))
+        entry.deadline = now if now is not None else self._next_tick(entry, self._now())
+        self._entries[target.host] = entry
+        self._push(entry)
+
+    def remove(self, host: str) -> None:
+        entry = self._entries.pop(host, None)
+        if entry is not None:
+            entry.removed = True
+
+    def reschedule(self, host: str, period: float) -> None:
+        """Change a target's period, moving it to the next tick of the new grid."""
+        entry = self._entries.get(host)
+        if entry is None or entry.period == period:
+            return
+        entry.period = period
+        entry.phase = self._phase(host, period)
+        entry.deadline = self._next_tick(entry, self._now())
+        self._push(entry)
+
+    def period(self, host: str) -> Optional[float]:
+        entry = self._entries.get(host)
+        return entry.period if entry is not None else None
+
+    @property
+    def targets(self) -> Tuple[ProbeTarget, ...]:
+        return tuple(entry.target for entry in self._entries.values())
+
+    async def run(self, once: bool = False) -> None:
+        """Dispatch probes until stop(); with ``once`` fire each pending tick a single time."""
+        self._wake = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._running = True
+        try:
+            while self._running:
+                entry = self._next_due()
+                if entry is None:
+                    if once:
+                        break
+                    await self._wait(None)
+                    continue
+
+                delay = entry.deadline - self._now()
+                if delay > 0:
+                    await self._wait(delay)
+                    continue
+
+                heapq.heappop(self._heap)
+                self._dispatch(entry)
+                if not once:
+                    self._advance(entry)
+                    self._push(entry)
+                else:
+                    self._entries.pop(entry.target.host, None)
+
+            if once and self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+        finally:
+            self._running = False
+            for task in self._tasks:
+                task.cancel()
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stop(self) -> None:
+        self._running = False
+        if self._wake is not None:
+            self._wake.set()
+
+    def _next_due(self) -> Optional[_Entry]:
+        # Removed and rescheduled entries leave stale heap items behind.
+        heap = self._heap
+        while heap and (heap[0][2].removed or heap[0][0] != heap[0][2].deadline):
+            heapq.heappop(heap)
+        return heap[0][2] if heap else None
+
+    async def _wait(self, timeout: Optional[float]) -> None:
+        self._wake.clear()
+        if timeout is None:
+            await self._wake.wait()
+            return
+        waiters = {
+            asyncio.ensure_future(self._wake.wait()),
+            asyncio.ensure_future(self.sleep(timeout))
+        }
+        try:
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    def _dispatch(self, entry: _Entry) -> None:
+        if entry.running:
+            self.registry.increment("scheduler.skipped")
+            return
+        entry.running = True
+        task = asyncio.create_task(self._fire(entry, entry.deadline))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fire(self, entry: _Entry, deadline: float) -> None:
+        try:
+            async with self._semaphore:
+                lateness = max(0.0, self._now() - deadline)
+                self.registry.observe("monitor.schedule_delay", lateness)
+                if lateness > self.late_tolerance:
+                    self.registry.increment("scheduler.late")
+                await self.probe(entry.target)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("[%s] Error in monitoring loop: %s", entry.target.host, str(e))
+        finally:
+            entry.running = False
+
+    def _advance(self, entry: _Entry) -> None:
+        entry.deadline += entry.period
+        behind = self._now() - entry.deadline
+        if behind >= 0:
+            missed = math.floor(behind / entry.period) + 1
+            self.registry.increment("scheduler.skipped", missed)
+            entry.deadline += missed * entry.period
+
+    def _push(self, entry: _Entry) -> None:
+        heapq.heappush(self._heap, (entry.deadline, next(self._order), entry))
+        if self._wake is not None and self._heap[0][2] is entry:
+            self._wake.set()
+
+    def _next_tick(self, entry: _Entry, now: float) -> float:
+        offset = self.wall_clock() - now
+        ticks = math.ceil((now + offset - entry.phase) / entry.period)
+        return ticks * entry.period + entry.phase - offset
+
+    def _phase(self, host: str, period: float) -> float:
+        return zlib.crc32(host.encode()) / 2 ** 32 * period * self.start_jitter
+
+    def _now(self) -> float:
+        return self.clock()
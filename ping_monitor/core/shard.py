@@ -0,0 +1,197 @@
+"""Shard worker run by ShardSupervisor: one ConnectionMonitor per process.
+
+The supervisor writes JSON lines to stdin. The first carries the worker's
+MonitorConfig and logging setup; a later config line is a reload. Target
+lines replace the worker's assignment::
+
+    {"config": {"ping_adv_path": "/usr/bin/ping_adv", ...},
+     "log": {"level": "INFO", "log_file": null, ...}, "report_interval": 1.0,
+     "restore": true}
+    {"targets": [{"host": "8.8.8.8", "check_interval": 60.0}, ...]}
+
+Every ``report_interval`` the worker writes one compact row per target
+probed since its previous report (see ``encode_row``)::
+
+    {"stats": [["8.8.8.8", 12, 12, 120, 118, 240.5, 12.1, 18.0, 22.3, 1.9, 40, 39, 400, 391]]}
+
+The worker reports once more and exits when stdin closes. Logging goes
+to stderr, so stdout carries nothing but reports.
+"""
+import asyncio
+import json
+import signal
+import sys
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, TextIO, Tuple
+
+from ping_monitor.core.monitor import ConnectionMonitor
+from ping_monitor.models.stats import RunningStats, StatsSnapshot, TargetCounters
+from ping_monitor.utils.config import MonitorConfig, ProbeTarget
+from ping_monitor.utils.logging import LogConfig
+
+# Assignments of tens of thousands of targets travel as a single line.
+LINE_LIMIT = 2 ** 24
+REPORT_ROWS = 256
+
+
+def encode_row(host: str, stats: RunningStats, counters: TargetCounters) -> list:
+    snapshot = StatsSnapshot.of(stats)
+    return [
+        host,
+        snapshot.count,
+        snapshot.successful,
+        snapshot.packets_sent,
+        snapshot.packets_received,
+        snapshot.latency_sum,
+        snapshot.jitter_sum,
+        snapshot.min_latency,
+        snapshot.max_latency,
+        snapshot.max_jitter,
+        counters.probes,
+        counters.successes,
+        counters.packets_sent,
+        counters.packets_received,
+    ]
+
+
+def encode_log_config(log_config: LogConfig) -> dict:
+    return {
+        "level": log_config.level,
+        "log_file": str(log_config.log_file) if log_config.log_file is not None else None,
+        "format": log_config.format,
+    }
+
+
+def decode_log_config(values: dict) -> LogConfig:
+    # Only the supervisor's console is rich; shards share its stderr.
+    log_file = values.get("log_file")
+    return LogConfig(
+        level=values["level"],
+        log_file=Path(log_file) if log_file is not None else None,
+        format=values["format"],
+        rich_output=False
+    )
+
+
+def decode_row(row: list) -> Tuple[str, StatsSnapshot, TargetCounters]:
+    return row[0], StatsSnapshot(*row[1:10]), TargetCounters(*row[10:14])
+
+
+@dataclass
+class ShardWorker:
+    """Runs a ConnectionMonitor over whatever targets the supervisor assigns.
+
+    Reassignments go through ``ConnectionMonitor.reload``, so targets that
+    stay on this shard keep their schedule and history. A shard left
+    without targets stops its monitor instead of falling back to the
+    default target.
+
+    Only the first monitor restores the shard's store: once the supervisor
+    has seen this slot's reports, restoring again would count them twice.
+    """
+
+    config: MonitorConfig
+    emit: Callable[[dict], None]
+    log_config: LogConfig = field(default=LogConfig(rich_output=False))
+    restore: bool = True
+
+    _monitor: Optional[ConnectionMonitor] = field(default=None, init=False)
+    _task: Optional[asyncio.Task] = field(default=None, init=False)
+    _reported: Dict[str, int] = field(default_factory=dict, init=False)
+
+    async def assign(self, targets: Tuple[ProbeTarget, ...]) -> None:
+        if not targets:
+            await self.close()
+            return
+
+        config = replace(self.config, targets=targets)
+        if self._monitor is None:
+            self._monitor = ConnectionMonitor(
+                config, log_config=self.log_config, restore=self.restore
+            )
+            self.restore = False
+            self._task = asyncio.create_task(self._monitor.start())
+            # Let start() mark the monitor running so an early close() can stop it.
+            await asyncio.sleep(0)
+        else:
+            self._monitor.reload(config)
+
+    def configure(self, config: MonitorConfig, log_config: LogConfig) -> None:
+        """Apply a reloaded config; the current target assignment stays."""
+        self.config, self.log_config = config, log_config
+        if self._monitor is not None:
+            self._monitor.reload(
+                replace(config, targets=self._monitor.config.targets), log_config
+            )
+
+    def report(self) -> None:
+        monitor = self._monitor
+        if monitor is None:
+            return
+
+        counters = monitor.counters
+        for host in set(self._reported) - set(counters):
+            del self._reported[host]
+        rows: List[list] = []
+        for host, target_counters in counters.items():
+            if self._reported.get(host) != target_counters.version:
+                self._reported[host] = target_counters.version
+                rows.append(encode_row(host, monitor.running_stats(host), target_counters))
+        for start in range(0, len(rows), REPORT_ROWS):
+            self.emit({"stats": rows[start:start + REPORT_ROWS]})
+
+    async def close(self) -> None:
+        if self._monitor is not None:
+            self.report()
+            await self._monitor.stop()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._monitor = self._task = None
+            self._reported.clear()
+
+
+async def serve(stdin: TextIO, stdout: TextIO) -> None:
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=LINE_LIMIT)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), stdin)
+
+    def emit(message: dict) -> None:
+        stdout.write(json.dumps(message, separators=(",", ":")) + "\n")
+        stdout.flush()
+
+    async def report_every(interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            worker.report()
+
+    worker: Optional[ShardWorker] = None
+    reporter: Optional[asyncio.Task] = None
+    try:
+        async for line in reader:
+            message = json.loads(line)
+            if "config" in message:
+                config = MonitorConfig.from_dict(message["config"])
+                log_config = decode_log_config(message["log"])
+                if worker is None:
+                    worker = ShardWorker(config, emit, log_config, message["restore"])
+                    reporter = asyncio.create_task(report_every(message["report_interval"]))
+                else:
+                    worker.configure(config, log_config)
+            elif worker is not None:
+                await worker.assign(tuple(ProbeTarget(**t) for t in message["targets"]))
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+        if worker is not None:
+            await worker.close()
+
+
+def main() -> None:
+    # The supervisor owns shutdown; Ctrl-C reaches the whole process group.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    stdout, sys.stdout = sys.stdout, sys.stderr
+    asyncio.run(serve(sys.stdin, stdout))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+import asyncio
+import ipaddress
+import itertools
+import logging
+import socket
+import struct
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import ClassVar, Dict, Final, Optional, Tuple
+
+from ping_monitor.models.analysis import analyze
+from ping_monitor.models.metrics import PingMetrics
+
+logger = logging.getLogger(__name__)
+
+Address = Tuple[str, int]
+
+
+@dataclass
+class _Probe:
+    packet_count: int
+    sent: Dict[int, float] = field(default_factory=dict)
+    rtts: Dict[int, float] = field(default_factory=dict)
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def record(self, seq: int, received: float) -> None:
+        if seq in self.rtts or seq not in self.sent:
+            return
+        self.rtts[seq] = received - self.sent[seq]
+        if len(self.rtts) == self.packet_count:
+            self.done.set()
+
+
+class _EchoClient(asyncio.DatagramProtocol):
+    def __init__(self, engine: "SocketProbeEngine") -> None:
+        self.engine = engine
+
+    def datagram_received(self, data: bytes, addr: Address) -> None:
+        self.engine._on_reply(data, time.perf_counter())
+
+    def error_received(self, exc: Exception) -> None:
+        logger.debug("Socket error: %s", exc)
+
+
+class _EchoServer(asyncio.DatagramProtocol):
+    transport: asyncio.DatagramTransport
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: Address) -> None:
+        self.transport.sendto(data, addr)
+
+
+@dataclass
+class SocketProbeEngine:
+    """Probe engine sending echo requests from one shared socket.
+
+    ``icmp`` mode uses an unprivileged ICMP datagram socket, ``udp`` mode
+    sends the same packets to a UDP echo service on ``port``. With
+    ``loopback`` enabled the engine serves its own UDP echo responder on
+    127.0.0.1 and refuses any non-loopback target, so it can be exercised
+    without network access.
+
+    Resolved addresses are cached for ``dns_ttl`` seconds, at most
+    ``dns_cache_size`` of them, least recently used first out. A target
+    whose probe gets no replies is resolved again on its next probe.
+    """
+
+    mode: str = "icmp"
+    port: int = 7
+    loopback: bool = False
+    reply_timeout: float = 1.0
+    dns_ttl: float = 300.0
+    dns_cache_size: int = 1024
+
+    _transport: Optional[asyncio.DatagramTransport] = field(default=None, init=False)
+    _server: Optional[asyncio.DatagramTransport] = field(default=None, init=False)
+    _probes: Dict[int, _Probe] = field(default_factory=dict, init=False)
+    _idents: itertools.count = field(default_factory=lambda: itertools.count(1), init=False)
+    # target -> (address, monotonic expiry)
+    _addresses: "OrderedDict[str, Tuple[Address, float]]" = field(
+        default_factory=OrderedDict, init=False
+    )
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False)
+
+    HEADER: ClassVar[struct.Struct] = struct.Struct("!BBHHH")
+    PAYLOAD: ClassVar[struct.Struct] = struct.Struct("!HH")
+    ECHO_REQUEST: Final[int] = 8
+    ECHO_REPLY: Final[int] = 0
+    PADDING: Final[bytes] = b"\x00" * 48
+
+    def __post_init__(self) -> None:
+        if self.loopback:
+            self.mode = "udp"
+        if self.mode not in ("icmp", "udp"):
+            raise ValueError(f"Unsupported probe mode: {self.mode}")
+
+    async def execute_async(self, target: str, packet_count: int, interval: float) -> PingMetrics:
+        ident = next(self._idents) & 0xFFFF
+        probe = _Probe(packet_count)
+        self._probes[ident] = probe
+        try:
+            await self._open()
+            address = await self._resolve(target)
+
+            for seq in range(packet_count):
+                probe.sent[seq] = time.perf_counter()
+                self._transport.sendto(self._packet(ident, seq), address)
+                if seq < packet_count - 1:
+                    await asyncio.sleep(interval)
+
+            try:
+                await asyncio.wait_for(probe.done.wait(), timeout=self.reply_timeout)
+            except asyncio.TimeoutError:
+                pass
+        except Exception as e:
+            logger.debug("Probe of %s failed: %s", target, e)
+            self._addresses.pop(target, None)
+            return self._as_error(target, packet_count, str(e))
+        finally:
+            self._probes.pop(ident, None)
+
+        if not probe.rtts:
+            self._addresses.pop(target, None)
+        return self._as_metrics(target, packet_count, probe.rtts)
+
+    async def close(self) -> None:
+        for transport in (self._transport, self._server):
+            if transport is not None:
+                transport.close()
+        self._transport = None
+        self._server = None
+
+    async def _open(self) -> None:
+        if self._transport is not None:
+            return
+        async with self._lock:
+            if self._transport is not None:
+                return
+            loop = asyncio.get_running_loop()
+            if self.loopback:
+                self._server, _ = await loop.create_datagram_endpoint(
+                    _EchoServer, local_addr=("127.0.0.1", 0)
+                )
+                self.port = self._server.get_extra_info("sockname")[1]
+
+            if self.mode == "icmp":
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+            else:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setblocking(False)
+            self._transport, _ = await loop.create_datagram_endpoint(
+                lambda: _EchoClient(self), sock=sock
+            )
+
+    async def _resolve(self, target: str) -> Address:
+        now = time.monotonic()
+        cached = self._addresses.get(target)
+        if cached is not None and cached[1] > now:
+            self._addresses.move_to_end(target)
+            return cached[0]
+
+        port = self.port if self.mode == "udp" else 0
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            target, port, family=socket.AF_INET, type=socket.SOCK_DGRAM
+        )
+        address = infos[0][4]
+        if self.loopback and not ipaddress.ip_address(address[0]).is_loopback:
+            raise ValueError(f"{target} is not a loopback address")
+        self._addresses[target] = (address, now + self.dns_ttl)
+        self._addresses.move_to_end(target)
+        while len(self._addresses) > self.dns_cache_size:
+            self._addresses.popitem(last=False)
+        return address
+
+    def _packet(self, ident: int, seq: int) -> bytes:
+        payload = self.PAYLOAD.pack(ident, seq) + self.PADDING
+        header = self.HEADER.pack(self.ECHO_REQUEST, 0, 0, ident, seq)
+        checksum = self._checksum(header + payload)
+        return self.HEADER.pack(self.ECHO_REQUEST, 0, checksum, ident, seq) + payload
+
+    def _on_reply(self, data: bytes, received: float) -> None:
+        if len(data) < self.HEADER.size + self.PAYLOAD.size:
+            return
+        kind = data[0]
+        if kind != (self.ECHO_REQUEST if self.mode == "udp" else self.ECHO_REPLY):
+            return
+        # The kernel may rewrite the ICMP identifier, so match on the payload copy.
+        ident, seq = self.PAYLOAD.unpack_from(data, self.HEADER.size)
+        probe = self._probes.get(ident)
+        if probe is not None:
+            probe.record(seq, received)
+
+    @staticmethod
+    def _checksum(data: bytes) -> int:
+        if len(data) % 2:
+            data += b"\x00"
+        total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+        total = (total >> 16) + (total & 0xFFFF)
+        total += total >> 16
+        return ~total & 0xFFFF
+
+    def _as_metrics(self, target: str, packet_count: int, rtts: Dict[int, float]) -> PingMetrics:
+        if not rtts:
+            return self._as_error(target, packet_count, "No replies received")
+
+        sequence = array("l", sorted(rtts))
+        samples = array("d", (rtts[seq] * 1000.0 for seq in sequence))
+        deltas = [abs(b - a) for a, b in zip(samples, samples[1:])]
+        return PingMetrics(
+            timestamp=datetime.now(),
+            target=target,
+            average_latency=sum(samples) / len(samples),
+            jitter=sum(deltas) / len(deltas) if deltas else 0.0,
+            packet_count=packet_count,
+            success_count=len(samples),
+            rtts=samples,
+            analysis=analyze(samples, sequence, packet_count, first_seq=0)
+        )
+
+    def _as_error(self, target: str, packet_count: int, error: str) -> PingMetrics:
+        return PingMetrics(
+            timestamp=datetime.now(),
+            target=target,
+            average_latency=0.0,
+            jitter=0.0,
+            packet_count=packet_count,
+            success_count=0,
+            error_message=error
+        )
@@ -0,0 +1,320 @@
+"""Durable, append-only on-disk metric store.
+
+A store directory holds numbered segments. Each segment has up to three files:
+
+* ``NNNNNN.seg``: a 16 byte header followed by fixed-size 40 byte records
+  (float64 epoch timestamp, latency and jitter, uint32 packet and success
+  counts, uint32 target id, int32 error id or -1).
+* ``NNNNNN.idx``: the time index, one entry per flushed batch holding the
+  batch's first record, record count and min/max timestamp.
+* ``NNNNNN.err``: the segment's error messages, one JSON string per line;
+  a record's error id is its line number.
+
+Target names are interned in ``strings.jsonl``. Error messages are free
+text, so they stay with their segment instead of growing the interned
+table; segments written before that (``LEGACY_MAGIC``) still resolve
+error ids through ``strings.jsonl``. Batches are written and fsync'd
+before their index entry, so on reopen any records past the last index
+entry are the remains of an interrupted flush and are truncated. Reads go
+through ``mmap`` and unpack records in place.
+"""
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import ClassVar, Dict, Iterator, List, Optional, Tuple
+
+from ping_monitor.models.metrics import PingMetrics
+
+logger = logging.getLogger(__name__)
+
+RECORD = struct.Struct("<dddIIIi")
+INDEX = struct.Struct("<QQdd")
+HEADER = struct.Struct("<8sII")
+MAGIC = b"PMSEG\x00\x02\x00"
+LEGACY_MAGIC = b"PMSEG\x00\x01\x00"
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    first: int
+    count: int
+    min_timestamp: float
+    max_timestamp: float
+
+
+@dataclass
+class Segment:
+    number: int
+    directory: Path
+
+    @property
+    def data_path(self) -> Path:
+        return self.directory / f"{self.number:06d}.seg"
+
+    @property
+    def index_path(self) -> Path:
+        return self.directory / f"{self.number:06d}.idx"
+
+    @property
+    def errors_path(self) -> Path:
+        return self.directory / f"{self.number:06d}.err"
+
+    @property
+    def legacy(self) -> bool:
+        with open(self.data_path, "rb") as f:
+            return f.read(len(LEGACY_MAGIC)) == LEGACY_MAGIC
+
+    def entries(self) -> List[IndexEntry]:
+        if not self.index_path.exists():
+            return []
+        data = self.index_path.read_bytes()
+        usable = len(data) - len(data) % INDEX.size
+        return [IndexEntry(*fields) for fields in INDEX.iter_unpack(data[:usable])]
+
+    @property
+    def record_count(self) -> int:
+        entries = self.entries()
+        return entries[-1].first + entries[-1].count if entries else 0
+
+
+@dataclass
+class MetricStore:
+    directory: Path
+    batch_size: int = 64
+    segment_records: int = 1 << 20
+
+    _strings: Dict[str, int] = field(default_factory=dict, init=False)
+    _values: List[str] = field(default_factory=list, init=False)
+    _pending: List[PingMetrics] = field(default_factory=list, init=False)
+    _segment: Optional[Segment] = field(default=None, init=False)
+    _records: int = field(default=0, init=False)
+    _errors: int = field(default=0, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    _write_lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    NO_ERROR: ClassVar[int] = -1
+
+    def __post_init__(self) -> None:
+        self.directory = Path(self.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._load_strings()
+        segments = self.segments()
+        if segments:
+            self._segment = segments[-1]
+            self._records = self._repair_index(self._segment)
+            self._truncate(self._segment, self._records)
+            if self._segment.legacy:
+                self._roll()
+            else:
+                self._errors = len(_read_lines(self._segment.errors_path, repair=True))
+
+    def append(self, metrics: PingMetrics) -> bool:
+        """Buffer a sample; returns True once a full batch is waiting to be flushed."""
+        with self._lock:
+            self._pending.append(metrics)
+            return len(self._pending) >= self.batch_size
+
+    def flush(self) -> None:
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        with self._write_lock:
+            batch.sort(key=lambda m: m.timestamp)
+            while batch:
+                if self._segment is None or self._records >= self.segment_records:
+                    self._roll()
+                room = self.segment_records - self._records
+                chunk, batch = batch[:room], batch[room:]
+                self._write(chunk)
+
+    def close(self) -> None:
+        self.flush()
+
+    def segments(self) -> List[Segment]:
+        return [
+            Segment(int(path.stem), self.directory)
+            for path in sorted(self.directory.glob("*.seg"))
+        ]
+
+    def scan(
+            self,
+            since: Optional[datetime] = None,
+            until: Optional[datetime] = None,
+            target: Optional[str] = None
+    ) -> Iterator[PingMetrics]:
+        low = since.timestamp() if since is not None else float("-inf")
+        high = until.timestamp() if until is not None else float("inf")
+        target_id = self._strings.get(target) if target is not None else None
+        if target is not None and target_id is None:
+            return
+
+        for segment in self.segments():
+            entries = [
+                e for e in segment.entries()
+                if e.max_timestamp >= low and e.min_timestamp <= high
+            ]
+            if not entries:
+                continue
+            errors = None if segment.legacy else _read_lines(segment.errors_path)
+            with open(segment.data_path, "rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                for entry in entries:
+                    offset = HEADER.size + entry.first * RECORD.size
+                    for _ in range(entry.count):
+                        record = RECORD.unpack_from(view, offset)
+                        offset += RECORD.size
+                        if not low <= record[0] <= high:
+                            continue
+                        if target_id is not None and record[5] != target_id:
+                            continue
+                        yield self._decode(record, errors)
+
+    def _decode(self, record: Tuple, errors: Optional[List[str]]) -> PingMetrics:
+        timestamp, latency, jitter, packet_count, success_count, target_id, error_id = record
+        if error_id == self.NO_ERROR:
+            error_message = None
+        else:
+            error_message = (errors if errors is not None else self._values)[error_id]
+        return PingMetrics(
+            timestamp=timestamp,
+            target=self._values[target_id],
+            average_latency=latency,
+            jitter=jitter,
+            packet_count=packet_count,
+            success_count=success_count,
+            error_message=error_message
+        )
+
+    def _encode(self, metrics: PingMetrics, new_strings: List[str], errors: List[str]) -> bytes:
+        error_id = self.NO_ERROR
+        if metrics.error_message is not None:
+            error_id = self._errors + len(errors)
+            errors.append(metrics.error_message)
+        return RECORD.pack(
+            metrics.timestamp.timestamp(),
+            metrics.average_latency,
+            metrics.jitter,
+            metrics.packet_count,
+            metrics.success_count,
+            self._intern(metrics.target, new_strings),
+            error_id
+        )
+
+    def _intern(self, value: str, new_strings: List[str]) -> int:
+        key = self._strings.get(value)
+        if key is None:
+            key = self._strings[value] = len(self._values)
+            self._values.append(value)
+            new_strings.append(value)
+        return key
+
+    def _write(self, batch: List[PingMetrics]) -> None:
+        new_strings: List[str] = []
+        errors: List[str] = []
+        data = b"".join(self._encode(m, new_strings, errors) for m in batch)
+
+        for path, values in (
+                (self._strings_path, new_strings), (self._segment.errors_path, errors)
+        ):
+            if values:
+                with open(path, "a", encoding="utf-8") as f:
+                    f.writelines(json.dumps(value) + "\n" for value in values)
+                    f.flush()
+                    os.fsync(f.fileno())
+        # Error lines of a batch lost before its index entry are simply never referenced.
+        self._errors += len(errors)
+
+        with open(self._segment.data_path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        entry = INDEX.pack(
+            self._records,
+            len(batch),
+            batch[0].timestamp.timestamp(),
+            batch[-1].timestamp.timestamp()
+        )
+        with open(self._segment.index_path, "ab") as f:
+            f.write(entry)
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._records += len(batch)
+        logger.debug("Flushed %d records to %s", len(batch), self._segment.data_path)
+
+    def _roll(self) -> None:
+        number = self._segment.number + 1 if self._segment is not None else 1
+        self._segment = Segment(number, self.directory)
+        with open(self._segment.data_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, RECORD.size, 0))
+            f.flush()
+            os.fsync(f.fileno())
+        self._records = self._errors = 0
+
+    def _repair_index(self, segment: Segment) -> int:
+        """Cut a torn trailing entry, and entries past the data, off the index.
+
+        Appends go to the end of the file, so anything left behind by an
+        interrupted flush would misalign every entry written after it.
+        Returns the number of records the repaired index covers.
+        """
+        if not segment.index_path.exists():
+            return 0
+        available = (segment.data_path.stat().st_size - HEADER.size) // RECORD.size
+        kept = records = 0
+        for entry in segment.entries():
+            if entry.first != records or entry.first + entry.count > available:
+                break
+            kept += 1
+            records += entry.count
+        size = kept * INDEX.size
+        if segment.index_path.stat().st_size > size:
+            logger.warning("Truncating incomplete index entries in %s", segment.index_path)
+            os.truncate(segment.index_path, size)
+        return records
+
+    def _truncate(self, segment: Segment, records: int) -> None:
+        size = HEADER.size + records * RECORD.size
+        if segment.data_path.stat().st_size > size:
+            logger.warning("Truncating incomplete batch in %s", segment.data_path)
+            os.truncate(segment.data_path, size)
+
+    @property
+    def _strings_path(self) -> Path:
+        return self.directory / "strings.jsonl"
+
+    def _load_strings(self) -> None:
+        for value in _read_lines(self._strings_path, repair=True):
+            self._strings[value] = len(self._values)
+            self._values.append(value)
+
+
+def _read_lines(path: Path, repair: bool = False) -> List[str]:
+    """The complete JSON lines of ``path``; ``repair`` truncates a torn tail."""
+    if not path.exists():
+        return []
+    values: List[str] = []
+    valid = 0
+    with open(path, "rb") as f:
+        for line in f:
+            # A line without its newline is the remains of an interrupted write.
+            if not line.endswith(b"\n"):
+                break
+            try:
+                values.append(json.loads(line))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                break
+            valid += len(line)
+    if repair and path.stat().st_size > valid:
+        logger.warning("Truncating incomplete line in %s", path)
+        os.truncate(path, valid)
+    return values
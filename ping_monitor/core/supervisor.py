@@ -0,0 +1,323 @@
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import zlib
+from collections import deque
+from dataclasses import asdict, dataclass, field, fields, replace
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from ping_monitor.core.instrumentation import Instrumentation, instrumentation
+from ping_monitor.core.monitor import ConnectionMonitor
+from ping_monitor.core.reload import ConfigWatcher
+from ping_monitor.core.shard import LINE_LIMIT, decode_row, encode_log_config
+from ping_monitor.models.stats import StatsSnapshot, TargetCounters, summarize
+from ping_monitor.utils.config import MonitorConfig, ProbeTarget
+from ping_monitor.utils.logging import LogConfig, setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+class ShardReport(NamedTuple):
+    stats: StatsSnapshot
+    counters: TargetCounters
+
+
+@dataclass
+class _Shard:
+    slot: int
+    process: asyncio.subprocess.Process
+    targets: Tuple[ProbeTarget, ...] = ()
+    reports: Dict[str, ShardReport] = field(default_factory=dict)
+    reader: Optional[asyncio.Task] = None
+
+
+def owner(host: str, slots: Iterable[int]) -> int:
+    """Rendezvous hash: the slot with the highest score for ``host``.
+
+    Removing a slot only moves that slot's targets, and they move back
+    when it returns.
+    """
+    return max(slots, key=lambda slot: zlib.crc32(f"{slot}/{host}".encode()))
+
+
+@dataclass
+class ShardSupervisor:
+    """Spreads targets over worker processes, each running its own ConnectionMonitor.
+
+    Targets are hashed onto ``processes`` shard slots. Workers stream
+    compact per-target aggregates back over their stdout pipe (see
+    ``ping_monitor.core.shard``), so ``get_stats`` answers for the whole
+    fleet from the supervisor. When a worker exits its targets are
+    rehashed onto the surviving shards at once, and the slot is restarted
+    after ``restart_delay``, taking the same targets back.
+
+    Aggregates of a target that left a shard are kept for
+    ``raw_retention`` seconds, like the samples they summarise, so moving
+    a target does not reset its stats.
+
+    With ``config_path`` set, config changes are reloaded as in
+    ConnectionMonitor: the new targets are rehashed onto the shards and
+    every worker receives the new config and log level.
+    """
+
+    config: MonitorConfig
+    processes: int = field(default_factory=lambda: os.cpu_count() or 1)
+    report_interval: float = 1.0
+    restart_delay: float = 1.0
+    shutdown_timeout: float = 5.0
+    command: List[str] = field(
+        default_factory=lambda: [sys.executable, "-m", "ping_monitor.core.shard"]
+    )
+    registry: Instrumentation = field(default_factory=lambda: instrumentation)
+    log_config: LogConfig = field(default=LogConfig())
+    config_path: Optional[Path] = None
+    config_overrides: Dict[str, Any] = field(default_factory=dict)
+    log_overrides: Dict[str, Any] = field(default_factory=dict)
+
+    _shards: Dict[int, _Shard] = field(default_factory=dict, init=False)
+    _retired: Deque[Tuple[float, Dict[str, StatsSnapshot]]] = field(
+        default_factory=deque, init=False
+    )
+    _totals: Dict[str, TargetCounters] = field(default_factory=dict, init=False)
+    _restarts: Set[asyncio.Task] = field(default_factory=set, init=False)
+    _watcher: Optional[ConfigWatcher] = field(default=None, init=False)
+    _running: bool = field(default=False, init=False)
+
+    def __post_init__(self) -> None:
+        if self.processes < 1:
+            raise ValueError("processes must be at least 1")
+        setup_logging(self.log_config)
+
+    async def start(self) -> None:
+        if self._running:
+            logger.warning("Supervisor already running")
+            return
+
+        self._running = True
+        for slot in range(self.processes):
+            await self._spawn(slot)
+        self._rebalance()
+        if self.config_path is not None and self.config.reload_interval:
+            self._watcher = ConfigWatcher(
+                self.config_path,
+                self._apply_config,
+                self.config.reload_interval,
+                self.config_overrides,
+                self.log_overrides
+            )
+            self._watcher.start()
+        logger.info(
+            "Started %d shards for %d targets", len(self._shards), len(self.targets)
+        )
+
+    async def stop(self) -> None:
+        if not self._running:
+            return
+
+        self._running = False
+        if self._watcher is not None:
+            await self._watcher.stop()
+            self._watcher = None
+        for task in self._restarts:
+            task.cancel()
+        await asyncio.gather(*self._restarts, return_exceptions=True)
+
+        shards = list(self._shards.values())
+        for shard in shards:
+            shard.process.stdin.close()
+        for shard in shards:
+            try:
+                await asyncio.wait_for(shard.process.wait(), self.shutdown_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Shard %d did not exit, killing it", shard.slot)
+                shard.process.kill()
+        await asyncio.gather(*(shard.reader for shard in shards), return_exceptions=True)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.stop()
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    @property
+    def targets(self) -> Tuple[str, ...]:
+        return tuple(t.host for t in self.config.probe_targets)
+
+    @property
+    def shards(self) -> Dict[int, Tuple[str, ...]]:
+        """Hosts assigned to each live shard slot."""
+        return {
+            slot: tuple(t.host for t in shard.targets)
+            for slot, shard in sorted(self._shards.items())
+        }
+
+    def get_stats(self, target: Optional[str] = None) -> dict:
+        return summarize(
+            stats for host, stats in self._snapshots() if target is None or host == target
+        )
+
+    def counters(self) -> Dict[str, TargetCounters]:
+        """Probe totals per target since start, across every shard that ran it."""
+        totals = {host: replace(c) for host, c in self._totals.items()}
+        for shard in self._shards.values():
+            for host, report in shard.reports.items():
+                _accumulate(totals, host, report.counters)
+        return totals
+
+    def reload(self, config: MonitorConfig, log_config: Optional[LogConfig] = None) -> None:
+        """Apply a new config to the running shards without restarting them.
+
+        Fields outside ``ConnectionMonitor.RELOADABLE`` keep their current
+        value until restart, as they do in a single monitor.
+        """
+        frozen = {
+            f.name: getattr(self.config, f.name)
+            for f in fields(MonitorConfig)
+            if f.name not in ConnectionMonitor.RELOADABLE
+            and getattr(config, f.name) != getattr(self.config, f.name)
+        }
+        if frozen:
+            logger.warning("Changes to %s take effect after a restart", ", ".join(frozen))
+            config = replace(config, **frozen)
+        self.config = config
+
+        if log_config is not None and log_config.level != self.log_config.level:
+            logging.getLogger().setLevel(log_config.level.upper())
+            self.log_config = replace(self.log_config, level=log_config.level)
+
+        for shard in self._shards.values():
+            self._send(shard, self._config_message(shard.slot))
+        self._rebalance()
+
+    async def _apply_config(self, config: MonitorConfig, log_config: LogConfig) -> None:
+        self.reload(config, log_config)
+
+    def _snapshots(self) -> Iterable[Tuple[str, StatsSnapshot]]:
+        now = time.monotonic()
+        while self._retired and self._retired[0][0] <= now:
+            self._retired.popleft()
+        for _, retired in self._retired:
+            yield from retired.items()
+        for shard in self._shards.values():
+            for host, report in shard.reports.items():
+                yield host, report.stats
+
+    def _config_message(self, slot: int) -> dict:
+        store_path = self.config.store_path
+        config = replace(
+            self.config,
+            targets=(),
+            # The CLI refuses --metrics-port with shards; each shard gets its own store.
+            metrics_port=None,
+            store_path=store_path / f"shard-{slot}" if store_path is not None else None
+        )
+        return {
+            "config": config.to_dict(),
+            "log": encode_log_config(self.log_config),
+            "report_interval": self.report_interval,
+        }
+
+    async def _spawn(self, slot: int, restore: bool = True) -> None:
+        process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=LINE_LIMIT
+        )
+        shard = self._shards[slot] = _Shard(slot, process)
+        self._send(shard, {**self._config_message(slot), "restore": restore})
+        shard.reader = asyncio.create_task(self._read(shard))
+
+    def _send(self, shard: _Shard, message: dict) -> None:
+        try:
+            shard.process.stdin.write(json.dumps(message).encode() + b"\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # The reader notices the exit and rebalances.
+            pass
+
+    async def _read(self, shard: _Shard) -> None:
+        try:
+            while line := await shard.process.stdout.readline():
+                assigned = {t.host for t in shard.targets}
+                for row in json.loads(line)["stats"]:
+                    host, stats, counters = decode_row(row)
+                    # Rows sent before a reassignment reached the worker are stale.
+                    if host in assigned:
+                        shard.reports[host] = ShardReport(stats, counters)
+        except (ValueError, KeyError, TypeError, IndexError) as e:
+            logger.error("Shard %d sent an invalid report: %s", shard.slot, e)
+            shard.process.kill()
+
+        returncode = await shard.process.wait()
+        if self._shards.get(shard.slot) is not shard:
+            return
+        del self._shards[shard.slot]
+        self._retire(shard.reports)
+        if self._running:
+            self.registry.increment("supervisor.restarts")
+            logger.warning(
+                "Shard %d exited with status %s, moving its %d targets",
+                shard.slot, returncode, len(shard.targets)
+            )
+            self._rebalance()
+            task = asyncio.create_task(self._restart(shard.slot))
+            self._restarts.add(task)
+            task.add_done_callback(self._restarts.discard)
+
+    async def _restart(self, slot: int) -> None:
+        while self._running:
+            await asyncio.sleep(self.restart_delay)
+            try:
+                # The slot's earlier reports are already retired; a restore would repeat them.
+                await self._spawn(slot, restore=False)
+            except OSError as e:
+                logger.error("Cannot restart shard %d: %s", slot, e)
+                continue
+            self._rebalance()
+            return
+
+    def _rebalance(self) -> None:
+        slots = sorted(self._shards)
+        if not slots:
+            return
+
+        assigned: Dict[int, List[ProbeTarget]] = {slot: [] for slot in slots}
+        for target in self.config.probe_targets:
+            assigned[owner(target.host, slots)].append(target)
+
+        for slot, shard in self._shards.items():
+            targets = tuple(assigned[slot])
+            if targets == shard.targets:
+                continue
+            hosts = {t.host for t in targets}
+            self._retire({h: r for h, r in shard.reports.items() if h not in hosts})
+            shard.reports = {h: r for h, r in shard.reports.items() if h in hosts}
+            shard.targets = targets
+            self._send(shard, {"targets": [asdict(t) for t in targets]})
+
+    def _retire(self, reports: Dict[str, ShardReport]) -> None:
+        if not reports:
+            return
+        for host, report in reports.items():
+            _accumulate(self._totals, host, report.counters)
+        self._retired.append((
+            time.monotonic() + self.config.raw_retention,
+            {host: report.stats for host, report in reports.items()}
+        ))
+
+
+def _accumulate(totals: Dict[str, TargetCounters], host: str, counters: TargetCounters) -> None:
+    total = totals.setdefault(host, TargetCounters())
+    total.probes += counters.probes
+    total.successes += counters.successes
+    total.packets_sent += counters.packets_sent
+    total.packets_received += counters.packets_received
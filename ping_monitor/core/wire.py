@@ -0,0 +1,78 @@
+"""Frames exchanged between MetricsAgent and Aggregator over one TCP connection.
+
+Each frame is a 4 byte big-endian length followed by that many bytes of
+zlib-compressed JSON. An agent opens with a hello, then sends numbered
+sample batches, each acknowledged by the aggregator::
+
+    agent:      {"vantage": "fra-1", "session": "5f0c..."}
+    agent:      {"seq": 1, "samples": [[1700000000.5, "8.8.8.8", 12.1, 0.4, 10, 10, null], ...]}
+    aggregator: {"ack": 1}
+
+Batches are resent after a reconnect until acknowledged; the aggregator
+drops sequence numbers it has already applied for the session.
+"""
+import asyncio
+import json
+import struct
+import zlib
+from typing import Optional
+
+from ping_monitor.models.exceptions import ProtocolError
+from ping_monitor.models.metrics import PingMetrics
+
+HEADER = struct.Struct("!I")
+MAX_FRAME = 16 * 1024 * 1024
+
+
+def encode_frame(message: dict) -> bytes:
+    payload = zlib.compress(json.dumps(message, separators=(",", ":")).encode())
+    return HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[dict]:
+    """Next message, or None when the peer closed the connection between frames."""
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError as e:
+        if e.partial:
+            raise ProtocolError("Connection closed inside a frame header") from e
+        return None
+
+    (length,) = HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ProtocolError(f"Frame of {length} bytes exceeds {MAX_FRAME}")
+    payload = await reader.readexactly(length)
+
+    decompressor = zlib.decompressobj()
+    try:
+        data = decompressor.decompress(payload, MAX_FRAME)
+        if decompressor.unconsumed_tail:
+            raise ProtocolError(f"Frame expands beyond {MAX_FRAME} bytes")
+        return json.loads(data)
+    except (zlib.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ProtocolError(f"Invalid frame: {e}") from e
+
+
+def sample_row(metrics: PingMetrics) -> list:
+    return [
+        metrics.timestamp.timestamp(),
+        metrics.target,
+        metrics.average_latency,
+        metrics.jitter,
+        metrics.packet_count,
+        metrics.success_count,
+        metrics.error_message,
+    ]
+
+
+def sample_from_row(row: list) -> PingMetrics:
+    timestamp, target, latency, jitter, packet_count, success_count, error = row
+    return PingMetrics(
+        timestamp=timestamp,
+        target=target,
+        average_latency=latency,
+        jitter=jitter,
+        packet_count=packet_count,
+        success_count=success_count,
+        error_message=error
+    )
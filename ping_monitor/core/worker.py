@@ -0,0 +1,85 @@
+"""Long-lived ping_adv worker speaking the pool's line protocol.
+
+Each request is one JSON object per line on stdin::
+
+    {"id": 1, "target": "8.8.8.8", "packet_count": 10, "interval": 1.0, "timeout": 15.0}
+
+and each response is one JSON object per line on stdout carrying the
+ping_adv exit code and its ``Test Result:`` output::
+
+    {"id": 1, "returncode": 0, "stdout": "[8.8.8.8] Test Result: ...", "stderr": ""}
+
+Requests run concurrently and responses come back as they finish, in any
+order; the id pairs them up. ping_adv has no serve mode of its own, so
+this wrapper still starts one ping_adv per request. What the pool saves
+is the fork/exec and pipe handling on the monitor's event loop, spread
+over the worker processes instead. Any command speaking the same
+protocol can be used by ``WorkerPool``.
+"""
+import asyncio
+import json
+import sys
+from typing import Set, TextIO
+
+
+async def handle(ping_adv: str, request: dict) -> dict:
+    cmd = [ping_adv, request["target"], str(request["packet_count"]), str(request["interval"])]
+    process = None
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await asyncio.wait_for(process.communicate(), request.get("timeout"))
+        return {
+            "id": request["id"],
+            "returncode": process.returncode,
+            "stdout": stdout.decode(errors="replace"),
+            "stderr": stderr.decode(errors="replace")
+        }
+    except asyncio.TimeoutError:
+        return {"id": request["id"], "returncode": -1, "stdout": "", "stderr": "Command timed out"}
+    except OSError as e:
+        return {"id": request["id"], "returncode": -1, "stdout": "", "stderr": str(e)}
+    finally:
+        if process is not None and process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+
+
+async def serve(ping_adv: str, stdin: TextIO, stdout: TextIO) -> None:
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), stdin)
+    running: Set[asyncio.Task] = set()
+
+    async def respond(request: dict) -> None:
+        response = await handle(ping_adv, request)
+        stdout.write(json.dumps(response) + "\n")
+        stdout.flush()
+
+    async for line in reader:
+        if not line.strip():
+            continue
+        task = asyncio.create_task(respond(json.loads(line)))
+        running.add(task)
+        task.add_done_callback(running.discard)
+    await asyncio.gather(*running)
+
+
+def main(argv: list) -> int:
+    if len(argv) != 2:
+        print("usage: python -m ping_monitor.core.worker <ping_adv>", file=sys.stderr)
+        return 2
+
+    asyncio.run(serve(argv[1], sys.stdin, sys.stdout))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,123 @@
+"""Per-packet RTT analysis: distribution, RFC 3550 jitter and loss bursts.
+
+Uses NumPy when it is installed (``poetry install -E analysis``) and an
+equivalent pure-Python path otherwise. NumPy is only imported by the first
+analysis, keeping it out of startup.
+"""
+import math
+import statistics
+from array import array
+from typing import NamedTuple, Optional, Sequence
+
+from ping_monitor.utils.optional import optional_numpy
+
+RFC3550_GAIN = 1 / 16
+
+
+class RttAnalysis(NamedTuple):
+    received: int
+    min_rtt: float
+    max_rtt: float
+    mean_rtt: float
+    stddev_rtt: float
+    median_rtt: float
+    p95_rtt: float
+    rfc3550_jitter: float
+    loss_bursts: int
+    max_loss_burst: int
+
+
+def analyze(
+        rtts: Sequence[float],
+        sequence: Sequence[int],
+        packet_count: int,
+        first_seq: int = 1
+) -> Optional[RttAnalysis]:
+    """Analyse the RTTs (ms) of the replies to one probe.
+
+    ``sequence`` holds the sequence number of each reply in ``rtts``, in
+    the same ascending order; packets ``first_seq .. first_seq +
+    packet_count - 1`` missing from it count as lost.
+    """
+    if not len(rtts):
+        return None
+    np = optional_numpy()
+    if np is not None:
+        return _analyze_numpy(np, rtts, sequence, packet_count, first_seq)
+    return _analyze_python(rtts, sequence, packet_count, first_seq)
+
+
+def _analyze_numpy(np, rtts, sequence, packet_count: int, first_seq: int) -> RttAnalysis:
+    if isinstance(rtts, array):
+        values = np.frombuffer(rtts, dtype=np.float64)
+    else:
+        values = np.asarray(rtts, dtype=np.float64)
+    deltas = np.abs(np.diff(values))
+    # J_n = sum_k gain * (1 - gain)^(n-k) * |D_k|, the closed form of RFC 3550's J += (|D| - J) / 16.
+    weights = (1 - RFC3550_GAIN) ** np.arange(len(deltas) - 1, -1, -1, dtype=np.float64)
+    jitter = float(RFC3550_GAIN * np.dot(deltas, weights))
+
+    received = np.zeros(packet_count + 2, dtype=np.int8)
+    positions = np.asarray(sequence, dtype=np.int64) - first_seq + 1
+    positions = positions[(positions >= 1) & (positions <= packet_count)]
+    received[positions] = 1
+    received[0] = received[-1] = 1
+    edges = np.diff(received)
+    starts = np.flatnonzero(edges == -1)
+    ends = np.flatnonzero(edges == 1)
+    bursts = ends - starts
+
+    median, p95 = np.percentile(values, (50, 95))
+    return RttAnalysis(
+        received=len(values),
+        min_rtt=float(values.min()),
+        max_rtt=float(values.max()),
+        mean_rtt=float(values.mean()),
+        stddev_rtt=float(values.std()),
+        median_rtt=float(median),
+        p95_rtt=float(p95),
+        rfc3550_jitter=jitter,
+        loss_bursts=len(bursts),
+        max_loss_burst=int(bursts.max()) if len(bursts) else 0
+    )
+
+
+def _analyze_python(rtts, sequence, packet_count: int, first_seq: int) -> RttAnalysis:
+    values = list(rtts)
+    jitter = 0.0
+    for previous, current in zip(values, values[1:]):
+        jitter += (abs(current - previous) - jitter) * RFC3550_GAIN
+
+    replied = {seq - first_seq for seq in sequence}
+    bursts = []
+    run = 0
+    for position in range(packet_count):
+        if position in replied:
+            if run:
+                bursts.append(run)
+            run = 0
+        else:
+            run += 1
+    if run:
+        bursts.append(run)
+
+    ordered = sorted(values)
+    return RttAnalysis(
+        received=len(values),
+        min_rtt=ordered[0],
+        max_rtt=ordered[-1],
+        mean_rtt=statistics.fmean(values),
+        stddev_rtt=statistics.pstdev(values),
+        median_rtt=statistics.median(values),
+        p95_rtt=_percentile(ordered, 95),
+        rfc3550_jitter=jitter,
+        loss_bursts=len(bursts),
+        max_loss_burst=max(bursts, default=0)
+    )
+
+
+def _percentile(ordered, percent: float) -> float:
+    rank = (len(ordered) - 1) * percent / 100
+    low = math.floor(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
@@ -0,0 +1,132 @@
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import ClassVar, Dict, List, Optional
+
+from ping_monitor.models.analysis import RttAnalysis
+from ping_monitor.models.history import MetricHistory
+from ping_monitor.models.metrics import PingMetrics
+
+
+@dataclass
+class StringTable:
+    """Interns target names so columns can store integer ids.
+
+    Entries are never dropped, so only the bounded set of target names
+    belongs here; free-form strings such as error messages do not.
+    """
+
+    _ids: Dict[str, int] = field(default_factory=dict, init=False)
+    _values: List[str] = field(default_factory=list, init=False)
+
+    def intern(self, value: str) -> int:
+        key = self._ids.get(value)
+        if key is None:
+            key = self._ids[value] = len(self._values)
+            self._values.append(value)
+        return key
+
+    def lookup(self, key: int) -> str:
+        return self._values[key]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+@dataclass
+class ColumnarHistory(MetricHistory):
+    """Ring buffer storing samples as typed columns instead of objects.
+
+    A sample takes 104 bytes: float64 epoch timestamp, latency and jitter,
+    uint32 packet/success counts, an interned target id and the fields of
+    its RttAnalysis, zeroed when it has none (``received`` is 0 exactly
+    then). Per-packet RTTs and error messages vary in length, so they are
+    kept per slot and leave with their sample. PingMetrics objects are only
+    built when a sample is read; ``column`` returns a whole column in
+    chronological order.
+    """
+
+    strings: StringTable = field(default_factory=StringTable)
+
+    _columns: Dict[str, array] = field(default_factory=dict, init=False)
+    _errors: Dict[int, str] = field(default_factory=dict, init=False)
+    _rtts: Dict[int, array] = field(default_factory=dict, init=False)
+
+    COLUMNS: ClassVar[Dict[str, str]] = {
+        "timestamp": "d",
+        "average_latency": "d",
+        "jitter": "d",
+        "packet_count": "I",
+        "success_count": "I",
+        "target_id": "I",
+        **{
+            name: "I" if name in ("received", "loss_bursts", "max_loss_burst") else "d"
+            for name in RttAnalysis._fields
+        },
+    }
+
+    def trim(self, now: Optional[datetime] = None) -> None:
+        cutoff = (now or datetime.now()).timestamp() - self.window.total_seconds()
+        timestamps = self._columns["timestamp"]
+        while self._size and timestamps[self._start] <= cutoff:
+            self._evict()
+
+    def column(self, name: str) -> array:
+        values = self._columns[name]
+        end = self._start + self._size
+        if end <= self.capacity:
+            return values[self._start:end]
+        return values[self._start:] + values[:end - self.capacity]
+
+    def numpy_column(self, name: str):
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("numpy is required for numpy_column") from e
+        return np.frombuffer(self.column(name), dtype=self.COLUMNS[name])
+
+    def _allocate(self) -> None:
+        self._items = []
+        self._errors = {}
+        self._rtts = {}
+        self._columns = {
+            name: array(code, bytes(array(code).itemsize * self.capacity))
+            for name, code in self.COLUMNS.items()
+        }
+
+    def _write(self, slot: int, metrics: PingMetrics) -> None:
+        columns = self._columns
+        columns["timestamp"][slot] = metrics.timestamp.timestamp()
+        columns["average_latency"][slot] = metrics.average_latency
+        columns["jitter"][slot] = metrics.jitter
+        columns["packet_count"][slot] = metrics.packet_count
+        columns["success_count"][slot] = metrics.success_count
+        columns["target_id"][slot] = self.strings.intern(metrics.target)
+        analysis = metrics.analysis
+        for name in RttAnalysis._fields:
+            columns[name][slot] = getattr(analysis, name) if analysis is not None else 0
+        if metrics.error_message is not None:
+            self._errors[slot] = metrics.error_message
+        if metrics.rtts is not None:
+            self._rtts[slot] = metrics.rtts
+
+    def _read(self, slot: int) -> PingMetrics:
+        columns = self._columns
+        analysis = None
+        if columns["received"][slot]:
+            analysis = RttAnalysis(*(columns[name][slot] for name in RttAnalysis._fields))
+        return PingMetrics(
+            timestamp=columns["timestamp"][slot],
+            target=self.strings.lookup(columns["target_id"][slot]),
+            average_latency=columns["average_latency"][slot],
+            jitter=columns["jitter"][slot],
+            packet_count=columns["packet_count"][slot],
+            success_count=columns["success_count"][slot],
+            error_message=self._errors.get(slot),
+            rtts=self._rtts.get(slot),
+            analysis=analysis
+        )
+
+    def _clear(self, slot: int) -> None:
+        self._errors.pop(slot, None)
+        self._rtts.pop(slot, None)
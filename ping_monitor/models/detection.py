@@ -0,0 +1,394 @@
+"""Streaming change-point and anomaly detection over per-target series.
+
+Detectors keep a few floats of state per target in flat ``array('d')``
+columns indexed by a target slot, so memory is O(1) per target. Samples
+are fed one at a time with ``update`` or for many targets at once with
+``update_many``, which is vectorised with NumPy when it is installed
+(``poetry install -E analysis``).
+"""
+import math
+from abc import ABC, abstractmethod
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, ClassVar, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ping_monitor.models.exceptions import ConfigurationError
+from ping_monitor.models.metrics import PingMetrics
+from ping_monitor.utils.optional import optional_numpy
+
+Alarm = Optional[Tuple[float, float]]
+
+
+@dataclass(frozen=True)
+class Anomaly:
+    target: str
+    timestamp: datetime
+    metric: str
+    detector: str
+    value: float
+    expected: float
+    score: float
+
+    def __str__(self) -> str:
+        return (
+            f"[{self.target}] {self.detector} anomaly in {self.metric}: "
+            f"{self.value:.2f} (expected {self.expected:.2f}, score {self.score:.2f})"
+        )
+
+
+@dataclass
+class Detector(ABC):
+    """Base class: per-slot state columns named in ``STATE``.
+
+    ``update`` returns ``(expected, score)`` when the value raises an
+    alarm and None otherwise.
+    """
+
+    NAME: ClassVar[str] = ""
+    STATE: ClassVar[Tuple[str, ...]] = ()
+
+    threshold: float = 0.0
+    warmup: int = 10
+
+    _columns: Dict[str, array] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._columns = {name: array("d") for name in self.STATE}
+
+    def reset(self, slot: int) -> None:
+        for column in self._columns.values():
+            if slot < len(column):
+                column[slot] = 0.0
+
+    def update(self, slot: int, value: float) -> Alarm:
+        self._reserve(slot + 1)
+        return self._update(self._columns, slot, value)
+
+    def update_many(self, slots: Sequence[int], values: Sequence[float]) -> List[Alarm]:
+        """Update distinct ``slots`` with one value each."""
+        if not len(slots):
+            return []
+        self._reserve(max(slots) + 1)
+        np = optional_numpy()
+        if np is None:
+            return [self._update(self._columns, s, v) for s, v in zip(slots, values)]
+
+        columns = {n: np.frombuffer(c, dtype=np.float64) for n, c in self._columns.items()}
+        alarms, expected, scores = self._update_numpy(
+            np,
+            columns, np.asarray(slots, dtype=np.intp), np.asarray(values, dtype=np.float64)
+        )
+        del columns  # release the buffer exports so the arrays can grow again
+        return [
+            (float(e), float(s)) if alarm else None
+            for alarm, e, s in zip(alarms.tolist(), expected.tolist(), scores.tolist())
+        ]
+
+    def _reserve(self, slots: int) -> None:
+        for column in self._columns.values():
+            if len(column) < slots:
+                column.frombytes(bytes(column.itemsize * (slots - len(column))))
+
+    @abstractmethod
+    def _update(self, c: Dict[str, array], slot: int, x: float) -> Alarm:
+        """Scalar step for one slot."""
+
+    @abstractmethod
+    def _update_numpy(self, np, c, slots, x):
+        """Vectorised step: ``(alarms, expected, scores)`` arrays for distinct ``slots``."""
+
+
+@dataclass
+class EwmaDetector(Detector):
+    """Flags values more than ``threshold`` EW standard deviations from the EW mean."""
+
+    NAME: ClassVar[str] = "ewma"
+    STATE: ClassVar[Tuple[str, ...]] = ("count", "mean", "var")
+
+    threshold: float = 4.0
+    alpha: float = 0.1
+    min_std: float = 0.5
+
+    def _update(self, c, slot, x):
+        n, mean, var = c["count"][slot], c["mean"][slot], c["var"][slot]
+        c["count"][slot] = n + 1
+        if not n:
+            c["mean"][slot] = x
+            return None
+        diff = x - mean
+        score = abs(diff) / max(math.sqrt(var), self.min_std)
+        increment = self.alpha * diff
+        c["mean"][slot] = mean + increment
+        c["var"][slot] = (1 - self.alpha) * (var + diff * increment)
+        if n >= self.warmup and score > self.threshold:
+            return mean, score
+        return None
+
+    def _update_numpy(self, np, c, slots, x):
+        n, mean, var = c["count"][slots], c["mean"][slots], c["var"][slots]
+        first = n == 0
+        diff = np.where(first, 0.0, x - mean)
+        score = np.abs(diff) / np.maximum(np.sqrt(var), self.min_std)
+        increment = self.alpha * diff
+        c["count"][slots] = n + 1
+        c["mean"][slots] = np.where(first, x, mean + increment)
+        c["var"][slots] = (1 - self.alpha) * (var + diff * increment)
+        return (n >= self.warmup) & (score > self.threshold), mean, score
+
+
+@dataclass
+class CusumDetector(Detector):
+    """One-sided CUSUM of standardised increases over a slow EW baseline.
+
+    Catches slow degradation: small but persistent increases accumulate
+    until the sum exceeds ``threshold`` standard deviations. ``drift`` is
+    the allowance (in standard deviations) subtracted per sample.
+    """
+
+    NAME: ClassVar[str] = "cusum"
+    STATE: ClassVar[Tuple[str, ...]] = ("count", "mean", "var", "sum")
+
+    threshold: float = 8.0
+    drift: float = 0.5
+    alpha: float = 0.02
+    min_std: float = 0.5
+
+    def _update(self, c, slot, x):
+        n, mean, var = c["count"][slot], c["mean"][slot], c["var"][slot]
+        c["count"][slot] = n + 1
+        if not n:
+            c["mean"][slot] = x
+            return None
+        diff = x - mean
+        total = max(0.0, c["sum"][slot] + diff / max(math.sqrt(var), self.min_std) - self.drift)
+        if n < self.warmup:
+            total = 0.0
+        increment = self.alpha * diff
+        c["mean"][slot] = mean + increment
+        c["var"][slot] = (1 - self.alpha) * (var + diff * increment)
+        alarm = total > self.threshold
+        c["sum"][slot] = 0.0 if alarm else total
+        return (mean, total) if alarm else None
+
+    def _update_numpy(self, np, c, slots, x):
+        n, mean, var = c["count"][slots], c["mean"][slots], c["var"][slots]
+        first = n == 0
+        diff = np.where(first, 0.0, x - mean)
+        total = np.maximum(
+            0.0, c["sum"][slots] + diff / np.maximum(np.sqrt(var), self.min_std) - self.drift
+        )
+        total = np.where(n < self.warmup, 0.0, total)
+        increment = self.alpha * diff
+        c["count"][slots] = n + 1
+        c["mean"][slots] = np.where(first, x, mean + increment)
+        c["var"][slots] = (1 - self.alpha) * (var + diff * increment)
+        alarms = total > self.threshold
+        c["sum"][slots] = np.where(alarms, 0.0, total)
+        return alarms, mean, total
+
+
+@dataclass
+class PageHinkleyDetector(Detector):
+    """Page-Hinkley test for an upward shift of the mean.
+
+    ``delta`` is the tolerated change and ``threshold`` the alarm level,
+    both in the units of the series. State restarts after an alarm so
+    the new level becomes the baseline.
+    """
+
+    NAME: ClassVar[str] = "page_hinkley"
+    STATE: ClassVar[Tuple[str, ...]] = ("count", "mean", "sum", "minimum")
+
+    threshold: float = 50.0
+    delta: float = 1.0
+
+    def _update(self, c, slot, x):
+        n = c["count"][slot] + 1
+        mean = c["mean"][slot] + (x - c["mean"][slot]) / n
+        total = c["sum"][slot] + x - mean - self.delta
+        minimum = min(c["minimum"][slot], total)
+        score = total - minimum
+        if n > self.warmup and score > self.threshold:
+            for name in self.STATE:
+                c[name][slot] = 0.0
+            return mean, score
+        c["count"][slot], c["mean"][slot] = n, mean
+        c["sum"][slot], c["minimum"][slot] = total, minimum
+        return None
+
+    def _update_numpy(self, np, c, slots, x):
+        n = c["count"][slots] + 1
+        mean = c["mean"][slots] + (x - c["mean"][slots]) / n
+        total = c["sum"][slots] + x - mean - self.delta
+        minimum = np.minimum(c["minimum"][slots], total)
+        score = total - minimum
+        alarms = (n > self.warmup) & (score > self.threshold)
+        keep = ~alarms
+        c["count"][slots] = n * keep
+        c["mean"][slots] = mean * keep
+        c["sum"][slots] = total * keep
+        c["minimum"][slots] = minimum * keep
+        return alarms, mean, score
+
+
+DETECTORS: Dict[str, Callable[..., Detector]] = {
+    cls.NAME: cls for cls in (EwmaDetector, CusumDetector, PageHinkleyDetector)
+}
+
+
+def create_detector(spec: str) -> Detector:
+    """Build a detector from ``name`` or ``name:threshold``."""
+    name, _, threshold = spec.partition(":")
+    factory = DETECTORS.get(name)
+    if factory is None:
+        raise ConfigurationError(
+            f"Unknown detector {name!r}, expected one of {', '.join(DETECTORS)}"
+        )
+    try:
+        return factory(threshold=float(threshold)) if threshold else factory()
+    except ValueError:
+        raise ConfigurationError(f"Invalid detector threshold in {spec!r}") from None
+
+
+def _latency(metrics: PingMetrics) -> Optional[float]:
+    return metrics.average_latency if metrics.success else None
+
+
+def _jitter(metrics: PingMetrics) -> Optional[float]:
+    return metrics.jitter if metrics.success else None
+
+
+def _loss(metrics: PingMetrics) -> Optional[float]:
+    return metrics.packet_loss
+
+
+SERIES: Dict[str, Callable[[PingMetrics], Optional[float]]] = {
+    "latency": _latency,
+    "jitter": _jitter,
+    "loss": _loss,
+}
+
+
+@dataclass
+class DetectionStage:
+    """Runs a set of detectors over each target's latency, jitter and loss.
+
+    Every series gets its own instances built from ``specs``; subscribers
+    are called with each Anomaly as it is found.
+    """
+
+    specs: Tuple[str, ...] = ("cusum",)
+    series: Tuple[str, ...] = tuple(SERIES)
+
+    _detectors: Dict[str, List[Detector]] = field(default_factory=dict, init=False)
+    _slots: Dict[str, int] = field(default_factory=dict, init=False)
+    _free: List[int] = field(default_factory=list, init=False)
+    _subscribers: List[Callable[[Anomaly], None]] = field(default_factory=list, init=False)
+
+    def __post_init__(self) -> None:
+        unknown = set(self.series) - set(SERIES)
+        if unknown:
+            raise ConfigurationError(f"Unknown series: {', '.join(sorted(unknown))}")
+        self._detectors = {
+            name: [create_detector(spec) for spec in self.specs] for name in self.series
+        }
+
+    def subscribe(self, callback: Callable[[Anomaly], None]) -> Callable[[], None]:
+        """Call ``callback`` for every anomaly; returns a function that unsubscribes."""
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def evaluate(self, metrics: PingMetrics, emit: bool = True) -> List[Anomaly]:
+        slot = self._slot(metrics.target)
+        anomalies = []
+        for name, detectors in self._detectors.items():
+            value = SERIES[name](metrics)
+            if value is None:
+                continue
+            for detector in detectors:
+                alarm = detector.update(slot, value)
+                if alarm is not None:
+                    anomalies.append(self._anomaly(metrics, name, detector, value, alarm))
+        if emit:
+            self._emit(anomalies)
+        return anomalies
+
+    def evaluate_many(self, samples: Iterable[PingMetrics], emit: bool = True) -> List[Anomaly]:
+        """Evaluate a batch, vectorised across targets.
+
+        Samples are processed in rounds holding at most one sample per
+        target, preserving each target's order.
+        """
+        anomalies = []
+        for batch in self._rounds(samples):
+            slots = [self._slot(m.target) for m in batch]
+            for name, detectors in self._detectors.items():
+                extract = SERIES[name]
+                present = [(s, m, v) for s, m in zip(slots, batch)
+                           if (v := extract(m)) is not None]
+                if not present:
+                    continue
+                indices = [s for s, _, _ in present]
+                values = [v for _, _, v in present]
+                for detector in detectors:
+                    for (_, metrics, value), alarm in zip(
+                            present, detector.update_many(indices, values)):
+                        if alarm is not None:
+                            anomalies.append(
+                                self._anomaly(metrics, name, detector, value, alarm)
+                            )
+        if emit:
+            self._emit(anomalies)
+        return anomalies
+
+    def forget(self, target: str) -> None:
+        slot = self._slots.pop(target, None)
+        if slot is None:
+            return
+        for detectors in self._detectors.values():
+            for detector in detectors:
+                detector.reset(slot)
+        self._free.append(slot)
+
+    def _slot(self, target: str) -> int:
+        slot = self._slots.get(target)
+        if slot is None:
+            slot = self._slots[target] = self._free.pop() if self._free else len(self._slots)
+        return slot
+
+    def _emit(self, anomalies: List[Anomaly]) -> None:
+        for anomaly in anomalies:
+            for callback in tuple(self._subscribers):
+                callback(anomaly)
+
+    @staticmethod
+    def _rounds(samples: Iterable[PingMetrics]) -> List[List[PingMetrics]]:
+        rounds: List[List[PingMetrics]] = []
+        seen: Dict[str, int] = {}
+        for metrics in samples:
+            index = seen.get(metrics.target, -1) + 1
+            seen[metrics.target] = index
+            if index == len(rounds):
+                rounds.append([])
+            rounds[index].append(metrics)
+        return rounds
+
+    @staticmethod
+    def _anomaly(
+            metrics: PingMetrics,
+            series: str,
+            detector: Detector,
+            value: float,
+            alarm: Tuple[float, float]
+    ) -> Anomaly:
+        expected, score = alarm
+        return Anomaly(
+            target=metrics.target,
+            timestamp=metrics.timestamp,
+            metric=series,
+            detector=detector.NAME,
+            value=value,
+            expected=expected,
+            score=score
+        )
@@ -12,3 +12,7 @@ class ExecutionError(PingMonitorError):
 
 class ValidationError(PingMonitorError):
     """Raised when input validation fails."""
+
+
+class ProtocolError(PingMonitorError):
+    """Raised when an agent or aggregator peer sends an invalid frame."""
@@ -0,0 +1,117 @@
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, List, Optional, Tuple, Union, overload
+
+from ping_monitor.models.metrics import PingMetrics
+
+
+@dataclass
+class MetricHistory:
+    """Fixed-capacity, time-windowed ring buffer of samples for one target.
+
+    Appending overwrites the oldest sample once ``capacity`` is reached and
+    samples older than ``window`` are evicted from the front, both in O(1)
+    per sample. ``on_evict`` is called for every sample that leaves the
+    buffer.
+    """
+
+    capacity: int
+    window: timedelta
+    on_evict: Optional[Callable[[PingMetrics], None]] = None
+
+    _items: List[Optional[PingMetrics]] = field(default_factory=list, init=False)
+    _start: int = field(default=0, init=False)
+    _size: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        if self.capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._allocate()
+
+    def append(self, metrics: PingMetrics) -> None:
+        if self._size == self.capacity:
+            self._evict()
+        self._write((self._start + self._size) % self.capacity, metrics)
+        self._size += 1
+        self.trim(metrics.timestamp)
+
+    def trim(self, now: Optional[datetime] = None) -> None:
+        cutoff = (now or datetime.now()) - self.window
+        while self._size and self._items[self._start].timestamp <= cutoff:
+            self._evict()
+
+    def view(self) -> "HistoryView":
+        return HistoryView((self,))
+
+    def _allocate(self) -> None:
+        self._items = [None] * self.capacity
+
+    def _write(self, slot: int, metrics: PingMetrics) -> None:
+        self._items[slot] = metrics
+
+    def _read(self, slot: int) -> PingMetrics:
+        return self._items[slot]
+
+    def _clear(self, slot: int) -> None:
+        self._items[slot] = None
+
+    def _evict(self) -> None:
+        slot = self._start
+        if self.on_evict is not None:
+            self.on_evict(self._read(slot))
+        self._clear(slot)
+        self._start = (slot + 1) % self.capacity
+        self._size -= 1
+
+    def _get(self, index: int) -> PingMetrics:
+        return self._read((self._start + index) % self.capacity)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[PingMetrics]:
+        for index in range(self._size):
+            yield self._get(index)
+
+
+class HistoryView(Sequence):
+    """Read-only, non-copying view over one or more history buffers.
+
+    The view is live: it reflects appends and evictions made after it was
+    created. Samples are grouped by buffer, oldest first within each.
+    """
+
+    __slots__ = ("_buffers",)
+
+    def __init__(self, buffers: Tuple[MetricHistory, ...]) -> None:
+        self._buffers = buffers
+
+    def __len__(self) -> int:
+        return sum(len(b) for b in self._buffers)
+
+    def __iter__(self) -> Iterator[PingMetrics]:
+        for buffer in self._buffers:
+            yield from buffer
+
+    @overload
+    def __getitem__(self, index: int) -> PingMetrics: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[PingMetrics]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[PingMetrics, List[PingMetrics]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if index >= 0:
+            for buffer in self._buffers:
+                if index < len(buffer):
+                    return buffer._get(index)
+                index -= len(buffer)
+        raise IndexError("history index out of range")
+
+    def __repr__(self) -> str:
+        return f"HistoryView({list(self)!r})"
@@ -1,7 +1,10 @@
-from dataclasses import dataclass
+from array import array
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
+from ping_monitor.models.analysis import RttAnalysis
+
 
 @dataclass(frozen=True)
 class PingMetrics:
@@ -12,6 +15,8 @@ class PingMetrics:
     packet_count: int
     success_count: int
     error_message: Optional[str] = None
+    rtts: Optional[array] = field(default=None, repr=False, hash=False)
+    analysis: Optional[RttAnalysis] = None
 
     SUCCESS_THRESHOLD: int = 2
 
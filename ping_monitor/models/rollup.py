@@ -0,0 +1,199 @@
+import math
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import ClassVar, Deque, Iterable, List, Optional, Tuple, Union
+
+from ping_monitor.models.metrics import PingMetrics
+from ping_monitor.models.sketch import LatencySketch
+from ping_monitor.models.stats import summarize
+
+
+@dataclass
+class Rollup:
+    """Aggregate of all samples of one target within one time bucket."""
+
+    start: datetime
+    count: int = 0
+    successful: int = 0
+    packets_sent: int = 0
+    packets_received: int = 0
+    latency_sum: float = 0.0
+    jitter_sum: float = 0.0
+    min_latency: float = math.inf
+    max_latency: float = -math.inf
+    max_jitter: float = 0.0
+    sketch: LatencySketch = field(default_factory=LatencySketch)
+
+    def add(self, metrics: PingMetrics) -> None:
+        self.count += 1
+        self.packets_sent += metrics.packet_count
+        self.packets_received += metrics.success_count
+        if not metrics.success:
+            return
+
+        self.successful += 1
+        self.latency_sum += metrics.average_latency
+        self.jitter_sum += metrics.jitter
+        self.min_latency = min(self.min_latency, metrics.average_latency)
+        self.max_latency = max(self.max_latency, metrics.average_latency)
+        self.max_jitter = max(self.max_jitter, metrics.jitter)
+        self.sketch.add(metrics.average_latency)
+
+    def merge(self, other: "Rollup") -> None:
+        self.start = min(self.start, other.start)
+        self.count += other.count
+        self.successful += other.successful
+        self.packets_sent += other.packets_sent
+        self.packets_received += other.packets_received
+        self.latency_sum += other.latency_sum
+        self.jitter_sum += other.jitter_sum
+        self.min_latency = min(self.min_latency, other.min_latency)
+        self.max_latency = max(self.max_latency, other.max_latency)
+        self.max_jitter = max(self.max_jitter, other.max_jitter)
+        self.sketch.merge(other.sketch)
+
+    def as_dict(self) -> dict:
+        return summarize((self,))
+
+
+@dataclass
+class RollupSeries:
+    """Fixed-resolution rollups of one target kept for ``retention``.
+
+    Buckets are rows of two flat arrays rather than one object each, so a
+    month of rollups costs tens of kilobytes. Only a series built with
+    ``sketches`` keeps a latency sketch per bucket, packed once the bucket
+    is closed.
+    """
+
+    resolution: timedelta
+    retention: timedelta
+    sketches: bool = False
+
+    # start, count, successful, packets_sent, packets_received
+    _counts: array = field(default_factory=lambda: array("q"), init=False)
+    # latency_sum, jitter_sum, min_latency, max_latency, max_jitter
+    _latencies: array = field(default_factory=lambda: array("d"), init=False)
+    _sketches: Deque[Union[LatencySketch, array]] = field(default_factory=deque, init=False)
+
+    WIDTH: ClassVar[int] = 5
+
+    def __len__(self) -> int:
+        return len(self._counts) // self.WIDTH
+
+    def add(self, metrics: PingMetrics) -> None:
+        start = self._bucket_start(metrics.timestamp)
+        if not self._counts or self._counts[-self.WIDTH] < start:
+            self._open(start)
+
+        counts, latencies = self._counts, self._latencies
+        row = len(counts) - self.WIDTH
+        counts[row + 1] += 1
+        counts[row + 3] += metrics.packet_count
+        counts[row + 4] += metrics.success_count
+        if metrics.success:
+            counts[row + 2] += 1
+            latencies[row] += metrics.average_latency
+            latencies[row + 1] += metrics.jitter
+            latencies[row + 2] = min(latencies[row + 2], metrics.average_latency)
+            latencies[row + 3] = max(latencies[row + 3], metrics.average_latency)
+            latencies[row + 4] = max(latencies[row + 4], metrics.jitter)
+            if self.sketches:
+                self._sketches[-1].add(metrics.average_latency)
+        self.trim(metrics.timestamp)
+
+    def trim(self, now: Optional[datetime] = None) -> None:
+        cutoff = ((now or datetime.now()) - self.retention).timestamp()
+        seconds = self.resolution.total_seconds()
+        expired = 0
+        while expired < len(self) and self._counts[expired * self.WIDTH] + seconds <= cutoff:
+            expired += 1
+        if expired:
+            del self._counts[:expired * self.WIDTH]
+            del self._latencies[:expired * self.WIDTH]
+            for _ in range(min(expired, len(self._sketches))):
+                self._sketches.popleft()
+
+    def buckets(self, since: Optional[datetime] = None) -> List[Rollup]:
+        seconds = self.resolution.total_seconds()
+        after = since.timestamp() - seconds if since is not None else None
+        result = []
+        for index in range(len(self)):
+            row = index * self.WIDTH
+            start = self._counts[row]
+            if after is not None and start <= after:
+                continue
+            rollup = Rollup(
+                datetime.fromtimestamp(start),
+                *self._counts[row + 1:row + self.WIDTH],
+                *self._latencies[row:row + self.WIDTH]
+            )
+            if self.sketches:
+                sketch = self._sketches[index]
+                rollup.sketch = LatencySketch.unpack(
+                    sketch.pack() if isinstance(sketch, LatencySketch) else sketch
+                )
+            result.append(rollup)
+        return result
+
+    def _open(self, start: int) -> None:
+        self._counts.extend((start, 0, 0, 0, 0))
+        self._latencies.extend((0.0, 0.0, math.inf, -math.inf, 0.0))
+        if self.sketches:
+            if self._sketches:
+                self._sketches[-1] = self._sketches[-1].pack()
+            self._sketches.append(LatencySketch())
+
+    def _bucket_start(self, timestamp: datetime) -> int:
+        seconds = self.resolution.total_seconds()
+        return int(timestamp.timestamp() // seconds * seconds)
+
+
+@dataclass
+class MultiResolutionRollup:
+    """Downsamples one target's samples into 1m, 5m and 1h rollups.
+
+    Only the hourly series keeps latency sketches; percentiles over the
+    raw window come from the monitor's SketchWindow instead.
+    """
+
+    series: Tuple[RollupSeries, ...] = field(default_factory=lambda: tuple(
+        RollupSeries(resolution, retention, sketches=index == MultiResolutionRollup.SKETCH_SERIES)
+        for index, (resolution, retention) in enumerate(MultiResolutionRollup.RESOLUTIONS)
+    ))
+
+    RESOLUTIONS: ClassVar[Tuple[Tuple[timedelta, timedelta], ...]] = (
+        (timedelta(minutes=1), timedelta(hours=6)),
+        (timedelta(minutes=5), timedelta(days=2)),
+        (timedelta(hours=1), timedelta(days=30)),
+    )
+    SKETCH_SERIES: ClassVar[int] = 2
+    MIN_BUCKETS: ClassVar[int] = 10
+
+    def add(self, metrics: PingMetrics) -> None:
+        for series in self.series:
+            series.add(metrics)
+
+    @classmethod
+    def resolution_for(cls, duration: timedelta) -> Optional[int]:
+        """Index of the coarsest series spanning ``duration`` with MIN_BUCKETS buckets.
+
+        Returns None when the range is too short for any rollup, in which
+        case raw samples should answer it.
+        """
+        for index in reversed(range(len(cls.RESOLUTIONS))):
+            resolution, retention = cls.RESOLUTIONS[index]
+            if retention >= duration and resolution * cls.MIN_BUCKETS <= duration:
+                return index
+        if duration > cls.RESOLUTIONS[-1][1]:
+            return len(cls.RESOLUTIONS) - 1
+        return None
+
+
+def combine(buckets: Iterable[Rollup], start: datetime) -> Rollup:
+    result = Rollup(start)
+    for bucket in buckets:
+        result.merge(bucket)
+    return result
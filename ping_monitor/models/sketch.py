@@ -0,0 +1,161 @@
+import math
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import ClassVar, Deque, Dict, Iterable, Optional, Tuple
+
+
+@dataclass
+class LatencySketch:
+    """Mergeable streaming quantile sketch (DDSketch).
+
+    Values are counted in logarithmic buckets so every quantile estimate is
+    within ``relative_accuracy`` of the true value. Sketches with the same
+    accuracy can be merged, which makes per-target and per-bucket sketches
+    cheap to combine into fleet-wide percentiles.
+    """
+
+    relative_accuracy: float = 0.01
+    max_buckets: int = 2048
+
+    count: int = field(default=0, init=False)
+    zero_count: int = field(default=0, init=False)
+    _bins: Dict[int, int] = field(default_factory=dict, init=False)
+    _gamma: float = field(default=0.0, init=False, repr=False)
+    _log_gamma: float = field(default=0.0, init=False, repr=False)
+
+    MIN_VALUE: ClassVar[float] = 1e-9
+
+    def __post_init__(self) -> None:
+        if not 0.0 < self.relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self._gamma = (1 + self.relative_accuracy) / (1 - self.relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+    def add(self, value: float, weight: int = 1) -> None:
+        self.count += weight
+        if value <= self.MIN_VALUE:
+            self.zero_count += weight
+            return
+
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self._bins[key] = self._bins.get(key, 0) + weight
+        if len(self._bins) > self.max_buckets:
+            self._collapse()
+
+    def merge(self, other: "LatencySketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        self.count += other.count
+        self.zero_count += other.zero_count
+        for key, weight in other._bins.items():
+            self._bins[key] = self._bins.get(key, 0) + weight
+        if len(self._bins) > self.max_buckets:
+            self._collapse()
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("quantile must be between 0 and 1")
+        if not self.count:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self._bins):
+            seen += self._bins[key]
+            if rank < seen:
+                return 2 * self._gamma ** key / (self._gamma + 1)
+        return 2 * self._gamma ** max(self._bins) / (self._gamma + 1)
+
+    def quantiles(self, qs: Iterable[float]) -> Dict[float, Optional[float]]:
+        return {q: self.quantile(q) for q in qs}
+
+    def to_dict(self) -> dict:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_buckets": self.max_buckets,
+            "zero_count": self.zero_count,
+            "bins": [[key, weight] for key, weight in sorted(self._bins.items())]
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencySketch":
+        sketch = cls(data["relative_accuracy"], data["max_buckets"])
+        sketch.zero_count = data["zero_count"]
+        sketch._bins = {int(key): int(weight) for key, weight in data["bins"]}
+        sketch.count = sketch.zero_count + sum(sketch._bins.values())
+        return sketch
+
+    def pack(self) -> array:
+        """Bins as one flat ``[zero_count, key, weight, key, weight, ...]`` array.
+
+        A fraction of the size of the dict, for sketches that are only read
+        again; ``unpack`` restores them with the default settings.
+        """
+        packed = array("q", [self.zero_count])
+        for key, weight in self._bins.items():
+            packed.append(key)
+            packed.append(weight)
+        return packed
+
+    @classmethod
+    def unpack(cls, packed: array) -> "LatencySketch":
+        sketch = cls()
+        sketch.zero_count = packed[0]
+        sketch._bins = dict(zip(packed[1::2], packed[2::2]))
+        sketch.count = sketch.zero_count + sum(sketch._bins.values())
+        return sketch
+
+    @classmethod
+    def merged(cls, sketches: Iterable["LatencySketch"], relative_accuracy: float = 0.01) -> "LatencySketch":
+        result = cls(relative_accuracy)
+        for sketch in sketches:
+            result.merge(sketch)
+        return result
+
+    def _collapse(self) -> None:
+        keys = sorted(self._bins)
+        excess = len(keys) - self.max_buckets
+        folded = sum(self._bins.pop(key) for key in keys[:excess + 1])
+        self._bins[keys[excess]] = folded
+
+
+@dataclass
+class SketchWindow:
+    """Time-bucketed sketches covering a sliding window.
+
+    Each bucket holds one sketch; buckets older than ``window`` are dropped
+    whole, so memory is bounded by the bucket count rather than the sample
+    count.
+    """
+
+    bucket: timedelta = timedelta(minutes=1)
+    window: timedelta = timedelta(hours=1)
+    relative_accuracy: float = 0.01
+
+    _buckets: Deque[Tuple[datetime, LatencySketch]] = field(default_factory=deque, init=False)
+
+    def add(self, timestamp: datetime, value: float) -> None:
+        start = self._bucket_start(timestamp)
+        if not self._buckets or self._buckets[-1][0] < start:
+            self._buckets.append((start, LatencySketch(self.relative_accuracy)))
+        self._buckets[-1][1].add(value)
+        self.trim(timestamp)
+
+    def trim(self, now: Optional[datetime] = None) -> None:
+        cutoff = (now or datetime.now()) - self.window
+        while self._buckets and self._buckets[0][0] + self.bucket <= cutoff:
+            self._buckets.popleft()
+
+    def sketch(self, since: Optional[datetime] = None) -> LatencySketch:
+        return LatencySketch.merged(
+            (s for start, s in self._buckets if since is None or start + self.bucket > since),
+            self.relative_accuracy
+        )
+
+    def _bucket_start(self, timestamp: datetime) -> datetime:
+        seconds = self.bucket.total_seconds()
+        return datetime.fromtimestamp(timestamp.timestamp() // seconds * seconds)
@@ -0,0 +1,183 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Iterable, Tuple, Union
+
+from ping_monitor.models.metrics import PingMetrics
+
+
+@dataclass
+class _Extremum:
+    """Monotonic deque tracking the min or max of a FIFO window."""
+
+    maximum: bool
+    _values: Deque[Tuple[int, float]] = field(default_factory=deque, init=False)
+
+    def push(self, index: int, value: float) -> None:
+        values = self._values
+        if self.maximum:
+            while values and values[-1][1] <= value:
+                values.pop()
+        else:
+            while values and values[-1][1] >= value:
+                values.pop()
+        values.append((index, value))
+
+    def expire(self, index: int) -> None:
+        if self._values and self._values[0][0] == index:
+            self._values.popleft()
+
+    @property
+    def value(self) -> float:
+        return self._values[0][1]
+
+
+@dataclass
+class RunningStats:
+    """Aggregates of a sample window, updated on append and eviction.
+
+    Samples must be removed in the order they were added, which is what
+    the history ring buffers do. Every update and read is O(1) amortised.
+    """
+
+    count: int = 0
+    successful: int = 0
+    packets_sent: int = 0
+    packets_received: int = 0
+    latency_sum: float = 0.0
+    jitter_sum: float = 0.0
+
+    _added: int = field(default=0, init=False)
+    _removed: int = field(default=0, init=False)
+    _min_latency: _Extremum = field(default_factory=lambda: _Extremum(False), init=False)
+    _max_latency: _Extremum = field(default_factory=lambda: _Extremum(True), init=False)
+    _max_jitter: _Extremum = field(default_factory=lambda: _Extremum(True), init=False)
+
+    def add(self, metrics: PingMetrics) -> None:
+        self.count += 1
+        self.packets_sent += metrics.packet_count
+        self.packets_received += metrics.success_count
+        if not metrics.success:
+            return
+
+        self.successful += 1
+        self.latency_sum += metrics.average_latency
+        self.jitter_sum += metrics.jitter
+        self._min_latency.push(self._added, metrics.average_latency)
+        self._max_latency.push(self._added, metrics.average_latency)
+        self._max_jitter.push(self._added, metrics.jitter)
+        self._added += 1
+
+    def remove(self, metrics: PingMetrics) -> None:
+        self.count -= 1
+        self.packets_sent -= metrics.packet_count
+        self.packets_received -= metrics.success_count
+        if not metrics.success:
+            return
+
+        self.successful -= 1
+        if self.successful:
+            self.latency_sum -= metrics.average_latency
+            self.jitter_sum -= metrics.jitter
+        else:
+            self.latency_sum = self.jitter_sum = 0.0
+        for extremum in (self._min_latency, self._max_latency, self._max_jitter):
+            extremum.expire(self._removed)
+        self._removed += 1
+
+    @property
+    def min_latency(self) -> float:
+        return self._min_latency.value
+
+    @property
+    def max_latency(self) -> float:
+        return self._max_latency.value
+
+    @property
+    def max_jitter(self) -> float:
+        return self._max_jitter.value
+
+    def as_dict(self) -> dict:
+        return summarize((self,))
+
+
+@dataclass(frozen=True)
+class StatsSnapshot:
+    """Frozen copy of a RunningStats' aggregates, accepted by summarize().
+
+    Snapshots are what crosses process boundaries; merging them is the
+    same as merging the windows they were taken from.
+    """
+
+    count: int = 0
+    successful: int = 0
+    packets_sent: int = 0
+    packets_received: int = 0
+    latency_sum: float = 0.0
+    jitter_sum: float = 0.0
+    min_latency: float = 0.0
+    max_latency: float = 0.0
+    max_jitter: float = 0.0
+
+    @classmethod
+    def of(cls, stats: RunningStats) -> "StatsSnapshot":
+        extremes = (
+            (stats.min_latency, stats.max_latency, stats.max_jitter)
+            if stats.successful else (0.0, 0.0, 0.0)
+        )
+        return cls(
+            stats.count,
+            stats.successful,
+            stats.packets_sent,
+            stats.packets_received,
+            stats.latency_sum,
+            stats.jitter_sum,
+            *extremes
+        )
+
+
+def summarize(stats: Iterable[Union[RunningStats, StatsSnapshot]]) -> dict:
+    stats = [s for s in stats if s.count]
+    count = sum(s.count for s in stats)
+    if not count:
+        return {}
+
+    successful = [s for s in stats if s.successful]
+    if not successful:
+        return {"error": "No successful measurements"}
+
+    success_count = sum(s.successful for s in successful)
+    sent = sum(s.packets_sent for s in stats)
+    received = sum(s.packets_received for s in stats)
+    return {
+        "min_latency": min(s.min_latency for s in successful),
+        "max_latency": max(s.max_latency for s in successful),
+        "avg_latency": sum(s.latency_sum for s in successful) / success_count,
+        "avg_jitter": sum(s.jitter_sum for s in successful) / success_count,
+        "max_jitter": max(s.max_jitter for s in successful),
+        "packet_loss": (sent - received) / sent * 100 if sent else 0.0,
+        "measurements": count,
+        "successful": success_count,
+        "success_rate": success_count / count * 100
+    }
+
+
+@dataclass
+class TargetCounters:
+    """Monotonic per-target totals since the monitor started.
+
+    ``version`` changes on every sample, so consumers can cache anything
+    derived from a target until it moves.
+    """
+
+    probes: int = 0
+    successes: int = 0
+    packets_sent: int = 0
+    packets_received: int = 0
+    version: int = 0
+
+    def add(self, metrics: PingMetrics) -> None:
+        self.probes += 1
+        self.successes += metrics.success
+        self.packets_sent += metrics.packet_count
+        self.packets_received += metrics.success_count
+        self.version += 1
@@ -1,47 +1,223 @@
-import subprocess
-from dataclasses import dataclass
+import os
+import shutil
+from dataclasses import asdict, dataclass, fields
 from pathlib import Path
-from typing import Optional, ClassVar, List
+from typing import Any, Dict, Optional, ClassVar, List, Tuple
+
+try:
+    import tomllib
+except ImportError:  # pragma: no cover - Python < 3.11
+    import tomli as tomllib
+
+from ping_monitor.models.detection import create_detector
+from ping_monitor.models.exceptions import ConfigurationError
+from ping_monitor.utils.logging import LogConfig
+
+
+@dataclass(frozen=True)
+class ProbeTarget:
+    host: str
+    check_interval: Optional[float] = None
 
 
 @dataclass(frozen=True)
 class MonitorConfig:
-    ping_adv_path: Path
+    ping_adv_path: Optional[Path] = None
     target: str = "8.8.8.8"
     packet_count: int = 10
     interval: float = 1.0
     log_level: str = "INFO"
     log_file: Optional[Path] = None
+    targets: Tuple[ProbeTarget, ...] = ()
+    max_concurrency: int = 64
+    start_jitter: float = 1.0
+    engine: str = "ping_adv"
+    echo_port: int = 7
+    worker_pool_size: int = 0
+    history_capacity: int = 4096
+    history_backend: str = "objects"
+    raw_retention: float = 3600.0
+    store_path: Optional[Path] = None
+    loop_lag_interval: float = 0.5
+    metrics_port: Optional[int] = None
+    metrics_host: str = "127.0.0.1"
+    adaptive: bool = False
+    min_check_interval: float = 10.0
+    max_check_interval: float = 600.0
+    probe_budget: Optional[float] = None
+    detectors: Tuple[str, ...] = ()
+    reload_interval: float = 2.0
 
     SEARCH_PATHS: ClassVar[List[Path]] = [
         Path("/usr/local/bin/ping_adv"),
         Path("/usr/bin/ping_adv"),
         Path("./ping_adv")
     ]
+    PING_ADV_ENV: ClassVar[str] = "PING_ADV_PATH"
+    _ping_adv_cache: ClassVar[Optional[Path]] = None
+    ENGINES: ClassVar[Tuple[str, ...]] = ("ping_adv", "icmp", "udp")
+    HISTORY_BACKENDS: ClassVar[Tuple[str, ...]] = ("objects", "columnar")
+
+    def __post_init__(self) -> None:
+        if self.max_concurrency < 1:
+            raise ConfigurationError("max_concurrency must be at least 1")
+        if not 0.0 <= self.start_jitter <= 1.0:
+            raise ConfigurationError("start_jitter must be between 0.0 and 1.0")
+        if self.history_capacity < 1:
+            raise ConfigurationError("history_capacity must be at least 1")
+        if self.raw_retention <= 0:
+            raise ConfigurationError("raw_retention must be positive")
+        if self.history_backend not in self.HISTORY_BACKENDS:
+            raise ConfigurationError(
+                f"Unknown history backend {self.history_backend!r}, "
+                f"expected one of {', '.join(self.HISTORY_BACKENDS)}"
+            )
+        if self.worker_pool_size < 0:
+            raise ConfigurationError("worker_pool_size must not be negative")
+        if self.metrics_port is not None and not 0 <= self.metrics_port <= 65535:
+            raise ConfigurationError("metrics_port must be between 0 and 65535")
+        if not 0 < self.min_check_interval <= self.max_check_interval:
+            raise ConfigurationError(
+                "min_check_interval must be positive and not above max_check_interval"
+            )
+        if self.reload_interval < 0:
+            raise ConfigurationError("reload_interval must not be negative")
+        if self.probe_budget is not None and self.probe_budget <= 0:
+            raise ConfigurationError("probe_budget must be positive")
+        for spec in self.detectors:
+            create_detector(spec)
+        if self.engine not in self.ENGINES:
+            raise ConfigurationError(
+                f"Unknown engine {self.engine!r}, expected one of {', '.join(self.ENGINES)}"
+            )
+        if self.engine == "ping_adv" and self.ping_adv_path is None:
+            raise ConfigurationError("The ping_adv engine needs ping_adv_path")
 
     @classmethod
     def find_ping_adv(cls) -> Path:
-        try:
-            result = subprocess.run(
-                ["which", "ping_adv"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return Path(result.stdout.strip())
-        except subprocess.SubprocessError:
-            pass
+        """Locate ping_adv once per process: $PING_ADV_PATH, then PATH, then SEARCH_PATHS."""
+        cached = cls._ping_adv_cache
+        if cached is not None and cls._is_executable(cached):
+            return cached
 
-        for path in cls.SEARCH_PATHS:
-            if (path.exists() and
-                    path.is_file() and
-                    path.stat().st_mode & 0o111):
-                return path
+        candidates = [os.environ.get(cls.PING_ADV_ENV), shutil.which("ping_adv")]
+        candidates.extend(cls.SEARCH_PATHS)
+        for candidate in candidates:
+            if candidate and cls._is_executable(Path(candidate)):
+                cls._ping_adv_cache = Path(candidate)
+                return cls._ping_adv_cache
 
         raise FileNotFoundError(
             "ping_adv not found. Ensure it's installed in /usr/local/bin or /usr/bin"
         )
 
+    @staticmethod
+    def _is_executable(path: Path) -> bool:
+        return path.is_file() and bool(path.stat().st_mode & 0o111)
+
+    @property
+    def probe_targets(self) -> Tuple[ProbeTarget, ...]:
+        return self.targets or (ProbeTarget(self.target),)
+
     @classmethod
-    def load(cls):
-        return cls(ping_adv_path=cls.find_ping_adv())
+    def load(cls, path: Optional[Path] = None, **overrides):
+        """Build a config from the TOML file at ``path`` (if any), then ``overrides``."""
+        values = read_config(path)[0] if path is not None else {}
+        values.update(overrides)
+        # The socket engines never run ping_adv, so it need not be installed.
+        if values.get("engine", cls.engine) == "ping_adv" and values.get("ping_adv_path") is None:
+            values["ping_adv_path"] = cls.find_ping_adv()
+        return cls(**values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable field values, the inverse of ``from_dict``."""
+        values = {f.name: getattr(self, f.name) for f in fields(self)}
+        for name in PATH_FIELDS:
+            if values[name] is not None:
+                values[name] = str(values[name])
+        values["targets"] = [asdict(target) for target in self.targets]
+        values["detectors"] = list(self.detectors)
+        return values
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, Any]) -> "MonitorConfig":
+        return cls(**_coerce(dict(values)))
+
+
+PATH_FIELDS: Tuple[str, ...] = ("ping_adv_path", "log_file", "store_path")
+LOGGING_KEYS: Dict[str, str] = {"file": "log_file"}
+
+
+def _target(entry: Any) -> ProbeTarget:
+    if isinstance(entry, str):
+        return ProbeTarget(entry)
+    if isinstance(entry, dict) and "host" in entry:
+        unknown = set(entry) - {"host", "check_interval"}
+        if unknown:
+            raise ConfigurationError(f"Unknown target keys: {', '.join(sorted(unknown))}")
+        return ProbeTarget(**entry)
+    raise ConfigurationError(f"Invalid target entry: {entry!r}")
+
+
+def _coerce(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert plain TOML/JSON values to the field types, in place."""
+    for name in PATH_FIELDS:
+        if values.get(name) is not None:
+            values[name] = Path(values[name])
+    if "targets" in values:
+        values["targets"] = tuple(_target(entry) for entry in values["targets"])
+    if "detectors" in values:
+        values["detectors"] = tuple(values["detectors"])
+    return values
+
+
+def read_config(path: Path) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Parse a TOML config into MonitorConfig and LogConfig keyword arguments.
+
+    ``[monitor]`` takes any MonitorConfig field, ``[logging]`` any LogConfig
+    field (``file`` is an alias of ``log_file``). Targets are listed either
+    as ``targets = ["8.8.8.8", ...]`` in ``[monitor]`` or as ``[[targets]]``
+    tables with ``host`` and an optional ``check_interval``.
+    """
+    try:
+        with open(path, "rb") as f:
+            document = tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        raise ConfigurationError(f"Cannot read config {path}: {e}") from e
+
+    unknown = set(document) - {"monitor", "logging", "targets"}
+    if unknown:
+        raise ConfigurationError(f"Unknown config sections: {', '.join(sorted(unknown))}")
+
+    monitor = dict(document.get("monitor", {}))
+    logging_section = {
+        LOGGING_KEYS.get(key, key): value for key, value in document.get("logging", {}).items()
+    }
+    entries = list(monitor.pop("targets", [])) + list(document.get("targets", []))
+    if entries:
+        monitor["targets"] = entries
+
+    monitor_fields = {f.name for f in fields(MonitorConfig)}
+    log_fields = {f.name for f in fields(LogConfig)}
+    for section, values, known in (
+            ("monitor", monitor, monitor_fields),
+            ("logging", logging_section, log_fields)
+    ):
+        unknown = set(values) - known
+        if unknown:
+            raise ConfigurationError(
+                f"Unknown keys in [{section}]: {', '.join(sorted(unknown))}"
+            )
+        _coerce(values)
+
+    # MonitorConfig carries the log level and file too; keep both in step.
+    for name, alias in (("level", "log_level"), ("log_file", "log_file")):
+        if name in logging_section:
+            monitor.setdefault(alias, logging_section[name])
+    return monitor, logging_section
+
+
+def load_log_config(path: Path, **overrides) -> LogConfig:
+    values = read_config(path)[1]
+    values.update(overrides)
+    return LogConfig(**values)
@@ -1,10 +1,15 @@
+import atexit
 import logging
+import queue
 import sys
 from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
-from rich.logging import RichHandler
+OVERFLOW_POLICIES = ("drop", "drop_oldest", "block")
+
+_listener: Optional["BatchingQueueListener"] = None
 
 
 @dataclass(frozen=True)
@@ -13,31 +18,158 @@ class LogConfig:
     log_file: Optional[Path] = None
     rich_output: bool = True
     format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    queued: bool = True
+    queue_size: int = 10_000
+    batch_size: int = 256
+    overflow: str = "drop"
+
+
+class BoundedQueueHandler(QueueHandler):
+    def __init__(self, log_queue: queue.Queue, overflow: str = "drop") -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting is left to the listener thread; records never leave the process.
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        if self.overflow == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+        self.dropped += 1
+
+
+class BatchStreamHandler(logging.StreamHandler):
+    def flush(self) -> None:
+        pass
+
+    def flush_batch(self) -> None:
+        super().flush()
+
+
+class BatchFileHandler(logging.FileHandler):
+    def flush(self) -> None:
+        pass
+
+    def flush_batch(self) -> None:
+        super().flush()
+
+
+class BatchingQueueListener(QueueListener):
+    def __init__(
+            self,
+            log_queue: queue.Queue,
+            *handlers: logging.Handler,
+            source: BoundedQueueHandler,
+            batch_size: int = 256
+    ) -> None:
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.source = source
+        self.batch_size = batch_size
+        self._reported_drops = 0
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+    def _monitor(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = [self.dequeue(True)]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.dequeue(False))
+                except queue.Empty:
+                    break
+
+            for record in batch:
+                if record is self._sentinel:
+                    stopping = True
+                else:
+                    self.handle(record)
+            self._report_drops()
+            for handler in self.handlers:
+                getattr(handler, "flush_batch", handler.flush)()
+
+    def _report_drops(self) -> None:
+        dropped = self.source.dropped
+        if dropped > self._reported_drops:
+            self.handle(logging.makeLogRecord({
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": "Log queue full, dropped %d records",
+                "args": (dropped - self._reported_drops,),
+            }))
+            self._reported_drops = dropped
+
+
+def stop_logging() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
 
 
 def setup_logging(config: LogConfig) -> None:
+    global _listener
+    stop_logging()
     handlers = []
 
     if config.rich_output:
+        from rich.logging import RichHandler
+
         console_handler = RichHandler(
             rich_tracebacks=True,
-            markup=True,
+            markup=False,
             show_time=True,
             show_path=False,
             tracebacks_extra_lines=3,
             tracebacks_show_locals=True,
         )
     else:
-        console_handler = logging.StreamHandler(sys.stdout)
+        stream_handler_class = BatchStreamHandler if config.queued else logging.StreamHandler
+        console_handler = stream_handler_class(sys.stdout)
         console_handler.setFormatter(logging.Formatter(config.format))
     handlers.append(console_handler)
 
     if config.log_file:
         config.log_file.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(config.log_file)
+        file_handler_class = BatchFileHandler if config.queued else logging.FileHandler
+        file_handler = file_handler_class(config.log_file)
         file_handler.setFormatter(logging.Formatter(config.format))
         handlers.append(file_handler)
 
+    if config.queued:
+        log_queue = queue.Queue(maxsize=config.queue_size)
+        queue_handler = BoundedQueueHandler(log_queue, config.overflow)
+        _listener = BatchingQueueListener(
+            log_queue,
+            *handlers,
+            source=queue_handler,
+            batch_size=config.batch_size
+        )
+        _listener.start()
+        handlers = [queue_handler]
+
     logging.basicConfig(
         level=getattr(logging, config.level.upper()),
         handlers=handlers,
@@ -46,8 +178,12 @@ def setup_logging(config: LogConfig) -> None:
 
     logger = logging.getLogger(__name__)
     logger.debug(
-        "Logging configured: level=%s, rich_output=%s, log_file=%s",
+        "Logging configured: level=%s, rich_output=%s, log_file=%s, queued=%s",
         config.level,
         config.rich_output,
-        config.log_file
+        config.log_file,
+        config.queued
     )
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,14 @@
+"""Optional dependencies, imported on first use rather than at startup."""
+from functools import cache
+from types import ModuleType
+from typing import Optional
+
+
+@cache
+def optional_numpy() -> Optional[ModuleType]:
+    """NumPy if it is installed (``poetry install -E analysis``), else None."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
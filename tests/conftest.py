@@ -1,8 +1,11 @@
+import asyncio
+import time
 from datetime import datetime
-from typing import AsyncGenerator
-from unittest.mock import Mock
+from typing import AsyncGenerator, Awaitable, Callable, Optional
+from unittest.mock import AsyncMock, Mock
 
 import pytest
+import pytest_asyncio
 
 from ping_monitor.core.monitor import ConnectionMonitor
 from ping_monitor.models.metrics import PingMetrics
@@ -10,21 +13,56 @@ from ping_monitor.utils.config import MonitorConfig
 
 
 @pytest.fixture
-def mock_ping_result() -> PingMetrics:
-    return PingMetrics(
-        timestamp=datetime.now(),
-        target="8.8.8.8",
-        average_latency=10.0,
-        jitter=1.0,
-        packet_count=10,
-        success_count=10
-    )
+def make_metrics() -> Callable[..., PingMetrics]:
+    """Factory for PingMetrics samples, timestamped now unless given."""
+
+    def make(
+            target: str = "8.8.8.8",
+            latency: float = 10.0,
+            received: int = 10,
+            *,
+            timestamp: Optional[datetime] = None,
+            jitter: float = 1.0,
+            packet_count: int = 10,
+            error: Optional[str] = None
+    ) -> PingMetrics:
+        return PingMetrics(
+            timestamp=timestamp or datetime.now(),
+            target=target,
+            average_latency=latency,
+            jitter=jitter,
+            packet_count=packet_count,
+            success_count=received,
+            error_message=error
+        )
+
+    return make
+
+
+@pytest.fixture
+def until() -> Callable[..., Awaitable[None]]:
+    """Polls ``condition`` on the event loop until it holds or ``timeout`` passes."""
+
+    async def wait(condition: Callable[[], bool], timeout: float = 10.0) -> None:
+        deadline = time.monotonic() + timeout
+        while not condition():
+            assert time.monotonic() < deadline, "condition not met in time"
+            await asyncio.sleep(0.01)
+
+    return wait
+
+
+@pytest.fixture
+def mock_ping_result(make_metrics) -> PingMetrics:
+    return make_metrics()
 
 
 @pytest.fixture
 def mock_executor(mock_ping_result) -> Mock:
     mock = Mock()
     mock.execute.return_value = mock_ping_result
+    mock.execute_async = AsyncMock(return_value=mock_ping_result)
+    mock.close = AsyncMock()
     return mock
 
 
@@ -41,7 +79,7 @@ def sample_config(tmp_path) -> MonitorConfig:
     )
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def monitor(sample_config, mock_executor) -> AsyncGenerator[ConnectionMonitor, None]:
     monitor = ConnectionMonitor(sample_config)
     monitor.executor = mock_executor
@@ -0,0 +1,106 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from ping_monitor.core.adaptive import AdaptiveController
+from ping_monitor.core.monitor import ConnectionMonitor
+from ping_monitor.models.metrics import PingMetrics
+from ping_monitor.utils.config import MonitorConfig, ProbeTarget
+
+
+def _controller(budget: float = 1.0) -> AdaptiveController:
+    controller = AdaptiveController(min_interval=10, max_interval=600, budget=budget)
+    controller.add("a", 60)
+    return controller
+
+
+def test_stable_target_backs_off():
+    controller = _controller()
+
+    periods = [controller.observe("a", unstable=False) for _ in range(6)]
+
+    assert periods == [None, None, 90, None, None, 135]
+    assert controller.rate == pytest.approx(1 / 135)
+
+
+def test_unstable_target_speeds_up_to_floor():
+    controller = _controller()
+
+    periods = [controller.observe("a", unstable=True) for _ in range(4)]
+
+    assert periods == [30, 15, 10, None]
+
+
+def test_backoff_is_capped():
+    controller = AdaptiveController(min_interval=10, max_interval=100, budget=1.0, stable_after=1)
+    controller.add("a", 90)
+
+    assert controller.observe("a", unstable=False) == 100
+    assert controller.observe("a", unstable=False) is None
+
+
+def test_speedups_stay_within_budget():
+    controller = _controller(budget=3 / 60)
+    controller.add("b", 60)
+    controller.add("c", 60)
+
+    assert controller.observe("a", unstable=True) is None
+
+    for _ in range(3):
+        controller.observe("b", unstable=False)
+    period = controller.observe("a", unstable=True)
+
+    assert 30 <= period < 60
+    assert controller.rate == pytest.approx(3 / 60)
+
+
+def test_instability_resets_stable_streak():
+    controller = _controller(budget=10)
+
+    controller.observe("a", unstable=False)
+    controller.observe("a", unstable=False)
+    controller.observe("a", unstable=True)
+
+    assert controller.observe("a", unstable=False) is None
+    assert controller.period("a") == 30
+
+
+def test_remove_releases_budget():
+    controller = _controller()
+    controller.remove("a")
+
+    assert controller.rate == 0
+    assert controller.observe("a", unstable=True) is None
+
+
+@pytest.mark.asyncio
+async def test_monitor_backs_off_stable_target(sample_config):
+    config = MonitorConfig(
+        ping_adv_path=sample_config.ping_adv_path,
+        targets=(ProbeTarget("8.8.8.8", check_interval=0.02),),
+        adaptive=True,
+        min_check_interval=0.01,
+        start_jitter=0
+    )
+    monitor = ConnectionMonitor(config)
+    monitor.executor = Mock(
+        execute_async=AsyncMock(side_effect=lambda target, *_: PingMetrics(
+            timestamp=datetime.now(),
+            target=target,
+            average_latency=10.0,
+            jitter=1.0,
+            packet_count=10,
+            success_count=10
+        )),
+        close=AsyncMock()
+    )
+
+    task = asyncio.create_task(monitor.start())
+    await asyncio.sleep(0.4)
+    await monitor.stop()
+    await task
+
+    assert monitor._scheduler.period("8.8.8.8") > 0.02
+    assert monitor._adaptive.rate < 1 / 0.02
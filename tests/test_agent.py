@@ -0,0 +1,183 @@
+import asyncio
+import time
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+
+from ping_monitor.core.agent import MetricsAgent
+from ping_monitor.core.aggregator import Aggregator
+from ping_monitor.core.monitor import ConnectionMonitor
+from ping_monitor.core.wire import HEADER, encode_frame, read_frame, sample_from_row, sample_row
+from ping_monitor.models.exceptions import ProtocolError
+
+
+@pytest_asyncio.fixture
+async def aggregator():
+    async with Aggregator(port=0) as aggregator:
+        yield aggregator
+
+
+@pytest.fixture
+def monitors(sample_config):
+    return [ConnectionMonitor(sample_config) for _ in range(2)]
+
+
+def _agent(monitor, aggregator, vantage, **options) -> MetricsAgent:
+    return MetricsAgent(
+        monitor, "127.0.0.1", aggregator.port, vantage,
+        flush_interval=0.01, reconnect_delay=0.05, **options
+    )
+
+
+def test_sample_rows_round_trip(make_metrics):
+    metrics = make_metrics(received=0)
+
+    restored = sample_from_row(sample_row(metrics))
+
+    assert restored == metrics
+
+
+@pytest.mark.asyncio
+async def test_read_frame_rejects_oversized_and_corrupt_frames():
+    for data in (HEADER.pack(2 ** 31), HEADER.pack(3) + b"xyz"):
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        with pytest.raises(ProtocolError):
+            await read_frame(reader)
+
+    reader = asyncio.StreamReader()
+    reader.feed_data(encode_frame({"ack": 1}) + HEADER.pack(1)[:2])
+    reader.feed_eof()
+    assert await read_frame(reader) == {"ack": 1}
+    with pytest.raises(ProtocolError):
+        await read_frame(reader)
+
+
+@pytest.mark.asyncio
+async def test_agents_feed_per_vantage_views(aggregator, monitors, make_metrics):
+    agents = [_agent(m, aggregator, name) for m, name in zip(monitors, ("fra", "nyc"))]
+    for agent in agents:
+        agent.start()
+
+    for index in range(5):
+        await monitors[0]._process_metrics(make_metrics(latency=10.0 + index))
+        await monitors[1]._process_metrics(make_metrics(latency=40.0))
+    await monitors[1]._process_metrics(make_metrics(received=0))
+    for agent in agents:
+        await agent.stop()
+
+    assert aggregator.vantages == ("fra", "nyc")
+    assert aggregator.get_stats("8.8.8.8", "fra")["avg_latency"] == 12.0
+    assert aggregator.get_stats("8.8.8.8", "nyc")["measurements"] == 6
+    assert aggregator.get_stats()["measurements"] == 11
+
+    comparison = aggregator.compare("8.8.8.8")
+    assert comparison["reachable_from"] == ["fra"]
+    assert comparison["unreachable_from"] == ["nyc"]
+    assert (comparison["best"], comparison["worst"]) == ("fra", "nyc")
+    assert comparison["latency_spread"] == 28.0
+
+
+@pytest.mark.asyncio
+async def test_agent_batches_samples(aggregator, monitors, mocker, make_metrics):
+    agent = _agent(monitors[0], aggregator, "fra", batch_size=100)
+    agent.flush_interval = 0.2
+    agent.start()
+    enqueue = mocker.spy(agent, "_enqueue")
+
+    for index in range(250):
+        await monitors[0]._process_metrics(make_metrics(f"10.0.{index // 256}.{index % 256}"))
+    await agent.stop()
+
+    assert [len(call.args[0]) for call in enqueue.call_args_list] == [100, 100, 50]
+    assert len(aggregator.targets) == 250
+
+
+@pytest.mark.asyncio
+async def test_agent_resends_unacknowledged_batches(monitors, make_metrics, until):
+    first = Aggregator(port=0)
+    await first.start()
+    port = first.port
+    await first.stop()
+
+    agent = MetricsAgent(
+        monitors[0], "127.0.0.1", port, "fra", flush_interval=0.01, reconnect_delay=0.05
+    )
+    agent.start()
+    await monitors[0]._process_metrics(make_metrics())
+    await until(lambda: agent.pending == 1)
+
+    async with Aggregator(port=port) as aggregator:
+        await until(lambda: agent.pending == 0)
+        await agent.stop()
+
+    assert aggregator.get_stats("8.8.8.8", "fra")["measurements"] == 1
+
+
+@pytest.mark.asyncio
+async def test_aggregator_ignores_replayed_batches(aggregator, make_metrics):
+    reader, writer = await asyncio.open_connection("127.0.0.1", aggregator.port)
+    batch = encode_frame({"seq": 1, "samples": [sample_row(make_metrics())]})
+    writer.write(encode_frame({"vantage": "fra", "session": "s1"}) + batch + batch)
+
+    assert await read_frame(reader) == {"ack": 1}
+    assert await read_frame(reader) == {"ack": 1}
+    assert aggregator.get_stats(vantage="fra")["measurements"] == 1
+
+    writer.close()
+
+
+@pytest.mark.asyncio
+async def test_aggregator_tracks_sessions_sharing_a_vantage(aggregator, make_metrics):
+    peers = [await asyncio.open_connection("127.0.0.1", aggregator.port) for _ in range(2)]
+    for session, (_, writer) in zip(("s1", "s2"), peers):
+        writer.write(encode_frame({"vantage": "fra", "session": session}))
+    for index in range(2):
+        for reader, writer in peers:
+            writer.write(encode_frame({"seq": index + 1, "samples": [sample_row(make_metrics())]}))
+            assert await read_frame(reader) == {"ack": index + 1}
+
+    assert aggregator.get_stats(vantage="fra")["measurements"] == 4
+
+    for _, writer in peers:
+        writer.close()
+
+
+@pytest.mark.asyncio
+async def test_aggregator_drops_invalid_peers(aggregator):
+    reader, writer = await asyncio.open_connection("127.0.0.1", aggregator.port)
+    writer.write(encode_frame({"seq": 1}))
+
+    assert await reader.read() == b""
+    writer.close()
+
+
+def test_aggregator_expires_quiet_vantages(make_metrics):
+    aggregator = Aggregator(window=60.0)
+    now = datetime.now()
+    aggregator.add("fra", make_metrics())
+    aggregator.add("nyc", make_metrics(received=0))
+    aggregator._sessions[("nyc", "s1")] = (3, time.monotonic() - 120)
+
+    aggregator.expire(now + timedelta(seconds=30))
+    assert aggregator.vantages == ("fra", "nyc")
+
+    aggregator.add("fra", replace(make_metrics(), timestamp=now + timedelta(seconds=60)))
+    aggregator.expire(now + timedelta(seconds=90))
+    assert aggregator.vantages == ("fra",)
+    assert aggregator.get_stats("8.8.8.8")["measurements"] == 1
+    assert aggregator.compare("8.8.8.8")["unreachable_from"] == []
+    assert aggregator._sessions == {}
+
+
+@pytest.mark.asyncio
+async def test_aggregator_wakes_waiters_on_stop(aggregator):
+    assert not await aggregator.wait_stopped(0.01)
+    waiter = asyncio.create_task(aggregator.wait_stopped(60))
+
+    await aggregator.stop()
+
+    assert await asyncio.wait_for(waiter, 1)
@@ -0,0 +1,52 @@
+import random
+from array import array
+
+import pytest
+
+from ping_monitor.models import analysis
+from ping_monitor.models.analysis import analyze
+
+
+def _rfc3550(values):
+    jitter = 0.0
+    for previous, current in zip(values, values[1:]):
+        jitter += (abs(current - previous) - jitter) / 16
+    return jitter
+
+
+def test_analyze_loss_bursts_and_jitter():
+    sequence = array("l", [1, 2, 5, 6, 10])
+    rtts = array("d", [20.0, 22.0, 21.0, 30.0, 25.0])
+
+    result = analyze(rtts, sequence, packet_count=10)
+
+    assert result.received == 5
+    assert result.loss_bursts == 2
+    assert result.max_loss_burst == 3
+    assert result.min_rtt == 20.0
+    assert result.max_rtt == 30.0
+    assert result.median_rtt == 22.0
+    assert result.rfc3550_jitter == pytest.approx(_rfc3550(list(rtts)))
+
+
+def test_analyze_trailing_loss_and_zero_based_sequence():
+    result = analyze(array("d", [10.0, 11.0]), array("l", [0, 1]), packet_count=5, first_seq=0)
+
+    assert result.loss_bursts == 1
+    assert result.max_loss_burst == 3
+
+
+def test_analyze_empty():
+    assert analyze(array("d"), array("l"), packet_count=10) is None
+
+
+def test_numpy_and_python_paths_agree(monkeypatch):
+    rng = random.Random(3)
+    sequence = array("l", sorted(rng.sample(range(1, 201), 150)))
+    rtts = array("d", (rng.uniform(5, 50) for _ in sequence))
+
+    vectorized = analyze(rtts, sequence, packet_count=200)
+    monkeypatch.setattr(analysis, "optional_numpy", lambda: None)
+    fallback = analyze(rtts, sequence, packet_count=200)
+
+    assert vectorized == pytest.approx(fallback)
@@ -0,0 +1,160 @@
+import asyncio
+import csv
+import io
+import json
+import textwrap
+from datetime import datetime
+
+import pytest
+from typer.testing import CliRunner
+
+from ping_monitor.cli import app
+from ping_monitor.core.batch import ResultWriter, probe_all, read_targets
+from ping_monitor.models.metrics import PingMetrics
+from ping_monitor.utils.config import MonitorConfig
+
+
+class _Engine:
+    def __init__(self, delays=None) -> None:
+        self.delays = delays or {}
+        self.in_flight = 0
+        self.peak = 0
+
+    async def execute_async(self, target: str, packet_count: int, interval: float) -> PingMetrics:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delays.get(target, 0.001))
+        self.in_flight -= 1
+        if target == "boom":
+            raise RuntimeError("engine failure")
+        return PingMetrics(
+            timestamp=datetime.now(),
+            target=target,
+            average_latency=1.0,
+            jitter=0.1,
+            packet_count=packet_count,
+            success_count=packet_count
+        )
+
+    async def close(self) -> None:
+        pass
+
+
+def test_read_targets_skips_blanks_and_comments():
+    lines = ["8.8.8.8\n", "\n", "# resolvers\n", " 1.1.1.1  # cloudflare\n"]
+
+    assert list(read_targets(lines)) == ["8.8.8.8", "1.1.1.1"]
+
+
+@pytest.mark.asyncio
+async def test_probe_all_streams_results_as_they_finish():
+    engine = _Engine({"slow": 0.3})
+
+    results = []
+    async for metrics in probe_all(engine, ["slow", "a", "b"], 1, 0.1, concurrency=3):
+        results.append((metrics.target, engine.in_flight))
+
+    assert [target for target, _ in results] == ["a", "b", "slow"]
+    assert results[0][1] == 1  # "a" was yielded while "slow" was still running
+
+
+@pytest.mark.asyncio
+async def test_probe_all_bounds_concurrency_and_input():
+    engine = _Engine()
+    consumed = 0
+
+    def targets():
+        nonlocal consumed
+        for index in range(10_000):
+            consumed += 1
+            yield f"10.0.{index // 256}.{index % 256}"
+
+    count = 0
+    async for _ in probe_all(engine, targets(), 1, 0.1, concurrency=8):
+        count += 1
+        if count == 20:
+            # Input is read only as far as the workers and queues allow.
+            assert consumed <= 20 + 3 * 8 + 1
+            break
+
+    assert engine.peak <= 8
+
+
+@pytest.mark.asyncio
+async def test_probe_all_completes_everything():
+    targets = [f"host{i}" for i in range(500)]
+
+    results = [m.target async for m in probe_all(_Engine(), targets, 1, 0.1, concurrency=50)]
+
+    assert sorted(results) == sorted(targets)
+
+
+@pytest.mark.asyncio
+async def test_probe_all_propagates_engine_errors():
+    with pytest.raises(RuntimeError):
+        async for _ in probe_all(_Engine(), ["a", "boom", "b"], 1, 0.1, concurrency=2):
+            pass
+
+
+def test_result_writer_ndjson(make_metrics):
+    stream = io.StringIO()
+    writer = ResultWriter(stream)
+    writer.write(make_metrics(latency=12.5, timestamp=datetime(2024, 1, 1, 12, 0)))
+    writer.write(make_metrics(latency=0.0, received=0, jitter=0.0, error="Command timed out"))
+
+    first, second = (json.loads(line) for line in stream.getvalue().splitlines())
+    assert first["average_latency"] == 12.5
+    assert first["timestamp"] == "2024-01-01T12:00:00"
+    assert second["success"] is False
+    assert second["average_latency"] is None
+    assert second["error"] == "Command timed out"
+
+
+def test_result_writer_csv(make_metrics):
+    stream = io.StringIO()
+    writer = ResultWriter(stream, "csv")
+    writer.write(make_metrics())
+
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert rows[0]["target"] == "8.8.8.8"
+    assert rows[0]["packet_loss"] == "0.0"
+    with pytest.raises(ValueError):
+        ResultWriter(io.StringIO(), "xml")
+
+
+def test_probe_command_streams_ndjson(tmp_path, monkeypatch):
+    stub = tmp_path / "ping_adv"
+    stub.write_text(textwrap.dedent("""\
+        #!/bin/sh
+        echo "64 bytes from $1: icmp_seq=1 ttl=64 time=1.0 ms"
+        echo "64 bytes from $1: icmp_seq=2 ttl=64 time=2.0 ms"
+        echo "[$1] Test Result: Average Latency 1ms, Jitter 500000ns ($2 results)"
+    """))
+    stub.chmod(0o755)
+    monkeypatch.setenv(MonitorConfig.PING_ADV_ENV, str(stub))
+    monkeypatch.setattr(MonitorConfig, "_ping_adv_cache", None)
+
+    result = CliRunner().invoke(
+        app, ["probe", "-", "-n", "2", "-i", "0.01"], input="10.0.0.1\n10.0.0.2\n"
+    )
+
+    assert result.exit_code == 0, result.output
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert sorted(r["target"] for r in records) == ["10.0.0.1", "10.0.0.2"]
+    assert all(r["success"] for r in records)
+
+
+def test_probe_command_reports_bad_options(tmp_path):
+    output = tmp_path / "results.ndjson"
+    output.write_text("previous run\n")
+
+    bad_engine = CliRunner().invoke(app, ["probe", "-", "-e", "bogus"], input="")
+    bad_format = CliRunner().invoke(
+        app, ["probe", "-", "-e", "udp", "-f", "xml", "-o", str(output)], input=""
+    )
+
+    assert bad_engine.exit_code == bad_format.exit_code == 1
+    assert "Unknown engine" in bad_engine.stderr
+    assert "Unknown output format" in bad_format.stderr
+    assert "Traceback" not in bad_engine.stderr
+    assert output.read_text() == "previous run\n"
@@ -0,0 +1,100 @@
+from array import array
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+import pytest
+
+from ping_monitor.core.monitor import ConnectionMonitor
+from ping_monitor.models.analysis import analyze
+from ping_monitor.models.columnar import ColumnarHistory, StringTable
+from ping_monitor.utils.config import MonitorConfig
+
+
+def test_columnar_round_trip(make_metrics):
+    history = ColumnarHistory(capacity=4, window=timedelta(hours=1))
+    now = datetime.now()
+    ok = make_metrics(latency=12.5, timestamp=now)
+    failed = make_metrics(
+        latency=0.0, received=0, timestamp=now + timedelta(seconds=1), error="Command timed out"
+    )
+
+    history.append(ok)
+    history.append(failed)
+
+    assert list(history) == [ok, failed]
+    assert history.view()[1].error_message == "Command timed out"
+
+
+def test_columnar_keeps_rtts_and_analysis(make_metrics):
+    history = ColumnarHistory(capacity=2, window=timedelta(hours=1))
+    rtts = array("d", [10.0, 12.0, 11.0])
+    probed = replace(
+        make_metrics(latency=11.0, received=3, packet_count=4),
+        rtts=rtts,
+        analysis=analyze(rtts, array("l", [1, 2, 4]), 4)
+    )
+    plain = make_metrics()
+    history.append(probed)
+    history.append(plain)
+
+    restored, bare = history.view()
+    assert restored.analysis == probed.analysis
+    assert restored.analysis.loss_bursts == 1
+    assert list(restored.rtts) == [10.0, 12.0, 11.0]
+    assert bare.analysis is None and bare.rtts is None
+
+    history.append(plain)
+    assert history._rtts == {}
+
+
+def test_columnar_columns_are_chronological_after_wrap(make_metrics):
+    history = ColumnarHistory(capacity=3, window=timedelta(hours=1))
+    now = datetime.now()
+    for i in range(5):
+        history.append(make_metrics(latency=float(i), timestamp=now + timedelta(seconds=i)))
+
+    assert list(history.column("average_latency")) == [2.0, 3.0, 4.0]
+    assert list(history.numpy_column("success_count")) == [10, 10, 10]
+
+
+def test_columnar_window_trim(make_metrics):
+    history = ColumnarHistory(capacity=10, window=timedelta(minutes=1))
+    now = datetime.now()
+    history.append(make_metrics(latency=1.0, timestamp=now - timedelta(minutes=2)))
+    history.append(make_metrics(latency=2.0, timestamp=now))
+
+    assert list(history.column("average_latency")) == [2.0]
+
+
+def test_string_table_shared_between_buffers(make_metrics):
+    strings = StringTable()
+    first = ColumnarHistory(capacity=2, window=timedelta(hours=1), strings=strings)
+    second = ColumnarHistory(capacity=2, window=timedelta(hours=1), strings=strings)
+    first.append(make_metrics(latency=1.0))
+    second.append(make_metrics(latency=2.0))
+
+    assert len(strings) == 1
+
+
+def test_error_messages_leave_with_their_samples(make_metrics):
+    strings = StringTable()
+    history = ColumnarHistory(capacity=2, window=timedelta(hours=1), strings=strings)
+    now = datetime.now()
+    for i in range(5):
+        history.append(make_metrics(latency=0.0, received=0, timestamp=now, error=f"error {i}"))
+
+    assert [m.error_message for m in history] == ["error 3", "error 4"]
+    assert len(history._errors) == 2
+    assert len(strings) == 1
+
+
+@pytest.mark.asyncio
+async def test_monitor_uses_columnar_backend(sample_config, mock_executor, mock_ping_result):
+    config = MonitorConfig(ping_adv_path=sample_config.ping_adv_path, history_backend="columnar")
+    monitor = ConnectionMonitor(config)
+    monitor.executor = mock_executor
+    monitor._test_mode = True
+    await monitor.start()
+
+    assert isinstance(monitor._history["8.8.8.8"], ColumnarHistory)
+    assert monitor.history[0] == mock_ping_result
@@ -0,0 +1,118 @@
+from pathlib import Path
+
+import pytest
+
+from ping_monitor.models.exceptions import ConfigurationError
+from ping_monitor.utils.config import MonitorConfig, ProbeTarget, load_log_config, read_config
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache(monkeypatch):
+    monkeypatch.setattr(MonitorConfig, "_ping_adv_cache", None)
+    monkeypatch.delenv(MonitorConfig.PING_ADV_ENV, raising=False)
+
+
+def test_find_ping_adv_prefers_environment(sample_config, monkeypatch):
+    monkeypatch.setenv(MonitorConfig.PING_ADV_ENV, str(sample_config.ping_adv_path))
+
+    assert MonitorConfig.find_ping_adv() == sample_config.ping_adv_path
+
+
+def test_find_ping_adv_searches_path_once(sample_config, monkeypatch, mocker):
+    monkeypatch.setenv("PATH", str(sample_config.ping_adv_path.parent))
+    which = mocker.spy(__import__("shutil"), "which")
+
+    first = MonitorConfig.find_ping_adv()
+    second = MonitorConfig.find_ping_adv()
+
+    assert first == second == sample_config.ping_adv_path
+    assert which.call_count == 1
+
+
+def test_find_ping_adv_revalidates_cache(sample_config, monkeypatch):
+    monkeypatch.setattr(MonitorConfig, "_ping_adv_cache", sample_config.ping_adv_path)
+    monkeypatch.setattr(MonitorConfig, "SEARCH_PATHS", [])
+    monkeypatch.setenv("PATH", "")
+    sample_config.ping_adv_path.unlink()
+
+    with pytest.raises(FileNotFoundError):
+        MonitorConfig.find_ping_adv()
+
+
+CONFIG = """
+[monitor]
+packet_count = 5
+detectors = ["ewma"]
+
+[logging]
+level = "DEBUG"
+file = "monitor.log"
+
+[[targets]]
+host = "1.1.1.1"
+check_interval = 30.0
+
+[[targets]]
+host = "9.9.9.9"
+"""
+
+
+def test_load_reads_toml_file(sample_config, tmp_path):
+    path = tmp_path / "monitor.toml"
+    path.write_text(CONFIG)
+
+    config = MonitorConfig.load(path, ping_adv_path=sample_config.ping_adv_path)
+    log_config = load_log_config(path)
+
+    assert config.targets == (ProbeTarget("1.1.1.1", 30.0), ProbeTarget("9.9.9.9"))
+    assert config.packet_count == 5
+    assert config.detectors == ("ewma",)
+    assert config.log_level == "DEBUG"
+    assert config.log_file == Path("monitor.log")
+    assert (log_config.level, log_config.log_file) == ("DEBUG", Path("monitor.log"))
+
+
+def test_load_overrides_win_over_file(sample_config, tmp_path):
+    path = tmp_path / "monitor.toml"
+    path.write_text(CONFIG)
+
+    config = MonitorConfig.load(
+        path, ping_adv_path=sample_config.ping_adv_path, packet_count=3
+    )
+
+    assert config.packet_count == 3
+
+
+def test_socket_engines_do_not_need_ping_adv(mocker):
+    find = mocker.patch.object(MonitorConfig, "find_ping_adv", side_effect=FileNotFoundError)
+
+    config = MonitorConfig.load(engine="icmp")
+
+    assert config.ping_adv_path is None
+    find.assert_not_called()
+    with pytest.raises(FileNotFoundError):
+        MonitorConfig.load()
+    with pytest.raises(ConfigurationError):
+        MonitorConfig(engine="ping_adv")
+
+
+def test_read_config_accepts_inline_targets(tmp_path):
+    path = tmp_path / "monitor.toml"
+    path.write_text('[monitor]\ntargets = ["8.8.8.8", {host = "1.1.1.1", check_interval = 5}]\n')
+
+    assert read_config(path)[0]["targets"] == (ProbeTarget("8.8.8.8"), ProbeTarget("1.1.1.1", 5))
+
+
+@pytest.mark.parametrize("content", [
+    "[monitor]\nbogus = 1\n",
+    "[alerts]\nenabled = true\n",
+    "[[targets]]\nport = 7\n",
+    "[[targets]]\nhost = \"1.1.1.1\"\nweight = 2\n",
+    "[monitor\n",
+])
+def test_read_config_rejects_invalid_files(tmp_path, content):
+    path = tmp_path / "monitor.toml"
+    path.write_text(content)
+
+    with pytest.raises(ConfigurationError):
+        read_config(path)
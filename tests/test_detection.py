@@ -0,0 +1,171 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from ping_monitor.core.monitor import ConnectionMonitor
+from ping_monitor.models import detection
+from ping_monitor.models.detection import (
+    CusumDetector,
+    DetectionStage,
+    Detector,
+    EwmaDetector,
+    PageHinkleyDetector,
+    create_detector,
+)
+from ping_monitor.models.exceptions import ConfigurationError
+from ping_monitor.utils.config import MonitorConfig
+
+
+def _minute(index: int) -> datetime:
+    return datetime(2024, 1, 1) + timedelta(minutes=index)
+
+
+def _baseline(count: int = 30):
+    # Alternating 10/11 ms: mean 10.5, standard deviation 0.5.
+    return [10.0 + i % 2 for i in range(count)]
+
+
+def _alarms(detector, values):
+    return [i for i, value in enumerate(values) if detector.update(0, value) is not None]
+
+
+def test_detector_base_is_abstract():
+    with pytest.raises(TypeError):
+        Detector()
+
+
+def test_ewma_flags_spike_after_warmup():
+    assert _alarms(EwmaDetector(), _baseline(5) + [30.0]) == []
+    assert _alarms(EwmaDetector(), _baseline() + [30.0]) == [30]
+
+
+def test_cusum_catches_level_shift_ewma_misses():
+    values = _baseline() + [12.0] * 10
+
+    assert _alarms(EwmaDetector(), values) == []
+    alarms = _alarms(CusumDetector(), values)
+    assert alarms and alarms[0] < 36
+
+
+def test_page_hinkley_detects_shift_and_rebaselines():
+    values = _baseline() + [40.0] * 30
+
+    alarms = _alarms(PageHinkleyDetector(), values)
+
+    assert alarms[0] == 31
+    assert len(alarms) == 1
+
+
+def test_create_detector():
+    detector = create_detector("ewma:3")
+
+    assert isinstance(detector, EwmaDetector)
+    assert detector.threshold == 3.0
+    assert create_detector("page_hinkley").threshold == 50.0
+    with pytest.raises(ConfigurationError):
+        create_detector("zscore")
+    with pytest.raises(ConfigurationError):
+        create_detector("ewma:high")
+
+
+def test_config_validates_detectors(sample_config):
+    with pytest.raises(ConfigurationError):
+        MonitorConfig(ping_adv_path=sample_config.ping_adv_path, detectors=("bogus",))
+
+
+def _samples(make_metrics):
+    rng = random.Random(7)
+    samples = []
+    for index in range(60):
+        for target in ("a", "b", "c"):
+            latency = rng.gauss(20, 1) + (15 if target == "b" and index > 40 else 0)
+            received = 0 if target == "c" and index % 17 == 0 else 10
+            samples.append(make_metrics(target, latency, received, timestamp=_minute(index)))
+    return samples
+
+
+@pytest.mark.parametrize("vectorised", [True, False])
+def test_evaluate_many_matches_sequential(monkeypatch, vectorised, make_metrics):
+    if not vectorised:
+        monkeypatch.setattr(detection, "optional_numpy", lambda: None)
+    specs = ("ewma", "cusum", "page_hinkley:20")
+    sequential = DetectionStage(specs)
+    expected = [a for m in _samples(make_metrics) for a in sequential.evaluate(m)]
+
+    bulk = DetectionStage(specs).evaluate_many(_samples(make_metrics))
+
+    def key(anomaly):
+        return anomaly.timestamp, anomaly.target, anomaly.metric, anomaly.detector
+
+    assert [key(a) for a in sorted(bulk, key=key)] == [key(a) for a in sorted(expected, key=key)]
+    assert {a.target for a in bulk if (a.metric, a.detector) == ("latency", "ewma")} == {"b"}
+    for got, want in zip(sorted(bulk, key=key), sorted(expected, key=key)):
+        assert key(got) == key(want)
+        assert got.score == pytest.approx(want.score)
+        assert got.expected == pytest.approx(want.expected)
+
+
+def test_subscribers_and_emit(make_metrics):
+    stage = DetectionStage(("ewma",), series=("latency",))
+    received = []
+    unsubscribe = stage.subscribe(received.append)
+
+    stage.evaluate_many(
+        [make_metrics("a", v, timestamp=_minute(i)) for i, v in enumerate(_baseline())],
+        emit=False
+    )
+    stage.evaluate(make_metrics("a", 40.0, timestamp=_minute(99)))
+    unsubscribe()
+    stage.evaluate(make_metrics("a", 80.0, timestamp=_minute(100)))
+
+    assert [(a.target, a.metric, a.detector, a.value) for a in received] == [
+        ("a", "latency", "ewma", 40.0)
+    ]
+
+
+def test_forget_resets_and_reuses_slot(make_metrics):
+    stage = DetectionStage(("ewma",), series=("latency",))
+    for index, value in enumerate(_baseline()):
+        stage.evaluate(make_metrics("a", value, timestamp=_minute(index)))
+    stage.forget("a")
+
+    # A fresh slot is back in warmup, so a spike is not flagged.
+    assert stage.evaluate(make_metrics("b", 10.0)) == []
+    assert stage.evaluate(make_metrics("b", 90.0, timestamp=_minute(1))) == []
+    assert stage._slots == {"b": 0}
+
+
+@pytest.mark.asyncio
+async def test_monitor_reports_anomalies(monitor, sample_config, make_metrics):
+    monitor.config = MonitorConfig(
+        ping_adv_path=sample_config.ping_adv_path, detectors=("ewma",)
+    )
+    monitor._detection = DetectionStage(monitor.config.detectors)
+    received = []
+    monitor.detection.subscribe(received.append)
+
+    for index, value in enumerate(_baseline()):
+        await monitor._process_metrics(make_metrics(latency=value, timestamp=_minute(index)))
+    await monitor._process_metrics(make_metrics(latency=45.0, timestamp=_minute(50)))
+
+    assert [(a.metric, a.value) for a in received] == [("latency", 45.0)]
+
+
+def test_monitor_warms_detectors_from_store(sample_config, make_metrics):
+    config = MonitorConfig(
+        ping_adv_path=sample_config.ping_adv_path,
+        store_path=sample_config.ping_adv_path.parent / "store",
+        detectors=("ewma",)
+    )
+    now = datetime.now()
+    first = ConnectionMonitor(config)
+    for index, value in enumerate(_baseline()):
+        timestamp = now - timedelta(seconds=60 - index)
+        first._store.append(make_metrics(latency=value, timestamp=timestamp))
+    first._store.flush()
+
+    restored = ConnectionMonitor(config)
+    anomalies = restored.detection.evaluate(make_metrics(latency=45.0))
+
+    assert [a.metric for a in anomalies] == ["latency"]
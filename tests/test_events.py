@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from ping_monitor.core.events import ANOMALY, SAMPLE, STATE, EventBus, StateChange
+from ping_monitor.core.monitor import ConnectionMonitor
+from ping_monitor.utils.config import MonitorConfig
+
+
+@pytest.mark.asyncio
+async def test_subscription_iterates_published_events():
+    bus = EventBus()
+    subscription = bus.subscribe(SAMPLE)
+
+    bus.publish(SAMPLE, 1)
+    bus.publish(STATE, "ignored")
+    bus.publish(SAMPLE, 2)
+    bus.close()
+
+    assert [event async for event in subscription] == [(SAMPLE, 1), (SAMPLE, 2)]
+
+
+@pytest.mark.asyncio
+async def test_subscription_waits_for_events():
+    bus = EventBus()
+    subscription = bus.subscribe()
+
+    async def consume():
+        return await subscription.__anext__()
+
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(0)
+    bus.publish(ANOMALY, "spike")
+
+    assert await asyncio.wait_for(task, timeout=1) == (ANOMALY, "spike")
+
+
+@pytest.mark.parametrize("policy, queued, closed", [
+    ("drop_oldest", [3, 4], False),
+    ("drop_newest", [1, 2], False),
+    ("disconnect", [1, 2], True),
+])
+def test_slow_consumer_policies(policy, queued, closed):
+    bus = EventBus()
+    subscription = bus.subscribe(maxsize=2, policy=policy)
+
+    for value in (1, 2, 3, 4):
+        bus.publish(SAMPLE, value)
+
+    assert [subscription.get_nowait().data for _ in range(len(subscription))] == queued
+    assert subscription.closed is closed
+    assert subscription.dropped == (1 if closed else 2)
+
+
+def test_subscribe_validates_arguments():
+    bus = EventBus()
+    with pytest.raises(ValueError):
+        bus.subscribe("bogus")
+    with pytest.raises(ValueError):
+        bus.subscribe(policy="block")
+
+
+def test_listeners_are_isolated_from_failures():
+    bus = EventBus()
+    received = []
+
+    def broken(_):
+        raise RuntimeError("boom")
+
+    bus.add_listener(broken)
+    remove = bus.add_listener(received.append, STATE)
+    bus.publish(STATE, "down")
+    remove()
+    bus.publish(STATE, "up")
+
+    assert received == ["down"]
+
+
+@pytest.mark.asyncio
+async def test_closed_subscription_stops_receiving():
+    bus = EventBus()
+    async with bus.subscribe() as subscription:
+        bus.publish(SAMPLE, 1)
+
+    bus.publish(SAMPLE, 2)
+
+    assert [event.data async for event in subscription] == [1]
+
+
+@pytest.mark.asyncio
+async def test_monitor_publishes_samples_and_state_changes(monitor, make_metrics):
+    subscription = monitor.subscribe((SAMPLE, STATE))
+    up, down, again = make_metrics(), make_metrics(received=0), make_metrics(latency=11.0)
+
+    for metrics in (up, down, again, again):
+        await monitor._process_metrics(metrics)
+    subscription.close()
+
+    events = [event async for event in subscription]
+    assert [e.data for e in events if e.topic == SAMPLE] == [up, down, again, again]
+    assert [(e.data.up, e.data.previous) for e in events if e.topic == STATE] == [
+        (True, None), (False, True), (True, False)
+    ]
+    assert isinstance(events[1].data, StateChange)
+
+
+@pytest.mark.asyncio
+async def test_monitor_publishes_anomalies(sample_config, make_metrics):
+    monitor = ConnectionMonitor(MonitorConfig(
+        ping_adv_path=sample_config.ping_adv_path, detectors=("ewma",)
+    ))
+    anomalies = []
+    monitor.add_listener(anomalies.append, ANOMALY)
+
+    for index in range(30):
+        await monitor._process_metrics(make_metrics(latency=10.0 + index % 2))
+    await monitor._process_metrics(make_metrics(latency=50.0))
+
+    assert [(a.metric, a.value) for a in anomalies] == [("latency", 50.0)]
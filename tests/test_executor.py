@@ -1,3 +1,4 @@
+import asyncio
 import subprocess
 from pathlib import Path
 from unittest.mock import Mock
@@ -134,3 +135,72 @@ def test_executor_error_conditions(executor, mocker):
     result = executor.execute("8.8.8.8", 10, 1.0)
     assert not result.success
     assert "invalid output format" in result.error_message.lower()
+
+
+def _write_stub(path: Path, body: str) -> Path:
+    path.write_text("#!/bin/sh\n" + body + "\n")
+    path.chmod(0o755)
+    return path
+
+
+@pytest.mark.asyncio
+async def test_executor_async_success(tmp_path):
+    stub = _write_stub(
+        tmp_path / "ping_adv",
+        'echo "[$1] Test Result: Average Latency 20ms, Jitter 935529ns ($2 results)"'
+    )
+
+    result = await PingExecutor(stub).execute_async("8.8.8.8", 10, 1.0)
+
+    assert result.success
+    assert result.average_latency == 20.0
+    assert abs(result.jitter - 0.935529) < 0.0001
+    assert result.success_count == 10
+
+
+@pytest.mark.asyncio
+async def test_executor_async_nonzero_exit(tmp_path):
+    stub = _write_stub(tmp_path / "ping_adv", 'echo "boom" >&2; exit 2')
+
+    result = await PingExecutor(stub).execute_async("8.8.8.8", 10, 1.0)
+
+    assert not result.success
+    assert result.error_message == "boom"
+
+
+@pytest.mark.asyncio
+async def test_executor_async_timeout_kills_child(tmp_path, mocker):
+    stub = _write_stub(tmp_path / "ping_adv", "exec sleep 30")
+    executor = PingExecutor(stub)
+    mocker.patch.object(PingExecutor, "_timeout", return_value=0.2)
+    spawned = []
+    create = asyncio.create_subprocess_exec
+
+    async def spawn(*args, **kwargs):
+        spawned.append(await create(*args, **kwargs))
+        return spawned[-1]
+
+    mocker.patch("asyncio.create_subprocess_exec", side_effect=spawn)
+
+    result = await executor.execute_async("8.8.8.8", 10, 1.0)
+
+    assert not result.success
+    assert "timed out" in result.error_message.lower()
+    assert spawned[0].returncode is not None
+
+
+def test_executor_captures_per_packet_rtts(executor, mocker):
+    mock_output = (
+        "64 bytes from 8.8.8.8: icmp_seq=1 ttl=117 time=20.0 ms\n"
+        "64 bytes from 8.8.8.8: icmp_seq=3 ttl=117 time=22.0 ms\n"
+        "[8.8.8.8] Test Result: Average Latency 21ms, Jitter 2ms (2 results)"
+    )
+    mock_run = mocker.patch('subprocess.run')
+    mock_run.return_value = Mock(stdout=mock_output, stderr="", returncode=0)
+
+    result = executor.execute("8.8.8.8", 3, 1.0)
+
+    assert list(result.rtts) == [20.0, 22.0]
+    assert result.analysis.received == 2
+    assert result.analysis.max_loss_burst == 1
+    assert result.analysis.rfc3550_jitter == 2.0 / 16
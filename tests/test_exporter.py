@@ -0,0 +1,110 @@
+import asyncio
+from dataclasses import replace
+
+import pytest
+
+from ping_monitor.core.exporter import MetricsExporter
+
+
+async def _get(port: int, path: str = "/metrics", accept: str = "*/*") -> bytes:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\nAccept: {accept}\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return response
+
+
+@pytest.mark.asyncio
+async def test_render_exports_per_target_samples(monitor, make_metrics):
+    await monitor._process_metrics(make_metrics("8.8.8.8"))
+    await monitor._process_metrics(make_metrics("1.1.1.1", 0.0, 0, jitter=0.0))
+
+    body = MetricsExporter(monitor, cache_ttl=0).render().decode()
+
+    assert '# TYPE ping_monitor_probes_total counter' in body
+    assert 'ping_monitor_latency_ms{target="8.8.8.8"} 10.0' in body
+    assert 'ping_monitor_up{target="1.1.1.1"} 0.0' in body
+    assert 'ping_monitor_packet_loss_ratio{target="1.1.1.1"} 1.0' in body
+    assert 'ping_monitor_latency_ms{target="1.1.1.1"}' not in body
+    assert 'ping_monitor_packets_received_total{target="8.8.8.8"} 10' in body
+    assert "# EOF" not in body
+
+
+@pytest.mark.asyncio
+async def test_render_openmetrics(monitor, make_metrics):
+    await monitor._process_metrics(make_metrics("8.8.8.8"))
+
+    body = MetricsExporter(monitor, cache_ttl=0).render(openmetrics=True).decode()
+
+    assert "# TYPE ping_monitor_probes counter" in body
+    assert 'ping_monitor_probes_total{target="8.8.8.8"} 1' in body
+    assert body.endswith("# EOF\n")
+
+
+@pytest.mark.asyncio
+async def test_render_only_refreshes_changed_targets(monitor, mocker, make_metrics):
+    for target in ("a", "b"):
+        await monitor._process_metrics(make_metrics(target))
+    exporter = MetricsExporter(monitor, cache_ttl=0)
+    exporter.render()
+
+    latest = mocker.spy(monitor, "latest")
+    await monitor._process_metrics(make_metrics("b", latency=20.0))
+    body = exporter.render().decode()
+
+    latest.assert_called_once_with("b")
+    assert 'ping_monitor_latency_ms{target="b"} 20.0' in body
+
+
+@pytest.mark.asyncio
+async def test_render_is_cached_for_ttl(monitor, make_metrics):
+    exporter = MetricsExporter(monitor, cache_ttl=60)
+    first = exporter.render()
+    await monitor._process_metrics(make_metrics("8.8.8.8"))
+
+    assert exporter.render() is first
+
+
+@pytest.mark.asyncio
+async def test_render_escapes_labels(monitor, make_metrics):
+    await monitor._process_metrics(make_metrics('we"ird\\host'))
+
+    body = MetricsExporter(monitor, cache_ttl=0).render().decode()
+
+    assert r'ping_monitor_probes_total{target="we\"ird\\host"} 1' in body
+
+
+@pytest.mark.asyncio
+async def test_exporter_serves_http(monitor, make_metrics):
+    await monitor._process_metrics(make_metrics("8.8.8.8"))
+    exporter = MetricsExporter(monitor, port=0)
+    await exporter.start()
+    try:
+        response = await _get(exporter.port)
+        openmetrics = await _get(exporter.port, accept="application/openmetrics-text")
+        missing = await _get(exporter.port, path="/other")
+    finally:
+        await exporter.stop()
+
+    assert response.startswith(b"HTTP/1.1 200 OK")
+    assert b"text/plain; version=0.0.4" in response
+    assert b'ping_monitor_up{target="8.8.8.8"} 1.0' in response
+    assert b"application/openmetrics-text" in openmetrics
+    assert openmetrics.endswith(b"# EOF\n")
+    assert missing.startswith(b"HTTP/1.1 404")
+
+
+@pytest.mark.asyncio
+async def test_monitor_starts_and_stops_exporter(monitor):
+    monitor.config = replace(monitor.config, metrics_port=0)
+    monitor._test_mode = True
+
+    await monitor.start()
+    port = monitor.exporter.port
+    response = await _get(port)
+    await monitor.stop()
+
+    assert b'ping_monitor_probes_total{target="8.8.8.8"} 1' in response
+    assert monitor.exporter is None
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from ping_monitor.models.history import MetricHistory
+
+
+def test_history_overwrites_oldest_at_capacity(make_metrics):
+    evicted = []
+    history = MetricHistory(capacity=3, window=timedelta(hours=1), on_evict=evicted.append)
+    now = datetime.now()
+    samples = [
+        make_metrics(latency=float(i), timestamp=now + timedelta(seconds=i)) for i in range(5)
+    ]
+
+    for sample in samples:
+        history.append(sample)
+
+    assert list(history) == samples[2:]
+    assert evicted == samples[:2]
+
+
+def test_history_evicts_samples_outside_window(make_metrics):
+    history = MetricHistory(capacity=10, window=timedelta(minutes=1))
+    now = datetime.now()
+    old = make_metrics(timestamp=now - timedelta(minutes=5))
+    recent = make_metrics(timestamp=now - timedelta(seconds=30))
+
+    history.append(old)
+    history.append(recent)
+    assert list(history) == [recent]
+
+    history.trim(now + timedelta(minutes=1))
+    assert len(history) == 0
+
+
+def test_history_view_is_live_and_read_only(make_metrics):
+    history = MetricHistory(capacity=2, window=timedelta(hours=1))
+    view = history.view()
+    now = datetime.now()
+    first, second, third = (make_metrics(timestamp=now + timedelta(seconds=i)) for i in range(3))
+
+    history.append(first)
+    assert len(view) == 1 and view[0] is first
+
+    history.append(second)
+    history.append(third)
+    assert view[0] is second
+    assert view[-1] is third
+    assert view[:] == [second, third]
+    with pytest.raises(IndexError):
+        view[2]
+    with pytest.raises(TypeError):
+        view[0] = first
+
+
+def test_history_rejects_zero_capacity():
+    with pytest.raises(ValueError):
+        MetricHistory(capacity=0, window=timedelta(hours=1))
@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+import pytest
+
+from ping_monitor.core.instrumentation import Histogram, Instrumentation, LoopLagMonitor
+
+
+def test_histogram_snapshot():
+    histogram = Histogram()
+    for ms in range(1, 101):
+        histogram.observe(ms / 1000)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot["count"] == 100
+    assert snapshot["mean"] == pytest.approx(0.0505)
+    assert snapshot["max"] == 0.1
+    assert 0.05 <= snapshot["p50"] <= 0.05 * 1.42
+    assert snapshot["p99"] <= 0.1
+    assert histogram.buckets()[-1] == (float("inf"), 100)
+
+
+def test_histogram_empty():
+    assert Histogram().snapshot() == {"count": 0}
+    assert Histogram().quantile(0.5) is None
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_sees_blocking_call():
+    registry = Instrumentation()
+    monitor = LoopLagMonitor(interval=0.01, registry=registry)
+    monitor.start()
+    await asyncio.sleep(0.02)
+    time.sleep(0.1)
+    await asyncio.sleep(0.02)
+    await monitor.stop()
+
+    assert registry.histogram("loop.lag").maximum >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_monitor_records_probe_timings(monitor):
+    monitor.instrumentation.reset()
+    monitor._test_mode = True
+    await monitor.start()
+
+    snapshot = monitor.instrumentation.snapshot()
+    assert snapshot["monitor.probe"]["count"] == 1
+    assert snapshot["monitor.schedule_delay"]["count"] == 1
@@ -0,0 +1,96 @@
+import io
+import logging
+import queue
+
+import pytest
+
+from ping_monitor.utils.logging import (
+    BatchingQueueListener,
+    BoundedQueueHandler,
+    LogConfig,
+    setup_logging,
+    stop_logging,
+)
+
+
+class _Collector(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.messages = []
+        self.flushes = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(self.format(record))
+
+    def flush(self) -> None:
+        self.flushes += 1
+
+
+def _record(message: str, *args) -> logging.LogRecord:
+    return logging.makeLogRecord({"msg": message, "args": args, "levelno": logging.INFO})
+
+
+def test_handler_defers_formatting():
+    handler = BoundedQueueHandler(queue.Queue())
+    record = _record("latency %.2f", 1.5)
+    handler.handle(record)
+
+    queued = handler.queue.get_nowait()
+    assert queued is record
+    assert queued.args == (1.5,)
+
+
+@pytest.mark.parametrize("policy, expected", [
+    ("drop", ["first", "second"]),
+    ("drop_oldest", ["second", "third"]),
+])
+def test_handler_overflow_policies(policy, expected):
+    handler = BoundedQueueHandler(queue.Queue(maxsize=2), policy)
+    for message in ("first", "second", "third"):
+        handler.handle(_record(message))
+
+    assert [handler.queue.get_nowait().msg for _ in range(2)] == expected
+    assert handler.dropped == 1
+
+
+def test_listener_flushes_once_per_batch_and_reports_drops():
+    log_queue = queue.Queue()
+    source = BoundedQueueHandler(log_queue)
+    collector = _Collector()
+    for i in range(10):
+        source.handle(_record("sample %d", i))
+    source.dropped = 3
+
+    listener = BatchingQueueListener(log_queue, collector, source=source, batch_size=100)
+    listener.start()
+    listener.stop()
+
+    assert collector.messages[:10] == [f"sample {i}" for i in range(10)]
+    assert collector.messages[10] == "Log queue full, dropped 3 records"
+    assert collector.flushes <= 2
+
+
+def test_setup_logging_routes_through_queue(tmp_path):
+    log_file = tmp_path / "monitor.log"
+    setup_logging(LogConfig(level="INFO", log_file=log_file, rich_output=False))
+    try:
+        assert isinstance(logging.getLogger().handlers[0], BoundedQueueHandler)
+        logging.getLogger("ping_monitor.test").info("queued message")
+    finally:
+        stop_logging()
+
+    assert "queued message" in log_file.read_text()
+
+
+def test_rich_output_keeps_bracketed_hostnames():
+    from rich.console import Console
+
+    setup_logging(LogConfig(level="INFO", queued=False))
+    handler = logging.getLogger().handlers[0]
+    handler.console = Console(file=io.StringIO(), width=200)
+    try:
+        logging.getLogger("ping_monitor.test").info("[%s] Connection unavailable", "example.com")
+    finally:
+        stop_logging()
+
+    assert "[example.com] Connection unavailable" in handler.console.file.getvalue()
@@ -0,0 +1,159 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+import pytest
+
+from ping_monitor.core.monitor import ConnectionMonitor
+from ping_monitor.models.exceptions import ConfigurationError
+from ping_monitor.models.metrics import PingMetrics
+from ping_monitor.utils.config import MonitorConfig, ProbeTarget
+
+
+def _metrics_for(target: str, packet_count: int, interval: float) -> PingMetrics:
+    return PingMetrics(
+        timestamp=datetime.now(),
+        target=target,
+        average_latency=10.0,
+        jitter=1.0,
+        packet_count=packet_count,
+        success_count=packet_count
+    )
+
+
+@pytest.fixture
+def multi_config(sample_config) -> MonitorConfig:
+    return MonitorConfig(
+        ping_adv_path=sample_config.ping_adv_path,
+        targets=tuple(ProbeTarget(f"10.0.0.{i}") for i in range(1, 6)),
+        max_concurrency=5
+    )
+
+
+def test_config_defaults_to_single_target(sample_config):
+    assert sample_config.probe_targets == (ProbeTarget("8.8.8.8"),)
+
+
+def test_config_validation(sample_config):
+    with pytest.raises(ConfigurationError):
+        MonitorConfig(ping_adv_path=sample_config.ping_adv_path, max_concurrency=0)
+    with pytest.raises(ConfigurationError):
+        MonitorConfig(ping_adv_path=sample_config.ping_adv_path, start_jitter=1.5)
+
+
+@pytest.mark.asyncio
+async def test_monitor_single_pass(monitor, mock_ping_result):
+    monitor._test_mode = True
+    await monitor.start()
+
+    assert monitor.last_metrics == mock_ping_result
+    assert monitor.history == [mock_ping_result]
+    assert monitor.get_stats()["measurements"] == 1
+
+
+@pytest.mark.asyncio
+async def test_monitor_probes_targets_concurrently(multi_config):
+    async def slow_execute(target, packet_count, interval):
+        await asyncio.sleep(0.2)
+        return _metrics_for(target, packet_count, interval)
+
+    monitor = ConnectionMonitor(multi_config)
+    monitor.executor = Mock(execute_async=slow_execute)
+    monitor._test_mode = True
+
+    started = time.perf_counter()
+    await monitor.start()
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.2 * len(monitor.targets)
+    assert {m.target for m in monitor.history} == set(monitor.targets)
+    for target in monitor.targets:
+        assert monitor.latest(target).target == target
+        assert monitor.get_stats(target)["measurements"] == 1
+
+
+@pytest.mark.asyncio
+async def test_monitor_respects_concurrency_cap(multi_config):
+    in_flight = 0
+    peak = 0
+
+    async def execute_ping(target):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _metrics_for(target, 10, 1.0)
+
+    config = MonitorConfig(
+        ping_adv_path=multi_config.ping_adv_path,
+        targets=multi_config.targets,
+        max_concurrency=2
+    )
+    monitor = ConnectionMonitor(config)
+    monitor._execute_ping = execute_ping
+    monitor._test_mode = True
+    await monitor.start()
+
+    assert peak == 2
+    assert len(monitor.history) == len(config.targets)
+
+
+@pytest.mark.asyncio
+async def test_monitor_history_is_chronological(monitor):
+    now = datetime.now()
+    for seconds, target in ((0, "a"), (1, "b"), (2, "a"), (3, "b")):
+        await monitor._process_metrics(PingMetrics(
+            timestamp=now + timedelta(seconds=seconds),
+            target=target,
+            average_latency=10.0,
+            jitter=1.0,
+            packet_count=10,
+            success_count=10
+        ))
+
+    assert [m.target for m in monitor.history] == ["a", "b", "a", "b"]
+    assert monitor.history[-1].timestamp == now + timedelta(seconds=3)
+    assert [m.target for m in monitor.history_by_target] == ["a", "a", "b", "b"]
+
+
+@pytest.mark.asyncio
+async def test_monitor_latency_percentiles(monitor):
+    for latency in range(1, 101):
+        await monitor._process_metrics(PingMetrics(
+            timestamp=datetime.now(),
+            target="8.8.8.8",
+            average_latency=float(latency),
+            jitter=1.0,
+            packet_count=10,
+            success_count=10
+        ))
+
+    percentiles = monitor.get_percentiles()
+
+    assert set(percentiles) == {"p50", "p95", "p99"}
+    assert percentiles["p50"] == pytest.approx(50, rel=0.02)
+    assert percentiles["p99"] == pytest.approx(99, rel=0.02)
+    assert monitor.get_percentiles("10.0.0.1") == {}
+
+
+@pytest.mark.asyncio
+async def test_monitor_stats_for_duration(monitor):
+    now = datetime.now()
+    for minutes_ago, latency in ((120, 100.0), (30, 20.0), (1, 10.0)):
+        await monitor._process_metrics(PingMetrics(
+            timestamp=now - timedelta(minutes=minutes_ago),
+            target="8.8.8.8",
+            average_latency=latency,
+            jitter=1.0,
+            packet_count=10,
+            success_count=10
+        ))
+
+    assert monitor.get_stats(duration=timedelta(minutes=5))["measurements"] == 1
+    assert monitor.get_stats(duration=timedelta(hours=1))["max_latency"] == 20.0
+    assert monitor.get_stats(duration=timedelta(hours=3))["max_latency"] == 100.0
+    assert set(monitor.get_stats(duration=timedelta(hours=3))) == set(monitor.get_stats())
+    percentiles = monitor.get_percentiles(quantiles=(1.0,), duration=timedelta(hours=3))
+    assert percentiles["p100"] == pytest.approx(100, rel=0.02)
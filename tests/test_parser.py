@@ -0,0 +1,42 @@
+import pytest
+
+from ping_monitor.core.parser import parse_packets, parse_result
+
+RESULT = b"[8.8.8.8] Test Result: Average Latency 20ms, Jitter 935529ns (10 results)"
+
+
+def test_parse_result_bytes_and_str():
+    for output in (RESULT, RESULT.decode()):
+        result = parse_result(output)
+        assert result.target == "8.8.8.8"
+        assert result.average_latency == 20.0
+        assert result.jitter == pytest.approx(0.935529)
+        assert result.success_count == 10
+
+
+def test_parse_result_uses_last_result_line():
+    output = (
+        b"[8.8.8.8] Test Result: Average Latency 99ms, Jitter 9ms (1 results)\n"
+        b"noise\n" + RESULT + b"\ntrailer\n"
+    )
+    assert parse_result(output).average_latency == 20.0
+
+
+@pytest.mark.parametrize("output", [
+    b"",
+    b"Invalid output format",
+    b"[8.8.8.8] Test Result: Average Latency 20ms",
+    b"[8.8.8.8] Test Result: Average Latency invalid_ms",
+])
+def test_parse_result_rejects_malformed(output):
+    assert parse_result(output) is None
+
+
+def test_parse_packets():
+    output = (
+        b"64 bytes from 8.8.8.8: icmp_seq=2 ttl=117 time=21.5 ms\n"
+        b"64 bytes from 8.8.8.8: icmp_seq=1 ttl=117 time=20 ms\n"
+        b"64 bytes from 8.8.8.8: icmp_seq=3 ttl=117 time=1500 us\n" + RESULT
+    )
+    assert list(parse_packets(output)) == [20.0, 21.5, 1.5]
+    assert list(parse_packets(RESULT)) == []
@@ -0,0 +1,84 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+from ping_monitor.core.executor import PingExecutor
+from ping_monitor.core.pool import WorkerPool
+
+
+@pytest.fixture
+def ping_adv(tmp_path: Path) -> Path:
+    stub = tmp_path / "ping_adv"
+    stub.write_text(
+        "#!/bin/sh\n"
+        'echo "[$1] Test Result: Average Latency 20ms, Jitter 1ms ($2 results)"\n'
+    )
+    stub.chmod(0o755)
+    return stub
+
+
+@pytest.mark.asyncio
+async def test_pooled_executor(ping_adv):
+    pool = WorkerPool.for_ping_adv(ping_adv, size=2)
+    executor = PingExecutor(ping_adv, pool=pool)
+    try:
+        results = await asyncio.gather(
+            *(executor.execute_async(f"10.0.0.{i}", 10, 1.0) for i in range(6))
+        )
+    finally:
+        await executor.close()
+
+    assert [r.target for r in results] == [f"10.0.0.{i}" for i in range(6)]
+    assert all(r.success and r.average_latency == 20.0 for r in results)
+    assert pool.restarts == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_multiplexes_requests_on_one_worker(tmp_path: Path):
+    slow = tmp_path / "ping_adv"
+    slow.write_text(
+        "#!/bin/sh\n"
+        "sleep 0.5\n"
+        'echo "[$1] Test Result: Average Latency 20ms, Jitter 1ms ($2 results)"\n'
+    )
+    slow.chmod(0o755)
+    pool = WorkerPool.for_ping_adv(slow, size=1)
+    loop = asyncio.get_running_loop()
+    try:
+        await pool.submit("10.0.0.0", 10, 1.0, timeout=5.0)
+        started = loop.time()
+        pending = [
+            asyncio.create_task(pool.submit(f"10.0.0.{i}", 10, 1.0, timeout=5.0))
+            for i in range(1, 4)
+        ]
+        await asyncio.sleep(0.1)
+        assert pool.busy == 3
+        results = await asyncio.gather(*pending)
+        elapsed = loop.time() - started
+    finally:
+        await pool.close()
+
+    assert [r[1].split("]")[0] for r in results] == ["[10.0.0.1", "[10.0.0.2", "[10.0.0.3"]
+    assert elapsed < 1.4
+    assert pool.busy == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_restarts_crashed_worker(ping_adv):
+    crash_once = (
+        "import sys, json\n"
+        "line = sys.stdin.readline()\n"
+        "sys.exit(1)\n"
+    )
+    pool = WorkerPool([sys.executable, "-c", crash_once], size=1)
+    try:
+        first = await pool.submit("8.8.8.8", 10, 1.0, timeout=1.0)
+        second = await pool.submit("8.8.8.8", 10, 1.0, timeout=1.0)
+    finally:
+        await pool.close()
+
+    assert first[0] == -1 and "exited" in first[2]
+    assert second[0] == -1
+    assert pool.restarts == 2
@@ -0,0 +1,131 @@
+import logging
+import os
+from dataclasses import replace
+
+import pytest
+
+from ping_monitor.core.adaptive import AdaptiveController
+from ping_monitor.core.monitor import ConnectionMonitor
+from ping_monitor.core.reload import ConfigWatcher
+from ping_monitor.core.scheduler import ProbeScheduler
+from ping_monitor.utils.config import MonitorConfig, ProbeTarget
+
+
+@pytest.fixture
+def running(sample_config, mock_executor):
+    config = replace(sample_config, targets=(
+        ProbeTarget("a", 10.0), ProbeTarget("b", 10.0), ProbeTarget("c", 10.0)
+    ))
+    monitor = ConnectionMonitor(config)
+    monitor.executor = mock_executor
+    monitor._scheduler = ProbeScheduler(monitor._probe)
+    for target in config.targets:
+        monitor._scheduler.add(target, target.check_interval)
+    return monitor
+
+
+@pytest.mark.asyncio
+async def test_reload_applies_only_target_changes(running, make_metrics):
+    for host in ("a", "b", "c"):
+        await running._process_metrics(make_metrics(host))
+    unchanged = running._scheduler._entries["a"]
+
+    diff = running.reload(replace(running.config, targets=(
+        ProbeTarget("a", 10.0), ProbeTarget("b", 20.0), ProbeTarget("d", 10.0)
+    )))
+
+    assert diff == {"added": ("d",), "removed": ("c",), "changed": ("b",)}
+    assert running.targets == ("a", "b", "d")
+    assert {t.host for t in running._scheduler.targets} == {"a", "b", "d"}
+    assert running._scheduler._entries["a"] is unchanged
+    assert running._scheduler.period("b") == 20.0
+    assert len(running.history_for("a")) == len(running.history_for("b")) == 1
+    assert len(running.history_for("c")) == 0
+    assert "c" not in running.counters
+
+
+def test_reload_recomputes_adaptive_budget(running):
+    running.config = replace(running.config, adaptive=True)
+    running._adaptive = AdaptiveController(
+        min_interval=1.0, max_interval=600.0, budget=running._budget()
+    )
+    for target in running.config.targets:
+        running._adaptive.add(target.host, target.check_interval)
+    assert running._adaptive.budget == pytest.approx(3 / 10)
+
+    running.reload(replace(running.config, targets=(
+        ProbeTarget("a", 10.0), ProbeTarget("b", 5.0),
+        ProbeTarget("d", 10.0), ProbeTarget("e", 10.0)
+    )))
+    assert running._adaptive.budget == pytest.approx(3 / 10 + 1 / 5)
+    assert running._adaptive.rate == pytest.approx(running._adaptive.budget)
+
+    running.reload(replace(running.config, targets=(ProbeTarget("a", 10.0),)))
+    assert running._adaptive.budget == pytest.approx(1 / 10)
+    assert running._adaptive.period("b") is None
+
+
+def test_reload_keeps_explicit_probe_budget(running):
+    running.config = replace(running.config, adaptive=True, probe_budget=2.0)
+    running._adaptive = AdaptiveController(
+        min_interval=1.0, max_interval=600.0, budget=running._budget()
+    )
+
+    running.reload(replace(running.config, targets=(ProbeTarget("a", 10.0),)))
+
+    assert running._adaptive.budget == 2.0
+
+
+def test_reload_keeps_restart_only_fields(running, caplog):
+    with caplog.at_level(logging.WARNING):
+        diff = running.reload(replace(running.config, history_capacity=8, packet_count=3))
+
+    assert running.config.history_capacity == 4096
+    assert running.config.packet_count == 3
+    assert diff == {"added": (), "removed": (), "changed": ()}
+    assert "history_capacity" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_watcher_reloads_changed_file(sample_config, tmp_path, monkeypatch):
+    monkeypatch.setenv(MonitorConfig.PING_ADV_ENV, str(sample_config.ping_adv_path))
+    path = tmp_path / "monitor.toml"
+    path.write_text('[monitor]\ntarget = "1.1.1.1"\n')
+    applied = []
+
+    async def on_change(config, log_config):
+        applied.append(config.target)
+
+    watcher = ConfigWatcher(path, on_change)
+    watcher._signature = watcher._stat()
+    assert not await watcher.check()
+
+    path.write_text('[monitor]\ntarget = "9.9.9.9"\n')
+    os.utime(path, ns=(0, 1))
+    assert await watcher.check()
+
+    path.write_text('[monitor]\ntarget = [\n')
+    assert not await watcher.check()
+    assert applied == ["9.9.9.9"]
+
+
+@pytest.mark.asyncio
+async def test_watcher_reapplies_overrides(sample_config, tmp_path, monkeypatch):
+    monkeypatch.setenv(MonitorConfig.PING_ADV_ENV, str(sample_config.ping_adv_path))
+    path = tmp_path / "monitor.toml"
+    path.write_text('[monitor]\ntarget = "8.8.8.8"\n[logging]\nlevel = "INFO"\n')
+    applied = []
+
+    async def on_change(config, log_config):
+        applied.append((config.probe_targets, log_config.level))
+
+    watcher = ConfigWatcher(
+        path,
+        on_change,
+        overrides={"targets": (ProbeTarget("1.1.1.1"),)},
+        log_overrides={"level": "DEBUG"}
+    )
+    path.write_text('[monitor]\ntarget = "9.9.9.9"\n[logging]\nlevel = "WARNING"\n')
+
+    assert await watcher.check()
+    assert applied == [((ProbeTarget("1.1.1.1"),), "DEBUG")]
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from ping_monitor.models.rollup import MultiResolutionRollup, RollupSeries, combine
+
+
+@pytest.mark.parametrize("duration, expected", [
+    (timedelta(minutes=5), None),
+    (timedelta(minutes=30), 0),
+    (timedelta(hours=3), 1),
+    (timedelta(days=1), 2),
+    (timedelta(days=90), 2),
+])
+def test_resolution_selection(duration, expected):
+    assert MultiResolutionRollup.resolution_for(duration) == expected
+
+
+def test_series_buckets_and_retention(make_metrics):
+    series = RollupSeries(resolution=timedelta(minutes=1), retention=timedelta(minutes=10))
+    start = datetime(2026, 1, 1, 12, 0)
+    for minute in range(30):
+        at = start + timedelta(minutes=minute)
+        series.add(make_metrics(latency=float(minute), timestamp=at + timedelta(seconds=10)))
+        series.add(make_metrics(latency=float(minute) + 0.5, timestamp=at + timedelta(seconds=40)))
+
+    buckets = series.buckets()
+    assert len(buckets) <= 11
+    assert all(b.count == 2 for b in buckets)
+    assert buckets[-1].start == start + timedelta(minutes=29)
+
+
+def test_rollup_summary(make_metrics):
+    series = RollupSeries(
+        resolution=timedelta(minutes=5), retention=timedelta(hours=1), sketches=True
+    )
+    start = datetime(2026, 1, 1, 12, 0)
+    for i in range(1, 101):
+        series.add(make_metrics(latency=float(i), timestamp=start + timedelta(seconds=i * 10)))
+    series.add(make_metrics(latency=0.0, received=0, timestamp=start + timedelta(seconds=1010)))
+
+    rollup = combine(series.buckets(), start)
+    summary = rollup.as_dict()
+
+    assert summary["measurements"] == 101
+    assert summary["successful"] == 100
+    assert summary["min_latency"] == 1.0
+    assert summary["max_latency"] == 100.0
+    assert summary["avg_latency"] == pytest.approx(50.5)
+    assert summary["packet_loss"] == pytest.approx(10 / 1010 * 100)
+    assert rollup.sketch.quantile(0.5) == pytest.approx(50, rel=0.03)
+
+
+def test_only_hourly_series_keeps_sketches(make_metrics):
+    rollup = MultiResolutionRollup()
+    start = datetime(2026, 1, 1, 12, 0)
+    for minute in range(180):
+        rollup.add(make_metrics(latency=10.0, timestamp=start + timedelta(minutes=minute)))
+
+    assert [s.sketches for s in rollup.series] == [False, False, True]
+    hourly = rollup.series[MultiResolutionRollup.SKETCH_SERIES].buckets()
+    assert [b.sketch.count for b in hourly] == [60, 60, 60]
+    assert all(not b.sketch.count for b in rollup.series[0].buckets())
@@ -0,0 +1,185 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Dict, List, Tuple
+
+import pytest
+
+from ping_monitor.core.instrumentation import Instrumentation
+from ping_monitor.core.scheduler import ProbeScheduler
+from ping_monitor.utils.config import ProbeTarget
+
+
+class VirtualClock:
+    """Monotonic and wall clocks that only move when the test advances them.
+
+    Sleepers wake in deadline order at exactly their deadline, and the
+    event loop is drained after each wake-up, so schedules are checked
+    without depending on real timing.
+    """
+
+    EPOCH = 1_000_000.0
+
+    def __init__(self, start: float = 0.005) -> None:
+        self.now = start
+        self._sleepers: List[Tuple[float, int, asyncio.Future]] = []
+        self._order = itertools.count()
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now + self.EPOCH
+
+    async def sleep(self, delay: float) -> None:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self.now + delay, next(self._order), future))
+        await future
+
+    def block(self, seconds: float) -> None:
+        """Let time pass without running the loop, like a blocking call would."""
+        self.now += seconds
+
+    async def advance(self, seconds: float) -> None:
+        until = self.now + seconds
+        await self._settle()
+        while self._sleepers and self._sleepers[0][0] <= until:
+            deadline, _, future = heapq.heappop(self._sleepers)
+            self.now = max(self.now, deadline)
+            if not future.done():
+                future.set_result(None)
+            await self._settle()
+        self.now = until
+        await self._settle()
+
+    @staticmethod
+    async def _settle() -> None:
+        for _ in range(20):
+            await asyncio.sleep(0)
+
+
+def _scheduler(clock: VirtualClock, probe, **options) -> ProbeScheduler:
+    return ProbeScheduler(
+        probe,
+        clock=clock.monotonic,
+        wall_clock=clock.time,
+        sleep=clock.sleep,
+        registry=options.pop("registry", None) or Instrumentation(),
+        **options
+    )
+
+
+def _recorder(clock: VirtualClock, fired: Dict[str, List[float]], duration: float = 0.0):
+    async def probe(target: ProbeTarget) -> None:
+        fired.setdefault(target.host, []).append(clock.time())
+        if duration:
+            await clock.sleep(duration)
+    return probe
+
+
+async def _run_for(clock: VirtualClock, scheduler: ProbeScheduler, seconds: float) -> None:
+    task = asyncio.create_task(scheduler.run())
+    await clock.advance(seconds)
+    scheduler.stop()
+    await task
+
+
+@pytest.mark.asyncio
+async def test_ticks_are_wall_aligned_and_do_not_drift():
+    clock = VirtualClock(start=0.03)
+    fired: Dict[str, List[float]] = {}
+    scheduler = _scheduler(clock, _recorder(clock, fired, 0.05), start_jitter=0)
+    scheduler.add(ProbeTarget("a"), 0.1)
+    scheduler.add(ProbeTarget("b"), 0.1)
+
+    await _run_for(clock, scheduler, 0.65)
+
+    # Probe duration is not added to the period.
+    expected = [clock.EPOCH + 0.1 + k * 0.1 for k in range(6)]
+    assert fired["a"] == pytest.approx(expected, abs=1e-6)
+    assert fired["b"] == pytest.approx(expected, abs=1e-6)
+
+
+@pytest.mark.asyncio
+async def test_phase_spreads_targets_deterministically():
+    scheduler = ProbeScheduler(_recorder(VirtualClock(), {}), start_jitter=1.0)
+
+    phases = {host: scheduler._phase(host, 60.0) for host in ("a", "b", "c")}
+
+    assert len(set(phases.values())) == 3
+    assert all(0 <= phase < 60.0 for phase in phases.values())
+    assert ProbeScheduler(_recorder(VirtualClock(), {}))._phase("a", 60.0) == phases["a"]
+
+
+@pytest.mark.asyncio
+async def test_overrunning_probe_skips_ticks():
+    clock = VirtualClock()
+    registry = Instrumentation()
+    fired: Dict[str, List[float]] = {}
+    scheduler = _scheduler(
+        clock, _recorder(clock, fired, 0.25), start_jitter=0, registry=registry
+    )
+    scheduler.add(ProbeTarget("a"), 0.1)
+
+    await _run_for(clock, scheduler, 0.65)
+
+    # Ticks at 0.1 and 0.4 fire; 0.2, 0.3, 0.5 and 0.6 find the probe running.
+    assert fired["a"] == pytest.approx([clock.EPOCH + 0.1, clock.EPOCH + 0.4], abs=1e-6)
+    assert registry.counters()["scheduler.skipped"] == 4
+
+
+@pytest.mark.asyncio
+async def test_blocked_loop_counts_late_and_skipped_ticks():
+    clock = VirtualClock()
+    registry = Instrumentation()
+    fired: Dict[str, List[float]] = {}
+    scheduler = _scheduler(
+        clock, _recorder(clock, fired), start_jitter=0, late_tolerance=0.02, registry=registry
+    )
+    scheduler.add(ProbeTarget("a"), 0.05)
+
+    task = asyncio.create_task(scheduler.run())
+    await clock.advance(0.06)
+    clock.block(0.2)
+    await clock.advance(0.01)
+    scheduler.stop()
+    await task
+
+    # The tick due at 0.1 fires 0.165s late; 0.15, 0.2 and 0.25 are dropped.
+    assert fired["a"] == pytest.approx([clock.EPOCH + 0.05, clock.EPOCH + 0.265], abs=1e-6)
+    counters = registry.counters()
+    assert counters["scheduler.late"] == 1
+    assert counters["scheduler.skipped"] == 3
+    assert registry.histogram("monitor.schedule_delay").maximum == pytest.approx(0.165)
+
+
+@pytest.mark.asyncio
+async def test_remove_and_reschedule():
+    clock = VirtualClock()
+    fired: Dict[str, List[float]] = {}
+    scheduler = _scheduler(clock, _recorder(clock, fired), start_jitter=0)
+    scheduler.add(ProbeTarget("a"), 0.05)
+    scheduler.add(ProbeTarget("b"), 10.0)
+    scheduler.remove("a")
+    scheduler.reschedule("b", 0.05)
+
+    await _run_for(clock, scheduler, 0.28)
+
+    assert "a" not in fired
+    assert len(fired["b"]) == 5
+    assert scheduler.period("b") == 0.05
+    assert scheduler.targets == (ProbeTarget("b"),)
+
+
+@pytest.mark.asyncio
+async def test_run_once_fires_each_target_once():
+    fired: Dict[str, List[float]] = {}
+    scheduler = ProbeScheduler(_recorder(VirtualClock(), fired), registry=Instrumentation())
+    now = time.monotonic()
+    for host in ("a", "b", "c"):
+        scheduler.add(ProbeTarget(host), 60.0, now)
+
+    await asyncio.wait_for(scheduler.run(once=True), timeout=1)
+
+    assert {host: len(times) for host, times in fired.items()} == {"a": 1, "b": 1, "c": 1}
@@ -0,0 +1,81 @@
+import json
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from ping_monitor.models.sketch import LatencySketch, SketchWindow
+
+
+def _exact(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_sketch_quantiles_within_relative_accuracy():
+    rng = random.Random(1)
+    values = [rng.lognormvariate(3, 0.8) for _ in range(20_000)]
+    sketch = LatencySketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.5, 0.95, 0.99):
+        exact = _exact(values, q)
+        assert abs(sketch.quantile(q) - exact) <= 0.011 * exact
+
+
+def test_sketch_merge_equals_combined():
+    rng = random.Random(2)
+    first, second, combined = LatencySketch(), LatencySketch(), LatencySketch()
+    for i in range(5_000):
+        value = rng.uniform(1, 200)
+        (first if i % 2 else second).add(value)
+        combined.add(value)
+
+    first.merge(second)
+
+    assert first.count == combined.count
+    assert first.quantile(0.99) == combined.quantile(0.99)
+    with pytest.raises(ValueError):
+        first.merge(LatencySketch(relative_accuracy=0.05))
+
+
+def test_sketch_serialization_round_trip():
+    sketch = LatencySketch()
+    for value in (0.0, 1.5, 20.0, 300.0):
+        sketch.add(value)
+
+    restored = LatencySketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+
+    assert restored.count == sketch.count
+    assert restored.quantiles((0.0, 0.5, 1.0)) == sketch.quantiles((0.0, 0.5, 1.0))
+
+
+def test_sketch_bounded_buckets():
+    sketch = LatencySketch(max_buckets=16)
+    for i in range(1, 10_000):
+        sketch.add(float(i))
+
+    assert len(sketch._bins) <= 16
+    assert sketch.quantile(1.0) == pytest.approx(9_999, rel=0.01)
+
+
+def test_sketch_pack_round_trip():
+    sketch = LatencySketch()
+    for value in (0.0, 1.5, 20.0, 20.1, 300.0):
+        sketch.add(value)
+
+    restored = LatencySketch.unpack(sketch.pack())
+
+    assert restored.count == sketch.count
+    assert restored.quantiles((0.0, 0.5, 1.0)) == sketch.quantiles((0.0, 0.5, 1.0))
+
+
+def test_sketch_window_drops_old_buckets():
+    window = SketchWindow(bucket=timedelta(minutes=1), window=timedelta(minutes=5))
+    now = datetime.now()
+    window.add(now - timedelta(minutes=10), 1000.0)
+    window.add(now, 10.0)
+
+    assert window.sketch().count == 1
+    assert window.sketch().quantile(1.0) == pytest.approx(10.0, rel=0.01)
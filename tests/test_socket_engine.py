@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from ping_monitor.core.engine import ProbeEngine, create_engine
+from ping_monitor.core.executor import PingExecutor
+from ping_monitor.core.socket_engine import SocketProbeEngine
+from ping_monitor.utils.config import MonitorConfig
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = SocketProbeEngine(loopback=True, reply_timeout=0.5)
+    yield engine
+    await engine.close()
+
+
+def test_engines_implement_protocol(sample_config):
+    assert isinstance(create_engine(sample_config), PingExecutor)
+    udp_config = MonitorConfig(ping_adv_path=sample_config.ping_adv_path, engine="udp")
+    engine = create_engine(udp_config)
+    assert isinstance(engine, SocketProbeEngine)
+    assert isinstance(engine, ProbeEngine)
+
+
+@pytest.mark.asyncio
+async def test_loopback_probe(engine):
+    result = await engine.execute_async("127.0.0.1", 5, 0.01)
+
+    assert result.success
+    assert result.success_count == 5
+    assert result.packet_count == 5
+    assert result.average_latency > 0.0
+    assert result.jitter >= 0.0
+    assert result.error_message is None
+
+
+@pytest.mark.asyncio
+async def test_loopback_concurrent_probes_share_socket(engine):
+    results = await asyncio.gather(
+        *(engine.execute_async("127.0.0.1", 3, 0.01) for _ in range(20))
+    )
+
+    assert all(r.success_count == 3 for r in results)
+    assert engine._probes == {}
+
+
+@pytest.mark.asyncio
+async def test_loopback_rejects_remote_targets(engine):
+    result = await engine.execute_async("8.8.8.8", 3, 0.01)
+
+    assert not result.success
+    assert "loopback" in result.error_message
+
+
+def test_checksum_round_trip():
+    packet = SocketProbeEngine(mode="udp")._packet(7, 3)
+    assert SocketProbeEngine._checksum(packet) == 0
+
+
+@pytest.mark.asyncio
+async def test_address_cache_expires_and_is_bounded(mocker):
+    engine = SocketProbeEngine(mode="udp", dns_ttl=60.0, dns_cache_size=2)
+    loop = asyncio.get_running_loop()
+    lookups = mocker.patch.object(
+        loop, "getaddrinfo",
+        side_effect=lambda host, port, **_: [(None, None, None, "", (host, port))]
+    )
+    await engine._resolve("10.0.0.1")
+    await engine._resolve("10.0.0.1")
+    assert lookups.call_count == 1
+
+    address, _ = engine._addresses["10.0.0.1"]
+    engine._addresses["10.0.0.1"] = (address, 0.0)
+    await engine._resolve("10.0.0.1")
+    assert lookups.call_count == 2
+
+    await engine._resolve("10.0.0.2")
+    await engine._resolve("10.0.0.3")
+    assert list(engine._addresses) == ["10.0.0.2", "10.0.0.3"]
+
+
+@pytest.mark.asyncio
+async def test_unanswered_target_is_resolved_again(engine):
+    engine.reply_timeout = 0.05
+    result = await engine.execute_async("127.0.0.1", 3, 0.01)
+    assert result.success and "127.0.0.1" in engine._addresses
+
+    engine._server.close()
+    result = await engine.execute_async("127.0.0.1", 3, 0.01)
+    assert not result.success
+    assert "127.0.0.1" not in engine._addresses
@@ -0,0 +1,27 @@
+import subprocess
+import sys
+
+import pytest
+
+CHECK = """
+import logging, sys
+import {module}
+print(" ".join(m for m in ("numpy", "rich") if m in sys.modules))
+print(len(logging.getLogger().handlers))
+"""
+
+
+@pytest.mark.parametrize("module", [
+    "ping_monitor.cli",
+    "ping_monitor.core.monitor",
+    "ping_monitor.core.executor",
+])
+def test_import_has_no_heavy_modules_or_side_effects(module):
+    output = subprocess.run(
+        [sys.executable, "-c", CHECK.format(module=module)],
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout.splitlines()
+
+    assert output == ["", "0"]
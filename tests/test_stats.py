@@ -0,0 +1,69 @@
+import random
+from datetime import datetime, timedelta
+
+from ping_monitor.models.history import MetricHistory
+from ping_monitor.models.stats import RunningStats, summarize
+
+
+def _expected(samples) -> dict:
+    successful = [m for m in samples if m.success]
+    latencies = [m.average_latency for m in successful]
+    sent = sum(m.packet_count for m in samples)
+    received = sum(m.success_count for m in samples)
+    return {
+        "min_latency": min(latencies),
+        "max_latency": max(latencies),
+        "avg_latency": sum(latencies) / len(latencies),
+        "avg_jitter": sum(m.jitter for m in successful) / len(successful),
+        "max_jitter": max(m.jitter for m in successful),
+        "packet_loss": (sent - received) / sent * 100,
+        "measurements": len(samples),
+        "successful": len(successful),
+        "success_rate": len(successful) / len(samples) * 100
+    }
+
+
+def test_running_stats_match_recomputation(make_metrics):
+    rng = random.Random(42)
+    stats = RunningStats()
+    history = MetricHistory(capacity=50, window=timedelta(hours=1), on_evict=stats.remove)
+    now = datetime.now()
+
+    for i in range(500):
+        sample = make_metrics(
+            latency=rng.uniform(1, 100),
+            jitter=rng.uniform(0, 10),
+            received=rng.choice([0, 1, 5, 10]),
+            timestamp=now + timedelta(seconds=i)
+        )
+        stats.add(sample)
+        history.append(sample)
+
+        window = list(history)
+        if any(m.success for m in window):
+            result = stats.as_dict()
+            for key, value in _expected(window).items():
+                assert abs(result[key] - value) < 1e-6, key
+
+
+def test_running_stats_empty_and_failed(make_metrics):
+    stats = RunningStats()
+    assert stats.as_dict() == {}
+
+    stats.add(make_metrics(latency=0.0, jitter=0.0, received=0))
+    assert stats.as_dict() == {"error": "No successful measurements"}
+
+
+def test_summarize_combines_targets(make_metrics):
+    first, second = RunningStats(), RunningStats()
+    now = datetime.now()
+    first.add(make_metrics(latency=10.0, jitter=1.0, received=10, timestamp=now))
+    second.add(make_metrics(latency=30.0, jitter=3.0, received=5, timestamp=now))
+
+    result = summarize((first, second))
+
+    assert result["min_latency"] == 10.0
+    assert result["max_latency"] == 30.0
+    assert result["avg_latency"] == 20.0
+    assert result["packet_loss"] == 25.0
+    assert result["measurements"] == 2
@@ -0,0 +1,158 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from ping_monitor.core.monitor import ConnectionMonitor
+from ping_monitor.core.store import HEADER, INDEX, LEGACY_MAGIC, RECORD, MetricStore
+from ping_monitor.utils.config import MonitorConfig
+
+
+def test_store_round_trip(tmp_path, make_metrics):
+    now = datetime.now().replace(microsecond=0)
+    samples = [
+        make_metrics("8.8.8.8", timestamp=now),
+        make_metrics(
+            "1.1.1.1", 0.0, 0, timestamp=now + timedelta(seconds=1), error="Command timed out"
+        ),
+        make_metrics("8.8.8.8", timestamp=now + timedelta(seconds=2)),
+    ]
+    store = MetricStore(tmp_path, batch_size=2)
+    assert not store.append(samples[0])
+    assert store.append(samples[1])
+    store.flush()
+    store.append(samples[2])
+    store.close()
+
+    reopened = MetricStore(tmp_path)
+    assert list(reopened.scan()) == samples
+    assert list(reopened.scan(target="1.1.1.1")) == [samples[1]]
+    assert list(reopened.scan(since=now + timedelta(seconds=1))) == samples[1:]
+    assert list(reopened.scan(target="9.9.9.9")) == []
+
+
+def test_store_rolls_segments(tmp_path, make_metrics):
+    now = datetime.now()
+    store = MetricStore(tmp_path, segment_records=4)
+    for i in range(10):
+        store.append(make_metrics(timestamp=now + timedelta(seconds=i)))
+    store.flush()
+
+    assert len(store.segments()) == 3
+    assert [s.record_count for s in store.segments()] == [4, 4, 2]
+    assert len(list(MetricStore(tmp_path).scan())) == 10
+
+
+def test_store_truncates_unindexed_records(tmp_path, make_metrics):
+    store = MetricStore(tmp_path)
+    store.append(make_metrics())
+    store.flush()
+    data_path = store.segments()[0].data_path
+    with open(data_path, "ab") as f:
+        f.write(b"\x00" * (RECORD.size + 7))
+
+    reopened = MetricStore(tmp_path)
+
+    assert data_path.stat().st_size == HEADER.size + RECORD.size
+    assert len(list(reopened.scan())) == 1
+
+
+def test_store_repairs_torn_index_entry(tmp_path, make_metrics):
+    now = datetime.now()
+    store = MetricStore(tmp_path)
+    store.append(make_metrics(timestamp=now))
+    store.flush()
+    index_path = store.segments()[0].index_path
+    with open(index_path, "ab") as f:
+        f.write(b"\x07\x07\x07")
+
+    reopened = MetricStore(tmp_path)
+    reopened.append(make_metrics(timestamp=now + timedelta(seconds=1)))
+    reopened.flush()
+
+    assert index_path.stat().st_size == 2 * INDEX.size
+    assert len(list(MetricStore(tmp_path).scan())) == 2
+
+
+def test_store_drops_index_entries_past_data(tmp_path, make_metrics):
+    store = MetricStore(tmp_path)
+    for i in range(2):
+        store.append(make_metrics(timestamp=datetime.now() + timedelta(seconds=i)))
+        store.flush()
+    data_path = store.segments()[0].data_path
+    os.truncate(data_path, HEADER.size + RECORD.size)
+
+    reopened = MetricStore(tmp_path)
+
+    assert store.segments()[0].index_path.stat().st_size == INDEX.size
+    assert len(list(reopened.scan())) == 1
+
+
+def test_store_repairs_torn_string(tmp_path, make_metrics):
+    now = datetime.now()
+    store = MetricStore(tmp_path)
+    store.append(make_metrics("8.8.8.8", timestamp=now))
+    store.flush()
+    with open(tmp_path / "strings.jsonl", "ab") as f:
+        f.write(b'"1.1.')
+
+    reopened = MetricStore(tmp_path)
+    reopened.append(make_metrics("9.9.9.9", timestamp=now + timedelta(seconds=1)))
+    reopened.flush()
+
+    assert [m.target for m in MetricStore(tmp_path).scan()] == ["8.8.8.8", "9.9.9.9"]
+
+
+def test_store_keeps_errors_out_of_interned_strings(tmp_path, make_metrics):
+    now = datetime.now()
+    store = MetricStore(tmp_path)
+    for i in range(100):
+        timestamp = now + timedelta(seconds=i)
+        store.append(make_metrics(received=0, timestamp=timestamp, error=f"timeout after {i}ms"))
+    store.flush()
+
+    reopened = MetricStore(tmp_path)
+    timestamp = now + timedelta(seconds=100)
+    reopened.append(make_metrics(received=0, timestamp=timestamp, error="unreachable"))
+    reopened.flush()
+
+    assert len(reopened._values) == 1
+    errors = [m.error_message for m in MetricStore(tmp_path).scan()]
+    assert errors[0] == "timeout after 0ms"
+    assert errors[-2:] == ["timeout after 99ms", "unreachable"]
+
+
+def test_store_reads_legacy_segments(tmp_path, make_metrics):
+    now = datetime.now().replace(microsecond=0)
+    (tmp_path / "strings.jsonl").write_text('"8.8.8.8"\n"Command timed out"\n')
+    (tmp_path / "000001.seg").write_bytes(
+        HEADER.pack(LEGACY_MAGIC, RECORD.size, 0)
+        + RECORD.pack(now.timestamp(), 0.0, 0.0, 10, 0, 0, 1)
+    )
+    (tmp_path / "000001.idx").write_bytes(INDEX.pack(0, 1, now.timestamp(), now.timestamp()))
+
+    store = MetricStore(tmp_path)
+    timestamp = now + timedelta(seconds=1)
+    store.append(make_metrics(received=0, timestamp=timestamp, error="unreachable"))
+    store.flush()
+
+    assert [m.error_message for m in store.scan()] == ["Command timed out", "unreachable"]
+    assert [s.number for s in store.segments()] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_monitor_restores_window(sample_config, tmp_path, make_metrics):
+    store_path = tmp_path / "store"
+    store = MetricStore(store_path)
+    now = datetime.now()
+    store.append(make_metrics(timestamp=now - timedelta(hours=3)))
+    store.append(make_metrics(timestamp=now - timedelta(minutes=1)))
+    store.append(make_metrics("10.0.0.1", timestamp=now - timedelta(minutes=1)))
+    store.flush()
+
+    config = MonitorConfig(ping_adv_path=sample_config.ping_adv_path, store_path=store_path)
+    monitor = ConnectionMonitor(config)
+
+    assert len(monitor.history) == 1
+    assert monitor.get_stats()["avg_latency"] == 10.0
+    assert set(monitor.counters) == {"8.8.8.8"}
@@ -0,0 +1,178 @@
+from dataclasses import replace
+
+import pytest
+import pytest_asyncio
+from typer.testing import CliRunner
+
+from ping_monitor.cli import app
+from ping_monitor.core.shard import ShardWorker, decode_row
+from ping_monitor.core.supervisor import ShardSupervisor, owner
+from ping_monitor.models.stats import RunningStats, StatsSnapshot, summarize
+from ping_monitor.utils.config import MonitorConfig, ProbeTarget
+from ping_monitor.utils.logging import LogConfig
+
+TARGETS = tuple(ProbeTarget(f"10.0.0.{i}", 1.0) for i in range(8))
+
+
+@pytest.fixture
+def stub_config(tmp_path) -> MonitorConfig:
+    stub = tmp_path / "ping_adv"
+    stub.write_text(
+        "#!/bin/sh\n"
+        'echo "[$1] Test Result: Average Latency 1ms, Jitter 500000ns ($2 results)"\n'
+    )
+    stub.chmod(0o755)
+    return MonitorConfig(
+        ping_adv_path=stub,
+        packet_count=2,
+        interval=0.01,
+        targets=TARGETS,
+        loop_lag_interval=0,
+        log_level="WARNING"
+    )
+
+
+@pytest_asyncio.fixture
+async def supervisor(stub_config):
+    supervisor = ShardSupervisor(
+        stub_config, processes=3, report_interval=0.1, restart_delay=0.5
+    )
+    await supervisor.start()
+    yield supervisor
+    await supervisor.stop()
+
+
+def test_owner_only_moves_targets_of_removed_slot():
+    hosts = [f"10.0.{i // 256}.{i % 256}" for i in range(1000)]
+    before = {host: owner(host, range(4)) for host in hosts}
+    after = {host: owner(host, (0, 1, 3)) for host in hosts}
+
+    moved = {host for host in hosts if before[host] != after[host]}
+    assert moved == {host for host in hosts if before[host] == 2}
+    assert all(before[host] == slot for host, slot in after.items() if host not in moved)
+
+
+def test_snapshots_summarize_like_running_stats(make_metrics):
+    stats = [RunningStats(), RunningStats(), RunningStats()]
+    for index, latency in enumerate((5.0, 12.0, 7.5, 30.0)):
+        stats[index % 2].add(make_metrics("8.8.8.8", latency))
+
+    assert summarize(StatsSnapshot.of(s) for s in stats) == summarize(stats)
+
+
+@pytest.mark.asyncio
+async def test_worker_reports_changed_targets_once(sample_config, mocker, make_metrics):
+    # Plain stream handlers would outlive pytest's captured stdout.
+    mocker.patch("ping_monitor.core.monitor.setup_logging")
+    emitted = []
+    worker = ShardWorker(sample_config, emitted.append)
+    await worker.assign((ProbeTarget("a"), ProbeTarget("b")))
+    await worker._monitor._process_metrics(make_metrics("a", 10.0, 9))
+
+    worker.report()
+    worker.report()
+    await worker.close()
+
+    assert len(emitted) == 1
+    host, stats, counters = decode_row(emitted[0]["stats"][0])
+    assert (host, stats.count, stats.latency_sum, counters.packets_received) == ("a", 1, 10.0, 9)
+
+
+@pytest.mark.asyncio
+async def test_worker_reconfigure_keeps_assignment(sample_config, mocker):
+    mocker.patch("ping_monitor.core.monitor.setup_logging")
+    worker = ShardWorker(sample_config, lambda message: None)
+    await worker.assign((ProbeTarget("a"),))
+
+    worker.configure(replace(sample_config, packet_count=3), LogConfig(level="WARNING"))
+
+    assert worker._monitor.config.packet_count == 3
+    assert worker._monitor.targets == ("a",)
+    assert worker._monitor.log_config.level == "WARNING"
+    await worker.close()
+
+
+@pytest.mark.asyncio
+async def test_worker_restores_store_once(sample_config, tmp_path, mocker):
+    mocker.patch("ping_monitor.core.monitor.setup_logging")
+    restore = mocker.patch("ping_monitor.core.monitor.ConnectionMonitor._restore")
+    config = replace(sample_config, store_path=tmp_path / "store")
+
+    worker = ShardWorker(config, lambda message: None)
+    for _ in range(2):
+        await worker.assign((ProbeTarget("a"),))
+        await worker.close()
+    restarted = ShardWorker(config, lambda message: None, restore=False)
+    await restarted.assign((ProbeTarget("a"),))
+    await restarted.close()
+
+    assert restore.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_supervisor_aggregates_all_shards(supervisor, until):
+    shards = supervisor.shards
+    assert sorted(host for hosts in shards.values() for host in hosts) == sorted(
+        supervisor.targets
+    )
+
+    await until(lambda: set(supervisor.counters()) == set(supervisor.targets))
+
+    stats = supervisor.get_stats()
+    assert stats["avg_latency"] == 1.0
+    assert stats["measurements"] >= len(TARGETS)
+    assert supervisor.get_stats("10.0.0.3")["packet_loss"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_supervisor_rebalances_when_worker_dies(supervisor, until):
+    await until(lambda: set(supervisor.counters()) == set(supervisor.targets))
+    before = supervisor.shards
+    victim = max(before, key=lambda slot: len(before[slot]))
+    probes = sum(c.probes for c in supervisor.counters().values())
+
+    supervisor._shards[victim].process.kill()
+    await until(lambda: victim not in supervisor.shards)
+
+    survivors = supervisor.shards
+    assert sorted(h for hosts in survivors.values() for h in hosts) == sorted(supervisor.targets)
+    for slot, hosts in survivors.items():
+        assert set(before[slot]) <= set(hosts)
+    assert sum(c.probes for c in supervisor.counters().values()) >= probes
+
+    await until(lambda: supervisor.shards == before)
+    assert supervisor.registry.counters()["supervisor.restarts"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_supervisor_reload_rehashes_targets(supervisor, until):
+    supervisor.reload(replace(supervisor.config, targets=TARGETS[:4], history_capacity=8))
+
+    assert sorted(h for hosts in supervisor.shards.values() for h in hosts) == sorted(
+        t.host for t in TARGETS[:4]
+    )
+    assert supervisor.config.history_capacity == 4096
+    await until(lambda: {t.host for t in TARGETS[:4]} <= set(supervisor.counters()))
+
+
+@pytest.mark.asyncio
+async def test_shards_log_to_configured_file(stub_config, tmp_path, until):
+    log_file = tmp_path / "monitor.log"
+    supervisor = ShardSupervisor(
+        stub_config,
+        processes=2,
+        report_interval=0.1,
+        log_config=LogConfig(log_file=log_file, rich_output=False, queued=False)
+    )
+    async with supervisor:
+        await until(lambda: log_file.read_text().count("Initialised monitor") == 2)
+
+
+def test_cli_rejects_metrics_port_with_processes(stub_config, monkeypatch):
+    monkeypatch.setenv(MonitorConfig.PING_ADV_ENV, str(stub_config.ping_adv_path))
+    monkeypatch.setattr(MonitorConfig, "_ping_adv_cache", None)
+
+    result = CliRunner().invoke(app, ["-t", "8.8.8.8", "-p", "2", "-m", "9100"])
+
+    assert result.exit_code == 1
+    assert "--metrics-port needs a single process" in result.stderr